@@ -1,20 +1,27 @@
 import httpx
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
 import app.core.config as config
+from app.core.local_cache import LocalTTLCache
 from app.core.logger import get_logger
 
 logger = get_logger("ChzzkAPI")
 
+# /open/v1/channels 한 번에 조회할 수 있는 최대 채널 수
+_CHANNELS_MAX_IDS = 20
+# 채널 정보(이름, 이미지 URL) 캐시 — 자주 바뀌지 않으므로 길게 유지
+_channel_info_cache = LocalTTLCache(maxsize=4096, ttl=config.CHANNEL_INFO_TTL)
+
+
 class ChzzkAPIClient:
     def __init__(self):
         self.client_id = config.CLIENT_ID
         self.client_secret = config.CLIENT_SECRET
         self.openapi_base = config.OPENAPI_BASE
         
-        # 공통 헤더 설정
+        # 공통 헤더 설정 (모듈 임포트 시 생성되므로 시크릿이 없어도 실패하지 않도록 빈 문자열로)
         self.headers = {
-            'Client-Id': self.client_id,
-            'Client-Secret': self.client_secret,
+            'Client-Id': self.client_id or '',
+            'Client-Secret': self.client_secret or '',
             'Content-Type': 'application/json',
         }
 
@@ -29,23 +36,54 @@ class ChzzkAPIClient:
         """클라이언트 리소스 정리"""
         await self.client.aclose()
 
-    async def get_channel_info(self, channel_id: str) -> Optional[Dict[str, Any]]:
+    async def get_channels_info(self, channel_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        여러 채널의 정보(이름, 이미지 URL 등)를 {channel_id: info}로 반환합니다.
+        - 캐시에 없는 채널만 _CHANNELS_MAX_IDS개씩 묶어 조회한다.
+        - 조회에 실패한 묶음의 채널은 결과에서 빠진다.
+        """
+        result: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for channel_id in dict.fromkeys(channel_ids):  # 순서를 유지한 중복 제거
+            info = _channel_info_cache.get(channel_id)
+            if info is not None:
+                result[channel_id] = info
+            else:
+                missing.append(channel_id)
+
+        for i in range(0, len(missing), _CHANNELS_MAX_IDS):
+            chunk = missing[i:i + _CHANNELS_MAX_IDS]
+            fetched = await self._fetch_channels(chunk)
+            if fetched is None:
+                continue
+            for channel_id in chunk:
+                # 응답에 없는 채널(삭제 등)도 빈 dict로 캐싱해 반복 조회를 막는다
+                info = fetched.get(channel_id, {})
+                _channel_info_cache.set(channel_id, info)
+                result[channel_id] = info
+        return result
+
+    async def _fetch_channels(self, channel_ids: list[str]) -> Optional[Dict[str, Dict[str, Any]]]:
         url = '/open/v1/channels'
-        params = {"channelIds": channel_id}
-        
+        params = {"channelIds": ",".join(channel_ids)}
+
         try:
             response = await self.client.get(url, params=params)
-            
+
             if response.status_code == 200:
-                data = response.json()
-                # content -> data 배열의 첫 번째 요소 반환
-                content = data.get('content', {})
-                if content and 'data' in content and len(content['data']) > 0:
-                    return content['data'][0]
-                return {}
+                content = response.json().get('content') or {}
+                return {item['channelId']: item for item in content.get('data') or [] if item.get('channelId')}
             else:
                 logger.error(f"❌ 채널 정보 조회 실패: {response.status_code} - {response.text}")
                 return None
         except Exception as e:
             logger.error(f"⚠️ 채널 정보 요청 중 에러: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    async def get_channel_info(self, channel_id: str) -> Optional[Dict[str, Any]]:
+        """채널 하나의 정보. 조회 실패 시 None, 없는 채널이면 빈 dict."""
+        return (await self.get_channels_info([channel_id])).get(channel_id)
+
+
+# 모듈 레벨 싱글톤 — 알림 cog와 관리/인증 페이지가 같은 클라이언트와 채널 정보 캐시를 공유
+chzzk_api = ChzzkAPIClient()
@@ -23,6 +23,11 @@ DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT", "5432")
 DB_NAME = os.getenv("DB_NAME")
 
+# DB 커넥션 풀 크기 (1GB 서버 환경: 커넥션 3개로 충분, 각 ~5-10MB)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "3"))
+# 순간 트래픽 대비 추가 허용 커넥션 수
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "2"))
+
 # --- SSH 터널링 설정 ---
 SSH_HOST = os.getenv("SSH_HOST")
 SSH_PORT = int(os.getenv("SSH_PORT", "22"))
@@ -36,11 +41,76 @@ REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 
 # --- 기타 설정 ---
 ALLOWED_PREFIXES = os.getenv("ALLOWED_PREFIXES", "!@#$%^&*")
-# 여러 봇 닉네임을 쉼표로 구분하여 리스트로 변환 (예: "밀키웨이 봇,싹둑,나이트봇")
-BOT_NICKNAMES = [name.strip() for name in os.getenv("BOT_NICKNAME", "밀키웨이 봇").split(',')]
+# 여러 봇 닉네임을 쉼표로 구분하여 집합으로 변환 (예: "밀키웨이 봇,싹둑,나이트봇") — 매 채팅마다 조회하므로 frozenset
+BOT_NICKNAMES = frozenset(name.strip() for name in os.getenv("BOT_NICKNAME", "밀키웨이 봇").split(','))
 
 # 채팅 전송 딜레이 (초 단위, 기본값 0.1초)
 CHAT_DELAY = float(os.getenv("CHAT_DELAY", "0.1"))
 
 # 채널당 최대 인사말 등록 개수
-MAX_GREETINGS_PER_CHANNEL = int(os.getenv("MAX_GREETINGS_PER_CHANNEL", "30"))
\ No newline at end of file
+MAX_GREETINGS_PER_CHANNEL = int(os.getenv("MAX_GREETINGS_PER_CHANNEL", "30"))
+
+# 소켓 연결 하나에 구독할 최대 채널 수 (치지직 세션당 이벤트 구독 제한)
+CHAT_SUBSCRIPTIONS_PER_SOCKET = int(os.getenv("CHAT_SUBSCRIPTIONS_PER_SOCKET", "10"))
+# 발급받은 소켓 URL 재사용 시간 (초) — 새 연결을 열 때마다 URL 발급 API를 호출하지 않도록
+SOCKET_URL_TTL = float(os.getenv("SOCKET_URL_TTL", "120"))
+
+# 채널별 채팅 처리 대기열 길이
+CHAT_QUEUE_SIZE = int(os.getenv("CHAT_QUEUE_SIZE", "50"))
+# 대기열이 가득 찼을 때 정책: drop_oldest(기본) | drop_newest | block
+CHAT_QUEUE_POLICY = os.getenv("CHAT_QUEUE_POLICY", "drop_oldest")
+
+# 서버 시작 시 세션 복구 속도 제한 (치지직 API 호출 기준: 초당 토큰 수, 순간 최대 버스트)
+RESTORE_RATE_PER_SEC = float(os.getenv("RESTORE_RATE_PER_SEC", "5"))
+RESTORE_BURST = int(os.getenv("RESTORE_BURST", "10"))
+# 동시에 복구를 진행할 채널 수와 채널별 최대 재시도 횟수
+RESTORE_CONCURRENCY = int(os.getenv("RESTORE_CONCURRENCY", "10"))
+RESTORE_MAX_RETRIES = int(os.getenv("RESTORE_MAX_RETRIES", "3"))
+
+# 세션 감시(supervisor) 설정: 점검 주기, 비정상 상태 유예 시간, 동시 복구 수, 복구 백오프 상한 (초)
+SUPERVISOR_INTERVAL = float(os.getenv("SUPERVISOR_INTERVAL", "15"))
+SUPERVISOR_UNHEALTHY_GRACE = float(os.getenv("SUPERVISOR_UNHEALTHY_GRACE", "30"))
+SUPERVISOR_CONCURRENCY = int(os.getenv("SUPERVISOR_CONCURRENCY", "5"))
+SUPERVISOR_MAX_BACKOFF = float(os.getenv("SUPERVISOR_MAX_BACKOFF", "300"))
+# 방송 중인데 이 시간(초) 동안 채팅 이벤트가 하나도 없으면 구독이 끊긴 것으로 보고 재구독
+SUPERVISOR_STALE_AFTER = float(os.getenv("SUPERVISOR_STALE_AFTER", "900"))
+
+# --- 샤딩 설정 (여러 워커 프로세스가 채널을 나눠 담당) ---
+# 샤드 수 — 1이면 샤딩을 사용하지 않는다 (기본값: uvicorn 워커 수)
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", os.getenv("WEB_CONCURRENCY", "1")))
+# 샤드 리스 유효 시간과 하트비트 주기 (초)
+SHARD_LEASE_TTL = float(os.getenv("SHARD_LEASE_TTL", "15"))
+SHARD_HEARTBEAT_INTERVAL = float(os.getenv("SHARD_HEARTBEAT_INTERVAL", "5"))
+# 다른 샤드로 전달한 요청의 응답 대기 시간 (초)
+SHARD_FORWARD_TIMEOUT = float(os.getenv("SHARD_FORWARD_TIMEOUT", "10"))
+
+# --- 디스코드 방송 알림 폴러 리더 선출 (여러 인스턴스 중 하나만 폴링/알림) ---
+# 리더 리스 유효 시간과 연장/획득 시도 주기 (초) — 리더가 죽으면 리스 만료 후 한 주기 안에 대기 인스턴스가 이어받는다
+NOTIFIER_LEASE_TTL = float(os.getenv("NOTIFIER_LEASE_TTL", "30"))
+NOTIFIER_HEARTBEAT_INTERVAL = float(os.getenv("NOTIFIER_HEARTBEAT_INTERVAL", "10"))
+
+# --- 채널별 채팅 로그 (단일 기록 스레드가 파일에 기록) ---
+# 채널 로그 기본 레벨 — 실행 중에도 /chat/logging/level로 변경 가능
+CHAT_LOG_LEVEL = os.getenv("CHAT_LOG_LEVEL", "INFO").upper()
+# 채팅 줄 기록 비율 (0~1, 1이면 전부 기록) — 경고 이상은 항상 기록
+CHAT_LOG_SAMPLE_RATE = float(os.getenv("CHAT_LOG_SAMPLE_RATE", "1.0"))
+# 로그 파일 회전 기준 크기(바이트)와 보관 개수 — 날짜가 바뀌어도 회전한다
+CHAT_LOG_MAX_BYTES = int(os.getenv("CHAT_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+CHAT_LOG_BACKUP_COUNT = int(os.getenv("CHAT_LOG_BACKUP_COUNT", "5"))
+# 동시에 열어 둘 로그 파일 수 (오래 안 쓴 파일부터 닫음)
+CHAT_LOG_MAX_OPEN_FILES = int(os.getenv("CHAT_LOG_MAX_OPEN_FILES", "64"))
+# 기록 대기열 길이 — 가득 차면 새 로그를 버린다 (이벤트 루프가 디스크를 기다리지 않도록)
+CHAT_LOG_QUEUE_SIZE = int(os.getenv("CHAT_LOG_QUEUE_SIZE", "10000"))
+
+# --- 방송 알림 적응형 폴링 (채널마다 과거 방송 시작 시각으로 폴링 주기를 정함) ---
+# 평소 방송 시작 시각 근처의 빠른 주기와 최대(휴면 채널) 주기 (초)
+NOTIFIER_POLL_MIN_INTERVAL = float(os.getenv("NOTIFIER_POLL_MIN_INTERVAL", "20"))
+NOTIFIER_POLL_MAX_INTERVAL = float(os.getenv("NOTIFIER_POLL_MAX_INTERVAL", "900"))
+# 최근 방송했지만 지금은 평소 시작 시각이 아닌 채널, 기록이 없는 채널의 기본 주기 (초)
+NOTIFIER_POLL_DEFAULT_INTERVAL = float(os.getenv("NOTIFIER_POLL_DEFAULT_INTERVAL", "60"))
+# 전체 상태 조회 속도 제한 (초당 요청 수, 순간 최대 버스트)
+NOTIFIER_POLL_RATE_PER_SEC = float(os.getenv("NOTIFIER_POLL_RATE_PER_SEC", "2"))
+NOTIFIER_POLL_BURST = float(os.getenv("NOTIFIER_POLL_BURST", "10"))
+
+# 치지직 채널 정보(이름, 이미지 URL) 프로세스 내 캐시 유효 시간 (초)
+CHANNEL_INFO_TTL = float(os.getenv("CHANNEL_INFO_TTL", "3600"))
@@ -24,8 +24,8 @@ def create_db_engine(local_port):
     DATABASE_URL = f"postgresql+asyncpg://{config.DB_USER}:{config.DB_PASSWORD}@{db_host}:{db_port}/{config.DB_NAME}"
     return create_async_engine(
         DATABASE_URL,
-        pool_size=3,         # 1GB 서버 환경: 커넥션 3개로 충분 (각 ~5-10MB)
-        max_overflow=2,      # 순간 트래픽 대비 최대 5개까지 허용
+        pool_size=config.DB_POOL_SIZE,         # 1GB 서버 환경: 기본 3개로 충분 (각 ~5-10MB)
+        max_overflow=config.DB_MAX_OVERFLOW,   # 순간 트래픽 대비 추가 허용 (기본 2개)
         pool_recycle=3600,   # SSH 터널 특성상 끊김 방지를 위해 1시간마다 커넥션 재사용
         pool_pre_ping=True,
         echo=False           # SQL 로그가 필요하면 True
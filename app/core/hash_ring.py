@@ -0,0 +1,28 @@
+import bisect
+import hashlib
+from typing import Hashable, Iterable
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    일관된 해싱(consistent hashing) 링.
+    노드마다 가상 노드(vnodes)를 여러 개 두어 키를 고르게 분배하고,
+    노드 수가 바뀌어도 대부분의 키는 기존 노드에 그대로 남는다.
+    """
+
+    def __init__(self, nodes: Iterable[Hashable], vnodes: int = 128):
+        self._ring: list[tuple[int, Hashable]] = sorted(
+            (_hash(f"{node}#{i}"), node) for node in nodes for i in range(vnodes)
+        )
+        self._hashes = [h for h, _ in self._ring]
+        if not self._ring:
+            raise ValueError("HashRing에는 노드가 하나 이상 필요합니다.")
+
+    def node_for(self, key: str) -> Hashable:
+        """키를 담당하는 노드를 반환합니다 (링에서 시계 방향으로 가장 가까운 가상 노드)."""
+        idx = bisect.bisect(self._hashes, _hash(key)) % len(self._ring)
+        return self._ring[idx][1]
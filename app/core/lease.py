@@ -0,0 +1,82 @@
+import time
+from typing import Optional
+
+# 비어 있을 때만 획득하고, 획득에 성공하면 펜싱 토큰을 1 증가시켜 반환 (두 동작을 원자적으로)
+_ACQUIRE_FENCED_SCRIPT = """
+if redis.call('set', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+    return redis.call('incr', KEYS[2])
+end
+return 0
+"""
+
+# 소유자가 자신일 때만 만료 시간을 연장 (다른 프로세스가 가져간 리스를 덮어쓰지 않도록)
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# 소유자가 자신일 때만 삭제
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisLease:
+    """
+    Redis 키 하나로 구현한 만료 기반 리스(lease).
+    - acquire: SET NX PX로 비어 있을 때만 획득
+    - renew: 하트비트마다 만료 시간을 연장하며, 실패하면 리스를 잃은 것으로 본다
+    - Redis 장애로 연장 결과를 알 수 없을 때는 마지막 연장 후 ttl이 지나기 전까지만 보유 중으로 간주
+    - fencing=True면 획득할 때마다 단조 증가하는 펜싱 토큰(token)을 발급한다.
+      리스를 잃은 줄 모르는 이전 소유자의 늦은 쓰기를 저장소 쪽에서 토큰 비교로 거부하는 데 쓴다.
+    """
+
+    def __init__(self, redis_client, key: str, owner: str, ttl: float, fencing: bool = False):
+        self._redis = redis_client
+        self.key = key
+        self.owner = owner
+        self.ttl = ttl
+        self.fencing = fencing
+        self.token: Optional[int] = None
+        self._renewed_at: Optional[float] = None
+
+    @property
+    def held(self) -> bool:
+        return self._renewed_at is not None and time.monotonic() - self._renewed_at < self.ttl
+
+    async def acquire(self) -> bool:
+        if self.fencing:
+            # 펜싱 토큰 키는 만료시키지 않는다 (리스가 바뀌어도 토큰이 되돌아가지 않도록)
+            token = await self._redis.eval(
+                _ACQUIRE_FENCED_SCRIPT, 2, self.key, f"{self.key}:fence", self.owner, int(self.ttl * 1000)
+            )
+            acquired = bool(token)
+            if acquired:
+                self.token = int(token)
+        else:
+            acquired = await self._redis.set(self.key, self.owner, nx=True, px=int(self.ttl * 1000))
+        if acquired:
+            self._renewed_at = time.monotonic()
+        return bool(acquired)
+
+    async def renew(self) -> bool:
+        """리스를 연장합니다. 다른 소유자에게 넘어갔으면 False. (Redis 오류는 호출한 쪽으로 전파)"""
+        renewed = await self._redis.eval(_RENEW_SCRIPT, 1, self.key, self.owner, int(self.ttl * 1000))
+        if renewed:
+            self._renewed_at = time.monotonic()
+            return True
+        self._renewed_at = None
+        return False
+
+    async def release(self):
+        self._renewed_at = None
+        try:
+            await self._redis.eval(_RELEASE_SCRIPT, 1, self.key, self.owner)
+        except Exception:
+            # 해제 실패는 무시 — ttl이 지나면 자동으로 만료된다
+            pass
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import time
+from typing import Callable, Optional
+
+import httpx
+
+from app.core.local_cache import LocalTTLCache
+from app.core.logger import get_logger
+
+logger = get_logger("LiveStatus")
+
+_LIVE_STATUS_URL = "https://api.chzzk.naver.com/polling/v2/channels/{channel_id}/live-status"
+# Redis 캐시 유효 시간 (초) — 방송 중 상태는 오래, 방송 종료 상태는 짧게
+_OPEN_TTL = 300
+_CLOSE_TTL = 60
+# 프로세스 내 캐시 유효 시간 (초) — 출석이 몰릴 때 Redis 왕복도 생략
+_LOCAL_TTL = 10.0
+
+# callback(channel_id, status, content) — 방송 상태가 바뀔 때 호출 (빠르게 반환해야 한다)
+LiveStatusCallback = Callable[[str, str, dict], None]
+
+
+class LiveStatusService:
+    """
+    치지직 방송 상태(live-status) 조회를 한곳으로 모은 서비스.
+    - HTTP 클라이언트 하나를 공유하고, 프로세스 내 캐시 → Redis 캐시 → API 순으로 조회한다.
+    - 같은 채널에 대한 동시 API 요청은 하나로 합친다 (single-flight).
+    - 조회 결과 상태가 이전과 달라지면 구독자에게 알린다.
+    반환값은 live-status API의 content dict (status: OPEN/CLOSE), 조회 실패 시 None.
+    """
+
+    def __init__(self):
+        self._client = httpx.AsyncClient(timeout=5.0)
+        self._local = LocalTTLCache(maxsize=2048, ttl=_LOCAL_TTL)  # {channel_id: (조회 시각, content)}
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._last_status: dict[str, str] = {}
+        self._subscribers: list[LiveStatusCallback] = []
+
+    def subscribe(self, callback: LiveStatusCallback):
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: LiveStatusCallback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    async def get(self, channel_id: str, max_age: Optional[float] = None) -> Optional[dict]:
+        """
+        방송 상태를 반환합니다.
+        max_age를 주면 그보다 오래된 캐시는 쓰지 않고 API로 다시 확인한다 (알림 폴링용, 0이면 항상 API).
+        """
+        cached = self._local.get(channel_id)
+        if cached is not None:
+            fetched_at, content = cached
+            if max_age is None or time.monotonic() - fetched_at <= max_age:
+                return content
+
+        if max_age is None:
+            content = await self._get_from_redis(channel_id)
+            if content is not None:
+                # Redis 값은 언제 조회된 것인지 모르므로 max_age를 요구하는 호출에는 쓰지 않도록 조회 시각을 0으로 둔다
+                self._local.set(channel_id, (0.0, content))
+                self._publish(channel_id, content)
+                return content
+
+        return await self._fetch(channel_id)
+
+    async def prefetch(self, channel_id: str):
+        """캐시가 없을 때만 방송 상태를 미리 조회해 둡니다."""
+        await self.get(channel_id)
+
+    async def _get_from_redis(self, channel_id: str) -> Optional[dict]:
+        # 순환 참조 방지를 위해 함수 내에서 임포트
+        from app.redis.redis_service import redis_client
+        try:
+            cached = await redis_client.get(f"live_status:{channel_id}")
+        except Exception as e:
+            logger.warning(f"⚠️ [{channel_id}] 방송 상태 캐시 조회 실패: {e}")
+            return None
+        if cached is None:
+            return None
+        if cached == "CLOSE":
+            return {"status": "CLOSE"}
+        return json.loads(cached)
+
+    async def _fetch(self, channel_id: str) -> Optional[dict]:
+        # 이미 진행 중인 요청이 있으면 그 결과를 함께 기다린다
+        pending = self._inflight.get(channel_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[channel_id] = future
+        try:
+            content = await self._request(channel_id)
+            future.set_result(content)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 기다리는 쪽이 없을 때 "예외가 회수되지 않음" 경고가 나지 않도록
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(channel_id, None)
+        return content
+
+    async def _request(self, channel_id: str) -> Optional[dict]:
+        from app.redis.redis_service import redis_client
+        try:
+            res = await self._client.get(_LIVE_STATUS_URL.format(channel_id=channel_id))
+        except httpx.HTTPError as e:
+            logger.warning(f"⚠️ [{channel_id}] 방송 상태 조회 실패: {e}")
+            return None
+        if res.status_code != 200:
+            logger.warning(f"⚠️ [{channel_id}] 방송 상태 API 에러: {res.status_code}")
+            return None
+
+        content = res.json().get("content") or {}
+        if content.get("status") != "OPEN":
+            # 상태값이 없거나 알 수 없는 값이면 캐싱하지 않는다 (호출한 쪽에서 판단)
+            if content.get("status") != "CLOSE":
+                return content
+            cached_value, ttl = "CLOSE", _CLOSE_TTL
+        else:
+            cached_value, ttl = json.dumps(content), _OPEN_TTL
+
+        self._local.set(channel_id, (time.monotonic(), content))
+        try:
+            await redis_client.set(f"live_status:{channel_id}", cached_value, ex=ttl)
+        except Exception as e:
+            logger.warning(f"⚠️ [{channel_id}] 방송 상태 캐싱 실패: {e}")
+        self._publish(channel_id, content)
+        return content
+
+    def _publish(self, channel_id: str, content: dict):
+        status = content.get("status")
+        if self._last_status.get(channel_id) == status:
+            return
+        self._last_status[channel_id] = status
+        for callback in list(self._subscribers):
+            try:
+                callback(channel_id, status, content)
+            except Exception as e:
+                logger.error(f"❌ [{channel_id}] 방송 상태 구독자 처리 실패: {e}")
+
+    async def close(self):
+        await self._client.aclose()
+
+
+# 모듈 레벨 싱글톤 — 알림 cog, 출석(방송 세션 동기화), 인사말 프리워밍이 같은 클라이언트/캐시를 공유
+live_status_service = LiveStatusService()
@@ -1,10 +1,22 @@
 import logging
 import os
+import queue
+import random
 import sys
+import threading
+import time
+from collections import OrderedDict
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+import app.core.config as config
 
 # 공통 로그 포맷 정의
 LOG_FORMAT = "%(asctime)s - [%(name)s] - %(levelname)s - %(message)s"
 
+# 채널 로거는 모두 이 로거의 자식 — 부모 레벨만 바꾸면 전체 채널 로그 레벨이 바뀐다
+CHANNEL_LOGGER_ROOT = "Chzzk"
+
 def setup_global_logging():
     """앱 전역 로깅 설정 (Main 진입점에서 호출 권장)"""
     logging.basicConfig(
@@ -17,27 +29,190 @@ def get_logger(name: str):
     """일반 모듈용 표준 로거"""
     return logging.getLogger(name)
 
-def get_channel_logger(channel_name: str):
+
+class _ChannelFileHandler(RotatingFileHandler):
+    """크기가 maxBytes를 넘거나 날짜가 바뀌면 회전하는 파일 핸들러."""
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+        self._day = time.strftime("%Y%m%d")
+
+    def shouldRollover(self, record) -> bool:
+        if time.strftime("%Y%m%d") != self._day and os.path.exists(self.baseFilename):
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self._day = time.strftime("%Y%m%d")
+
+
+class _ChannelRouter(logging.Handler):
+    """
+    기록 스레드에서 로거 이름별로 logs/{channel_name}/chat_client.log 파일에 나눠 기록합니다.
+    - 파일 핸들러는 최근 사용 순(LRU)으로 max_open개까지만 열어 두고, 밀려난 파일은 닫는다.
+    - QueueListener 스레드 하나에서만 호출되므로 별도 락이 필요 없다.
     """
-    채팅 클라이언트 전용 로거 (기존 ChatClient 내부 로직 이동)
-    - logs/{channel_name}/chat_client.log 에 파일로 저장
+
+    def __init__(self, max_open: int, max_bytes: int, backup_count: int):
+        super().__init__()
+        self._max_open = max(1, max_open)
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._files: OrderedDict[str, _ChannelFileHandler] = OrderedDict()
+        self.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    def _file_for(self, logger_name: str) -> _ChannelFileHandler:
+        handler = self._files.get(logger_name)
+        if handler is not None:
+            self._files.move_to_end(logger_name)
+            return handler
+
+        channel_name = logger_name.partition(".")[2] or logger_name
+        log_dir = os.path.join("logs", channel_name)
+        os.makedirs(log_dir, exist_ok=True)
+        handler = _ChannelFileHandler(
+            os.path.join(log_dir, "chat_client.log"), self._max_bytes, self._backup_count
+        )
+        handler.setFormatter(self.formatter)
+        self._files[logger_name] = handler
+
+        while len(self._files) > self._max_open:
+            _, evicted = self._files.popitem(last=False)
+            evicted.close()
+        return handler
+
+    def emit(self, record):
+        try:
+            self._file_for(record.name).handle(record)
+        except Exception:
+            self.handleError(record)
+
+    @property
+    def open_files(self) -> int:
+        return len(self._files)
+
+    def close(self):
+        for handler in self._files.values():
+            handler.close()
+        self._files.clear()
+        super().close()
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """대기열이 가득 차면 기다리지 않고 버리는 QueueHandler (버린 개수만 센다)."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _SamplingFilter(logging.Filter):
+    """채팅 줄을 채널별 비율로 표본 기록합니다. 경고 이상은 항상 통과."""
+
+    def __init__(self, channel_name: str):
+        super().__init__()
+        self.channel_name = channel_name
+
+    def filter(self, record) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = _sample_rates.get(self.channel_name, _default_sample_rate)
+        return rate >= 1.0 or random.random() < rate
+
+
+# 채널 로그 파이프라인: 로거(이벤트 루프) → 큐 → 기록 스레드 하나 → 채널별 회전 파일
+_log_queue: queue.Queue = queue.Queue(maxsize=config.CHAT_LOG_QUEUE_SIZE)
+_queue_handler = _DroppingQueueHandler(_log_queue)
+_router = _ChannelRouter(config.CHAT_LOG_MAX_OPEN_FILES, config.CHAT_LOG_MAX_BYTES, config.CHAT_LOG_BACKUP_COUNT)
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+_default_sample_rate = config.CHAT_LOG_SAMPLE_RATE
+_sample_rates: dict[str, float] = {}
+
+logging.getLogger(CHANNEL_LOGGER_ROOT).setLevel(config.CHAT_LOG_LEVEL)
+
+
+def _ensure_listener():
+    global _listener
+    if _listener is not None:
+        return
+    with _listener_lock:
+        if _listener is None:
+            _listener = QueueListener(_log_queue, _router)
+            _listener.start()
+
+
+def stop_channel_logging():
+    """기록 스레드를 멈추고 대기열에 남은 로그를 모두 기록한 뒤 파일을 닫습니다. (서버 종료 시 호출)"""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        _listener = None
+    _router.close()
+
+
+def get_channel_logger(channel_name: str, sampled: bool = False):
+    """
+    채팅 클라이언트 전용 로거
+    - logs/{channel_name}/chat_client.log 에 기록 (크기/날짜 기준 회전)
+    - 실제 파일 기록은 기록 스레드가 담당하므로 호출한 쪽(이벤트 루프)은 디스크 I/O를 기다리지 않는다
+    - sampled=True면 채널별 표본 비율을 적용 (채팅 줄 로거용)
     - 콘솔 중복 출력을 막기 위해 propagate=False 설정
     """
-    logger = logging.getLogger(f"Chzzk.{channel_name}")
-    logger.setLevel(logging.DEBUG)
-    logger.propagate = False 
-
-    # 로그 디렉토리 생성 (OS 호환 경로)
-    log_dir = os.path.join("logs", channel_name)
-    os.makedirs(log_dir, exist_ok=True)
-    log_file = os.path.join(log_dir, "chat_client.log")
-    
+    logger = logging.getLogger(f"{CHANNEL_LOGGER_ROOT}.{channel_name}")
+    logger.propagate = False
+
     # 중복 핸들러 추가 방지
     if not logger.handlers:
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(logging.DEBUG)
-        formatter = logging.Formatter(LOG_FORMAT)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    
+        logger.addHandler(_queue_handler)
+    if sampled and not logger.filters:
+        logger.addFilter(_SamplingFilter(channel_name))
+
+    _ensure_listener()
     return logger
+
+
+def set_channel_log_level(level: str, channel_name: Optional[str] = None) -> str:
+    """
+    채널 로그 레벨을 실행 중에 변경합니다.
+    channel_name이 없으면 전체 채널 기본값을, 있으면 해당 채널만 바꾼다 ("DEFAULT"면 채널 설정 해제).
+    """
+    level = level.upper()
+    if channel_name is None:
+        logging.getLogger(CHANNEL_LOGGER_ROOT).setLevel(level)
+    else:
+        logging.getLogger(f"{CHANNEL_LOGGER_ROOT}.{channel_name}").setLevel(
+            logging.NOTSET if level == "DEFAULT" else level
+        )
+    return level
+
+
+def set_channel_sample_rate(rate: float, channel_name: Optional[str] = None):
+    """채팅 줄 표본 비율(0~1)을 변경합니다. channel_name이 없으면 전체 기본값."""
+    global _default_sample_rate
+    rate = min(max(rate, 0.0), 1.0)
+    if channel_name is None:
+        _default_sample_rate = rate
+    else:
+        _sample_rates[channel_name] = rate
+
+
+def channel_logging_stats() -> dict:
+    return {
+        "level": logging.getLevelName(logging.getLogger(CHANNEL_LOGGER_ROOT).level),
+        "sample_rate": _default_sample_rate,
+        "channel_sample_rates": dict(_sample_rates),
+        "queued": _log_queue.qsize(),
+        "dropped": _queue_handler.dropped,
+        "open_files": _router.open_files,
+    }
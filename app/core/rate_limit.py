@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    비동기 토큰 버킷 레이트 리미터.
+    - 초당 rate개씩 토큰이 채워지고 최대 capacity개까지 쌓인다 (순간 버스트 허용량).
+    - acquire()는 토큰이 생길 때까지 기다린 뒤 소비한다.
+    asyncio 단일 스레드에서 사용하며, 대기 순서를 지키기 위해 락으로 직렬화한다.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self._rate = max(rate, 0.001)
+        self._capacity = max(capacity, 1.0)
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._lock: asyncio.Lock | None = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """토큰이 있으면 소비하고 True, 없으면 기다리지 않고 False."""
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+    async def acquire(self, tokens: float = 1.0):
+        # 이벤트 루프가 뜬 뒤 생성 (모듈 임포트 시점에는 루프가 없을 수 있음)
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while not self.try_acquire(tokens):
+                await asyncio.sleep((tokens - self._tokens) / self._rate)
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
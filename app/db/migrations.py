@@ -0,0 +1,95 @@
+from sqlalchemy import select, delete, exists, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.db.models import CommandAlias, GlobalCommand, ChatCommand, ChatGreeting
+from app.features.chat.command_index import split_aliases
+
+
+def alias_rows(target_type: str, target_id: int, channel_id, command: str) -> list[dict]:
+    """명령어/키워드 하나에 대한 command_alias 행 목록을 만듭니다."""
+    return [
+        {"channel_id": channel_id, "alias": alias, "target_type": target_type, "target_id": target_id}
+        for alias in split_aliases(command)
+    ]
+
+
+async def migrate_command_aliases(engine: AsyncEngine, rebuild: bool = False):
+    """
+    command_alias 테이블을 생성(없을 때)하고 별칭을 백필합니다. 서버 시작 시마다, 여러 워커가 동시에 호출해도 안전합니다.
+    - 글로벌 명령어는 관리자가 DB에서 직접 수정하므로 매번 현재 명령어와 맞춘다 (없는 별칭 추가, 사라진 별칭 삭제).
+    - 채널 명령어/인사말은 ChatService 쓰기 메서드가 동기화하므로, 별칭이 하나도 없는 행만 백필한다
+      (별칭 테이블을 모르는 이전 버전 워커가 쓴 행 포함).
+    - rebuild=True면 채널 별칭도 전부 다시 만든다.
+    """
+    async with engine.begin() as conn:
+        # 여러 워커가 동시에 시작해도 마이그레이션은 하나씩 (테이블 생성/인덱스 생성 경합과 교착 방지)
+        await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('migrate_command_aliases'))"))
+        await conn.run_sync(CommandAlias.__table__.create, checkfirst=True)
+        # 고유 제약 이전에 만들어진 테이블 — 중복 행을 정리하고 제약을 붙인다
+        await conn.execute(text(
+            "DELETE FROM command_alias a USING command_alias b "
+            "WHERE a.id > b.id AND a.target_type = b.target_type "
+            "AND a.target_id = b.target_id AND a.alias = b.alias"
+        ))
+        await conn.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_command_alias_target "
+            "ON command_alias (target_type, target_id, alias)"
+        ))
+
+        # 1. 글로벌 명령어 별칭 동기화
+        global_rows = []
+        for cmd_id, command in (await conn.execute(select(GlobalCommand.id, GlobalCommand.command))).all():
+            global_rows.extend(alias_rows("global", cmd_id, None, command))
+        wanted = {(row["target_id"], row["alias"]) for row in global_rows}
+        stmt = select(CommandAlias.id, CommandAlias.target_id, CommandAlias.alias).where(CommandAlias.target_type == "global")
+        stale = [alias_id for alias_id, target_id, alias in (await conn.execute(stmt)).all() if (target_id, alias) not in wanted]
+        if stale:
+            await conn.execute(delete(CommandAlias).where(CommandAlias.id.in_(stale)))
+        await _insert_aliases(conn, global_rows)
+
+        # 2. 채널 명령어/인사말 별칭 백필
+        if rebuild:
+            await conn.execute(delete(CommandAlias).where(CommandAlias.target_type != "global"))
+
+        channel_rows = []
+        stmt = select(ChatCommand.id, ChatCommand.channel_id, ChatCommand.command).where(~_has_alias("custom", ChatCommand.id))
+        for cmd_id, channel_id, command in (await conn.execute(stmt)).all():
+            channel_rows.extend(alias_rows("custom", cmd_id, channel_id, command))
+        stmt = select(ChatGreeting.id, ChatGreeting.channel_id, ChatGreeting.keyword).where(~_has_alias("greeting", ChatGreeting.id))
+        for greeting_id, channel_id, keyword in (await conn.execute(stmt)).all():
+            channel_rows.extend(alias_rows("greeting", greeting_id, channel_id, keyword))
+        await _insert_aliases(conn, channel_rows)
+
+        print(f"✅ [Migration] command_alias 동기화 완료: 글로벌 {len(global_rows)}개 (삭제 {len(stale)}개), 채널 백필 {len(channel_rows)}개")
+
+
+def _has_alias(target_type: str, target_id_column):
+    return exists().where(CommandAlias.target_type == target_type, CommandAlias.target_id == target_id_column)
+
+
+async def _insert_aliases(conn, rows: list[dict]):
+    # 동시에 시작한 다른 워커가 먼저 넣은 별칭은 건너뛴다
+    if rows:
+        await conn.execute(insert(CommandAlias).on_conflict_do_nothing(index_elements=["target_type", "target_id", "alias"]), rows)
+
+
+async def migrate_chzzk_notifications(engine: AsyncEngine):
+    """
+    chzzk_notifications에 추가된 컬럼을 만듭니다 (없을 때만). 서버 시작 시마다 호출해도 안전합니다.
+    - notifier_fence: 알림 리더 펜싱 토큰
+    - updated_at: 알림 설정 변경 시각 (알림 cog 증분 동기화용)
+    """
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "ALTER TABLE chzzk_notifications "
+            "ADD COLUMN IF NOT EXISTS notifier_fence BIGINT NOT NULL DEFAULT 0"
+        ))
+        await conn.execute(text(
+            "ALTER TABLE chzzk_notifications "
+            "ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now()"
+        ))
+        await conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_chzzk_notifications_updated_at "
+            "ON chzzk_notifications (updated_at)"
+        ))
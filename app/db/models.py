@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, BigInteger, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.sql import func
 
@@ -58,6 +58,22 @@ class ChatCommand(Base):
         UniqueConstraint('channel_id', 'command', name='unique_command_per_channel'),
     )
 
+class CommandAlias(Base):
+    __tablename__ = "command_alias"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # 글로벌 명령어의 별칭은 채널 ID가 NULL
+    channel_id = Column(String(100), ForeignKey("auth_token.channel_id", ondelete="CASCADE"), nullable=True, comment="채널 ID (글로벌은 NULL)")
+    alias = Column(String, nullable=False, comment="별칭 ('|'로 분리된 각 명령어/키워드 및 전체 문자열)")
+    target_type = Column(String(20), nullable=False, comment="별칭 대상 (custom/global/greeting)")
+    target_id = Column(Integer, nullable=False, comment="대상 행 ID (chat_commands/global_chat_commands/chat_greetings)")
+
+    __table_args__ = (
+        Index('ix_command_alias_channel_alias', 'channel_id', 'alias'),
+        # 대상 행마다 별칭 하나씩만 — 대상이 채널을 정하므로 channel_id는 키에 넣지 않는다 (글로벌의 NULL끼리는 중복 판정이 안 됨)
+        UniqueConstraint('target_type', 'target_id', 'alias', name='uq_command_alias_target'),
+    )
+
 class ChatGreeting(Base):
     __tablename__ = "chat_greetings"
 
@@ -111,6 +127,8 @@ class ChzzkNotification(Base):
     is_active = Column(Boolean, default=True, comment="알림 활성화 여부")
     last_status = Column(String(10), default='CLOSE', comment="마지막 방송 상태 (OPEN/CLOSE)")
     last_notified_at = Column(DateTime(timezone=True), nullable=True, comment="마지막 알림 전송 시간")
+    notifier_fence = Column(BigInteger, nullable=False, default=0, server_default="0", comment="마지막으로 상태를 기록한 알림 리더의 펜싱 토큰")
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True, comment="알림 설정 변경 시각 (증분 동기화용, 방송 상태 기록 시에는 바뀌지 않음)")
 
     __table_args__ = (
         UniqueConstraint('chzzk_channel_id', 'discord_channel_id', name='unique_chzzk_discord_notification'),
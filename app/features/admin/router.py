@@ -1,16 +1,25 @@
-from fastapi import APIRouter, Depends
+import json
+import time
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.core.chzzk_api import chzzk_api
 from app.core.database import get_async_db
 from app.db.models import AuthToken
 from app.redis.redis_service import redis_client, RedisConfigService
 from app.features.chat.service import ChatService
+from app.features.chat.handling.greeting_matcher import EMPTY_SENTINEL
 
 admin_router = APIRouter(prefix="/admin", tags=["admin"])
 
 redis_service = RedisConfigService()
 
+# SCAN 한 번에 요청할 키 개수 힌트 — 이 단위로 HGETALL/TTL을 파이프라인으로 묶는다
+_SCAN_BATCH = 100
+
 
 @admin_router.get(
     "/greeting/redis/{channel_id}",
@@ -37,7 +46,7 @@ async def get_channel_greeting_cache(channel_id: str):
     greetings = [
         {"keyword": k, "response": v}
         for k, v in raw.items()
-        if k != "__empty__"
+        if k != EMPTY_SENTINEL
     ]
 
     return {
@@ -52,39 +61,76 @@ async def get_channel_greeting_cache(channel_id: str):
 @admin_router.get(
     "/greeting/redis",
     summary="전체 채널 Redis 인사말 조회",
-    description="Redis에 캐싱된 모든 채널의 인사말 목록을 반환합니다.",
+    description=(
+        "Redis에 캐싱된 채널의 인사말 목록을 SCAN 커서 단위로 스트리밍합니다. "
+        "응답의 next_cursor를 다음 요청의 cursor로 넘기면 이어서 조회하며, next_cursor가 0이면 마지막 페이지입니다."
+    ),
 )
-async def get_all_greeting_cache():
+async def get_all_greeting_cache(
+    cursor: int = Query(0, ge=0, description="이전 응답의 next_cursor (처음 조회 시 0)"),
+    limit: int = Query(200, ge=1, le=1000, description="한 페이지에 담을 최대 채널 수 (SCAN 한 번에 이보다 많은 키가 나오면 그 배치만 예외적으로 초과)"),
+):
+    return StreamingResponse(_stream_greeting_cache(cursor, limit), media_type="application/json")
+
+
+async def _stream_greeting_cache(cursor: int, limit: int):
+    """
+    KEYS 대신 SCAN으로 키를 나눠 읽고, 배치마다 HGETALL/TTL을 파이프라인으로 한 번에 조회합니다.
+    채널 항목을 읽는 즉시 내보내므로 채널 수가 늘어도 메모리 사용량이 일정합니다.
+    """
+    yield '{"channels": ['
+    count = 0
+    # 다음 페이지가 시작할 커서 — 배치를 모두 내보낸 뒤에만 전진시켜, 중간에 실패하거나 멈춰도 키를 건너뛰지 않는다
+    next_cursor = cursor
+    error = None
+
     try:
-        keys = await redis_client.keys("greetings:*")
+        while True:
+            scan_cursor, keys = await redis_client.scan(
+                cursor=next_cursor, match="greetings:*", count=min(_SCAN_BATCH, limit - count)
+            )
+            # 이 배치를 담으면 limit을 넘는 경우 — 다음 페이지가 이 배치부터 읽도록 커서를 그대로 둔다
+            # (페이지의 첫 배치는 limit보다 커도 담는다. 그렇지 않으면 같은 커서만 계속 돌려주게 된다)
+            if count and count + len(keys) > limit:
+                break
+
+            if keys:
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    for key in keys:
+                        pipe.hgetall(key)
+                        pipe.ttl(key)
+                    results = await pipe.execute()
+
+                for key, raw, ttl in zip(keys, results[0::2], results[1::2]):
+                    # SCAN과 HGETALL 사이에 만료된 키는 건너뜀
+                    if not raw:
+                        continue
+                    greetings = [
+                        {"keyword": k, "response": v}
+                        for k, v in raw.items()
+                        if k != EMPTY_SENTINEL
+                    ]
+                    item = {
+                        "channel_id": key.removeprefix("greetings:"),
+                        "count": len(greetings),
+                        "ttl_seconds": ttl,
+                        "greetings": greetings,
+                    }
+                    yield ("" if count == 0 else ", ") + json.dumps(item, ensure_ascii=False)
+                    count += 1
+
+            next_cursor = scan_cursor
+            if next_cursor == 0 or count >= limit:
+                break
     except Exception as e:
-        return {"status": "error", "message": f"Redis 키 조회 실패: {e}"}
-
-    channels = []
-    for key in keys:
-        channel_id = key.removeprefix("greetings:")
-        try:
-            raw = await redis_client.hgetall(key)
-            ttl = await redis_client.ttl(key)
-        except Exception:
-            continue
-
-        greetings = [
-            {"keyword": k, "response": v}
-            for k, v in raw.items()
-            if k != "__empty__"
-        ]
-        channels.append({
-            "channel_id": channel_id,
-            "count": len(greetings),
-            "ttl_seconds": ttl,
-            "greetings": greetings,
-        })
+        error = f"Redis 조회 실패: {e}"
 
-    return {
-        "total_channels": len(channels),
-        "channels": channels,
-    }
+    # page_count는 이 페이지에 담긴 채널 수 (전체 채널 수가 아님)
+    tail = {"page_count": count, "next_cursor": next_cursor}
+    if error:
+        tail.update({"status": "error", "message": error})
+    # 채널 배열을 닫고 나머지 필드를 이어 붙인다
+    yield "], " + json.dumps(tail, ensure_ascii=False)[1:]
 
 
 @admin_router.post(
@@ -92,50 +138,71 @@ async def get_all_greeting_cache():
     summary="채널 인사말 Redis 수동 갱신",
     description="DB에 등록된 특정 채널의 인사말을 Redis에 즉시 갱신합니다.",
 )
-async def refresh_channel_greeting_cache(
-    channel_id: str,
-    db: AsyncSession = Depends(get_async_db),
-):
-    chat_service = ChatService(db)
-    greetings = await chat_service.get_channel_greetings(channel_id)
-
-    await redis_service.refresh_greetings_cache(channel_id)
+async def refresh_channel_greeting_cache(channel_id: str):
+    count = await redis_service.refresh_greetings_cache(channel_id)
 
     return {
         "status": "success",
         "channel_id": channel_id,
-        "count": len(greetings),
-        "message": f"인사말 {len(greetings)}개가 Redis에 갱신되었습니다.",
+        "count": count,
+        "message": f"인사말 {count}개가 Redis에 갱신되었습니다.",
     }
 
 
 @admin_router.post(
     "/greeting/refresh",
     summary="전체 채널 인사말 Redis 수동 갱신",
-    description="DB에 등록된 모든 채널의 인사말을 Redis에 즉시 갱신합니다.",
+    description="DB에 등록된 모든 채널의 인사말을 한 번의 쿼리로 불러와 Redis 파이프라인으로 일괄 갱신합니다.",
 )
 async def refresh_all_greeting_cache(
     db: AsyncSession = Depends(get_async_db),
 ):
+    started = time.perf_counter()
     result = await db.execute(select(AuthToken.channel_id))
     channel_ids = result.scalars().all()
 
-    total_greetings = 0
-    failed_channels = []
+    chat_service = ChatService(db)
+    grouped = await chat_service.get_greetings_by_channels(channel_ids)
+    if grouped is None:
+        return {"status": "error", "message": "DB에서 인사말을 불러오지 못했습니다."}
+    db_ms = round((time.perf_counter() - started) * 1000, 2)
 
-    for channel_id in channel_ids:
-        try:
-            chat_service = ChatService(db)
-            greetings = await chat_service.get_channel_greetings(channel_id)
-            await redis_service.refresh_greetings_cache(channel_id)
-            total_greetings += len(greetings)
-        except Exception as e:
-            failed_channels.append({"channel_id": channel_id, "error": str(e)})
+    timings, failed_channels = await redis_service.bulk_refresh_greetings_cache(grouped)
+    redis_ms = round((time.perf_counter() - started) * 1000, 2) - db_ms
 
     return {
         "status": "success" if not failed_channels else "partial",
-        "refreshed_channels": len(channel_ids) - len(failed_channels),
-        "total_greetings": total_greetings,
+        "refreshed_channels": len(timings),
+        "total_greetings": sum(t["count"] for t in timings),
         "failed_channels": failed_channels,
-        "message": f"{len(channel_ids) - len(failed_channels)}개 채널의 인사말이 Redis에 갱신되었습니다.",
+        "db_ms": db_ms,
+        "redis_ms": round(redis_ms, 2),
+        "channel_timings": timings,
+        "message": f"{len(timings)}개 채널의 인사말이 Redis에 갱신되었습니다.",
+    }
+
+
+@admin_router.get(
+    "/channels",
+    summary="등록 채널 정보 조회",
+    description="인증된 모든 채널의 치지직 채널 정보(이름, 이미지, 팔로워 수)를 묶음 요청으로 조회합니다. 결과는 프로세스 내에 캐싱됩니다.",
+)
+async def get_registered_channels(
+    db: AsyncSession = Depends(get_async_db),
+):
+    result = await db.execute(select(AuthToken.channel_id, AuthToken.channel_name))
+    rows = result.all()
+    infos = await chzzk_api.get_channels_info(channel_id for channel_id, _ in rows)
+
+    return {
+        "count": len(rows),
+        "channels": [
+            {
+                "channel_id": channel_id,
+                "channel_name": infos.get(channel_id, {}).get("channelName") or channel_name,
+                "channel_image_url": infos.get(channel_id, {}).get("channelImageUrl"),
+                "follower_count": infos.get(channel_id, {}).get("followerCount"),
+            }
+            for channel_id, channel_name in rows
+        ],
     }
@@ -4,9 +4,10 @@ from fastapi import APIRouter, HTTPException, Depends, Query, Cookie, Background
 from fastapi.responses import RedirectResponse, HTMLResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.chzzk_api import chzzk_api
 from app.core.database import get_async_db
 from app.features.auth.service import AuthService
-from app.features.chat.session_manager import session_manager
+from app.features.chat.sharding import shard_coordinator
 
 auth_router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -59,7 +60,8 @@ async def callback_auth(
     inserted_data = await auth_service.save_chzzk_auth(chzzk_auth)
     
     # [추가] 인증 완료 후 백그라운드에서 세션 생성 및 채팅 연결 시작
-    background_tasks.add_task(session_manager.get_or_create_session, chzzk_auth.channel_id)
+    # 샤딩 시 채널을 담당하는 샤드에서 생성
+    background_tasks.add_task(shard_coordinator.call, chzzk_auth.channel_id, "create")
     
     channel_name = getattr(inserted_data, 'channel_name', chzzk_auth.channel_name)
 
@@ -126,7 +128,10 @@ async def get_auth_token_list(
 ):
     auth_service = AuthService(db)
     rows = await auth_service.get_auth_list(channel_name)
-    
+
+    # 채널 이미지 등 치지직 채널 정보를 묶음 요청으로 한 번에 조회 (캐시된 채널은 요청 없음)
+    infos = await chzzk_api.get_channels_info(row.channel_id for row in rows)
+
     # 결과를 딕셔너리 리스트로 변환하여 반환
     return {
         "count": len(rows),
@@ -134,6 +139,7 @@ async def get_auth_token_list(
             {
                 "channel_id": row.channel_id,
                 "channel_name": row.channel_name,
+                "channel_image_url": infos.get(row.channel_id, {}).get("channelImageUrl"),
                 "expires_at": row.expires_at,
                 "created_at": getattr(row, 'created_at', None)
             } for row in rows
@@ -157,7 +163,7 @@ async def refresh_token(
     await chat_service.sync_stream_session(channel_id)
 
     # 3. 활성화된 세션이 있다면 메모리 상의 토큰도 업데이트
-    await session_manager.update_session_token(channel_id, new_token)
+    await shard_coordinator.call(channel_id, "update_token", {"access_token": new_token})
 
     return {"status": "success", "new_access_token": new_token}
 
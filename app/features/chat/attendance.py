@@ -0,0 +1,160 @@
+import asyncio
+
+from sqlalchemy import case, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_session_factory
+from app.db.models import Attendance
+from app.features.chat.stream_session_cache import ChannelSessions
+
+# 배치 수집 시간 — 방송 시작 직후 몰리는 출석 요청을 한 번의 INSERT로 묶는다
+_BATCH_WINDOW = 0.05
+# 한 번의 INSERT에 담을 최대 인원 (넘치면 즉시 실행)
+_MAX_BATCH_SIZE = 200
+
+
+async def upsert_attendance(db: AsyncSession, channel_id: str, sessions: ChannelSessions, users: dict[str, str]) -> dict[str, dict]:
+    """
+    여러 유저의 출석을 INSERT ... ON CONFLICT DO UPDATE 한 번으로 처리합니다.
+    연속/누적 출석 계산은 DB에서 수행하며, 이미 이번 방송에 출석한 유저는 갱신하지 않습니다.
+    반환값: {user_id: 출석 결과 dict}
+    """
+    stmt = insert(Attendance).values([
+        {
+            "channel_id": channel_id,
+            "user_id": user_id,
+            "user_name": user_name,
+            "attendance_count": 1,
+            "streak_count": 1,
+            "last_attendance_at": sessions.opened_at,
+        }
+        for user_id, user_name in users.items()
+    ])
+
+    # 직전 방송에 출석했다면 연속 출석 +1, 아니면 1로 초기화
+    if sessions.previous_opened_at is not None:
+        streak = case(
+            (Attendance.last_attendance_at == sessions.previous_opened_at, Attendance.streak_count + 1),
+            else_=1,
+        )
+    else:
+        streak = literal(1)
+
+    stmt = stmt.on_conflict_do_update(
+        constraint="unique_user_per_channel_attendance",
+        set_={
+            "attendance_count": Attendance.attendance_count + 1,
+            "streak_count": streak,
+            "last_attendance_at": stmt.excluded.last_attendance_at,
+            "user_name": stmt.excluded.user_name,
+        },
+        # 이번 방송에 이미 출석한 행은 갱신하지 않음 (RETURNING에서도 빠짐)
+        where=Attendance.last_attendance_at.is_distinct_from(stmt.excluded.last_attendance_at),
+    ).returning(
+        Attendance.user_id,
+        Attendance.streak_count,
+        Attendance.attendance_count,
+        # xmax = 0 이면 새로 INSERT된 행
+        literal_column("xmax = 0").label("inserted"),
+    )
+
+    results = {}
+    for row in (await db.execute(stmt)).all():
+        results[row.user_id] = {
+            "status": "checked",
+            "streak": row.streak_count,
+            "total": row.attendance_count,
+            "is_new": bool(row.inserted),
+        }
+
+    # RETURNING에 없는 유저는 이미 출석한 상태 — 현재 값만 조회
+    already = [user_id for user_id in users if user_id not in results]
+    if already:
+        stmt_att = select(Attendance.user_id, Attendance.streak_count, Attendance.attendance_count).where(
+            Attendance.channel_id == channel_id,
+            Attendance.user_id.in_(already),
+        )
+        for row in (await db.execute(stmt_att)).all():
+            results[row.user_id] = {
+                "status": "already_checked",
+                "streak": row.streak_count,
+                "total": row.attendance_count,
+                "is_new": False,
+            }
+
+    await db.commit()
+    return results
+
+
+class AttendanceBatcher:
+    """
+    짧은 시간(_BATCH_WINDOW) 동안 들어온 같은 채널·같은 방송의 출석 요청을 모아
+    upsert_attendance 한 번으로 처리하는 마이크로 배처.
+    """
+
+    def __init__(self):
+        # {(channel_id, ChannelSessions): [(user_id, user_name, future), ...]}
+        self._pending: dict[tuple[str, ChannelSessions], list] = {}
+        self._timers: dict[tuple[str, ChannelSessions], asyncio.Task] = {}
+        self._tasks: set[asyncio.Task] = set()  # 바로 실행한 배치 (참조 유지 — 도중에 GC되면 요청자의 future가 끝나지 않음)
+
+    async def submit(self, channel_id: str, user_id: str, user_name: str, sessions: ChannelSessions) -> dict:
+        key = (channel_id, sessions)
+        future = asyncio.get_running_loop().create_future()
+        requests = self._pending.setdefault(key, [])
+        requests.append((user_id, user_name, future))
+
+        if len(requests) >= _MAX_BATCH_SIZE:
+            # 배치가 가득 차면 타이머를 기다리지 않고 바로 실행
+            del self._pending[key]
+            task = asyncio.create_task(self._execute(channel_id, sessions, requests))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        elif key not in self._timers:
+            self._timers[key] = asyncio.create_task(self._flush_later(key))
+
+        return await future
+
+    async def _flush_later(self, key):
+        await asyncio.sleep(_BATCH_WINDOW)
+        self._timers.pop(key, None)
+        requests = self._pending.pop(key, None)
+        if requests:
+            await self._execute(key[0], key[1], requests)
+
+    async def _execute(self, channel_id: str, sessions: ChannelSessions, requests: list):
+        # 같은 유저가 한 배치에 여러 번 들어오면 첫 요청만 DB에 반영 (ON CONFLICT는 한 행을 두 번 갱신할 수 없음)
+        users: dict[str, str] = {}
+        for user_id, user_name, _ in requests:
+            users.setdefault(user_id, user_name)
+
+        try:
+            factory = get_session_factory()
+            if not factory:
+                raise RuntimeError("DB 세션 팩토리가 초기화되지 않았습니다.")
+            async with factory() as db:
+                results = await upsert_attendance(db, channel_id, sessions, users)
+        except Exception as e:
+            for _, _, future in requests:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        answered = set()
+        for user_id, _, future in requests:
+            if future.done():
+                continue
+            result = results.get(user_id)
+            if result is None:
+                future.set_exception(RuntimeError(f"출석 결과 누락: {user_id}"))
+                continue
+            if user_id in answered:
+                # 같은 배치의 중복 요청은 이미 출석한 것으로 응답
+                result = {**result, "status": "already_checked", "is_new": False}
+            answered.add(user_id)
+            future.set_result(result)
+
+
+# 모듈 레벨 싱글톤 — 요청마다 생성되는 ChatService 인스턴스들이 같은 배처를 공유
+attendance_batcher = AttendanceBatcher()
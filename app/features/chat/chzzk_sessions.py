@@ -3,7 +3,7 @@ import asyncio
 import random
 
 import app.core.config as config
-import app.features.chat.clients.chat_client as chat_client
+from app.features.chat.clients.socket_pool import socket_pool
 from app.features.auth.service import AuthService
 from app.core.database import get_session_factory
 from app.core.logger import get_logger
@@ -14,6 +14,13 @@ logger = get_logger("ChzzkSessions")
 # base_url은 모든 인스턴스가 동일한 config.OPENAPI_BASE를 사용하므로 공유 가능
 _client = httpx.AsyncClient(base_url=config.OPENAPI_BASE, timeout=10.0)
 
+# 채팅 한 번에 보낼 수 있는 최대 글자 수 (치지직 API 제한)
+_CHAT_CHUNK_SIZE = 100
+# 채널별 전송 대기열 최대 길이 — 넘치면 새 메시지를 버린다 (핸들러가 전송 때문에 멈추지 않도록)
+_SEND_QUEUE_SIZE = 100
+# 429/5xx/네트워크 오류 시 재시도 횟수 (지수 백오프)
+_SEND_MAX_RETRIES = 3
+
 class ChzzkSessions:
     def __init__(self, channel_id: str):
         self.client_id = config.CLIENT_ID
@@ -22,9 +29,12 @@ class ChzzkSessions:
         self.channel_id = channel_id
         self.channel_name = None
         self.access_token = None
-        self.socket_url = None
+        # 채팅 구독에 사용 중인 공유 소켓 연결의 세션 키 (연결은 socket_pool이 관리)
         self.session_key = None
-        self.socket_client = None
+
+        # 전송 대기열과 전용 전송 태스크 — 순서 보장, 전송 딜레이, 재시도를 핸들러와 분리
+        self._send_queue: asyncio.Queue = asyncio.Queue(maxsize=_SEND_QUEUE_SIZE)
+        self._sender_task: asyncio.Task | None = None
 
     async def _ensure_auth(self, force_refresh=False):
 
@@ -84,62 +94,16 @@ class ChzzkSessions:
 
         return False
 
-    async def create_socket_url(self):
-        # 세션 발급을 위한 치지직 API 주소
-        url = '/open/v1/sessions/auth/client'
-
-        # 내 앱의 ID랑 비밀키로 인증 헤더 구성
-        headers = {
-            'Client-Id': f'{self.client_id}',
-            'Client-Secret': f'{self.client_secret}',
-            'Content-Type': 'application/json'
-        }
-        
-        # 서버에 세션 생성 url 요청
-        response = await _client.get(url, headers=headers)
-        
-        if response.status_code == 200:
-            logger.debug(f"url 정상: {response.json()}")
-            data = response.json()
-            
-            # 응답 데이터에서 실제 소켓 서버 주소만 추출
-            socket_url = data.get('content', {}).get('url')
-            self.socket_url = socket_url
-        else:
-            # 실패하면 에러 코드 찍고 끝냄
-            logger.error(f"Error: {response.status_code} - {response.text}")
-            self.socket_url = None
-        
     async def create_session(self):
+        """공유 소켓 연결 풀에서 이 채널이 사용할 연결을 배정받고 세션 키를 반환합니다."""
 
-        # 채널 이름 등 정보를 얻기 위해 인증 정보 확인 (소켓 연결 전 필수)
+        # 채널 이름 등 정보를 얻기 위해 인증 정보 확인 (연결 배정 전 필수)
         await self._ensure_auth()
 
-        # 소켓 URL이 없으면 새로 생성
-        if not self.socket_url:
-            await self.create_socket_url()
-
-        if not self.socket_url: return
-
-        # 세션 키 수신을 대기할 Future 객체 생성
-        session_key_future = asyncio.Future()
-        
-        # 클라이언트에 Future 전달
-        self.socket_client = chat_client.ChzzkChatClient(self.channel_name, session_key_future)
-
-        # 소켓 연결
-        await self.socket_client.connect(self.socket_url)
-        
-        try:
-            # Future가 완료될 때까지 최대 5초 대기 (Polling 제거)
-            self.session_key = await asyncio.wait_for(session_key_future, timeout=5.0)
-            logger.info(f"✨ 세션 키 확인 완료: {self.session_key}")
-            return self.session_key
-        except asyncio.TimeoutError:
-            logger.warning("⚠️ 세션 키 확인 실패: 타임아웃")
-            await self.socket_client.disconnect()
-            self.socket_client = None
-            return None
+        self.session_key = await socket_pool.attach(self)
+        if not self.session_key:
+            logger.warning(f"⚠️ [{self.channel_id}] 소켓 연결 배정 실패")
+        return self.session_key
     
     async def subscribe_chat(self):
 
@@ -173,22 +137,44 @@ class ChzzkSessions:
         # 요청 성공(200 OK)이면 결과값을 JSON으로 돌려줌
         if response.status_code == 200:
             logger.info(f"✅ [{self.channel_id}] 채팅 구독 성공")
+            socket_pool.mark_subscribed(self.channel_id, self.session_key)
             return response.json()
         else:
             logger.error(f"❌ [{self.channel_id}] 채팅 구독 실패: {response.status_code} - {response.text}")
             return False
     
-    async def send_chat(self, message: str):
+    async def ensure_subscribed(self):
+        """현재 세션 키로 이미 구독돼 있으면 그대로 두고, 세션 키가 바뀐 경우에만 구독 API를 호출합니다."""
+        if socket_pool.is_subscribed(self.channel_id, self.session_key):
+            return True
+        return await self.subscribe_chat()
+
+    async def unsubscribe_chat(self):
+        """공유 연결에서 이 채널의 채팅 구독을 해제합니다 (연결 자체는 다른 채널이 계속 사용)."""
+        if not self.session_key:
+            return False
 
-        # 토큰 확인
         await self._ensure_auth()
-        
-        # 인증 토큰이랑 데이터 형식을 헤더에 담기
         headers = {
             'Authorization': f'Bearer {self.access_token}',
-            'Content-Type': 'application/json', 
+            'Content-Type': 'application/json'
         }
+        params = {"sessionKey": self.session_key}
+        uri = "/open/v1/sessions/events/unsubscribe/chat"
+
+        response = await _client.post(uri, headers=headers, params=params)
+        if response.status_code == 200:
+            logger.info(f"✅ [{self.channel_id}] 채팅 구독 해제")
+            return True
+
+        logger.warning(f"⚠️ [{self.channel_id}] 채팅 구독 해제 실패: {response.status_code} - {response.text}")
+        return False
 
+    async def send_chat(self, message: str, wait: bool = False):
+        """
+        채팅을 채널 전송 대기열에 넣습니다.
+        기본적으로 즉시 반환하며(대기열 적재 여부), wait=True면 실제 전송 결과를 기다려 반환합니다.
+        """
         # 파이프(|)로 구분된 메시지 처리 (랜덤 발송)
         if '|' in message:
             options = [m.strip() for m in message.split('|') if m.strip()]
@@ -198,33 +184,143 @@ class ChzzkSessions:
         # 300자 초과 시 자르고 ... 붙이기
         if len(message) > 300:
             message = message[:297] + "..."
-            
-        # 100자 단위로 분할 (최대 3개)
-        chunks = [message[i:i+100] for i in range(0, len(message), 100)]
+
+        if not message:
+            return False
+
+        if self._sender_task is None or self._sender_task.done():
+            self._sender_task = asyncio.create_task(self._sender_loop())
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._send_queue.put_nowait((message, future))
+        except asyncio.QueueFull:
+            logger.warning(f"⚠️ [{self.channel_id}] 채팅 전송 대기열이 가득 차 메시지를 버립니다: {message}")
+            return False
+
+        if wait:
+            return await future
+        return True
+
+    async def _sender_loop(self):
+        """대기열의 메시지를 순서대로 전송합니다. 딜레이 동안 쌓인 짧은 메시지들은 한 번의 전송으로 묶습니다."""
+        pending = None  # 직전 묶음에 들어가지 못하고 남은 항목
+        try:
+            while True:
+                if pending is None:
+                    pending = await self._send_queue.get()
+
+                # 채팅창 순서 꼬임 방지를 위한 전송 딜레이
+                if config.CHAT_DELAY > 0:
+                    await asyncio.sleep(config.CHAT_DELAY)
+
+                batch = [pending]
+                pending = None
+                text = batch[0][0]
+
+                # 100자 이내라면 그 사이 쌓인 메시지를 이어 붙여 API 호출 횟수를 줄인다 (예: 연속 출석 체크 응답)
+                if len(text) <= _CHAT_CHUNK_SIZE:
+                    while not self._send_queue.empty():
+                        item = self._send_queue.get_nowait()
+                        candidate = f"{text} {item[0]}"
+                        if len(candidate) > _CHAT_CHUNK_SIZE:
+                            pending = item
+                            break
+                        text = candidate
+                        batch.append(item)
+
+                success = False
+                try:
+                    # 100자 단위로 분할 (최대 3개)
+                    chunks = [text[i:i + _CHAT_CHUNK_SIZE] for i in range(0, len(text), _CHAT_CHUNK_SIZE)]
+                    all_sent = True
+                    for idx, chunk in enumerate(chunks):
+                        if idx > 0 and config.CHAT_DELAY > 0:
+                            await asyncio.sleep(config.CHAT_DELAY)
+                        if not await self._post_chat(chunk):
+                            all_sent = False
+                    success = all_sent
+                except Exception as e:
+                    logger.error(f"❌ [{self.channel_id}] 채팅 전송 중 오류: {e}")
+                    success = False
+                finally:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_result(success)
+        finally:
+            # 종료(취소) 시 아직 보내지 못한 항목도 실패로 처리해 wait=True 호출자가 멈추지 않도록
+            if pending is not None and not pending[1].done():
+                pending[1].set_result(False)
+
+    async def _post_chat(self, chunk: str) -> bool:
+        """채팅 한 조각을 전송합니다. 401은 토큰 갱신 후, 429/5xx/네트워크 오류는 백오프 후 재시도합니다."""
+        # 토큰 확인
+        await self._ensure_auth()
 
         uri = "/open/v1/chats/send"
+        data = {"message": chunk}
+        token_refreshed = False
+
+        for attempt in range(_SEND_MAX_RETRIES + 1):
+            # 인증 토큰이랑 데이터 형식을 헤더에 담기
+            headers = {
+                'Authorization': f'Bearer {self.access_token}',
+                'Content-Type': 'application/json',
+            }
+            try:
+                response = await _client.post(uri, headers=headers, json=data)
+            except httpx.HTTPError as e:
+                logger.warning(f"⚠️ [{self.channel_id}] 채팅 전송 네트워크 오류 (시도 {attempt + 1}): {e}")
+                response = None
+
+            if response is not None:
+                if response.status_code == 200:
+                    logger.info(f"✅ 채팅 전송 성공: {chunk}")
+                    return True
+
+                # 401 Unauthorized 발생 시 토큰 갱신 후 재시도 (1회)
+                if response.status_code == 401 and not token_refreshed:
+                    token_refreshed = True
+                    if await self._refresh_token():
+                        continue
+                    break
+
+                if response.status_code != 429 and response.status_code < 500:
+                    break
+
+                logger.warning(f"⚠️ [{self.channel_id}] 채팅 전송 재시도 대상 응답: {response.status_code}")
+
+            if attempt < _SEND_MAX_RETRIES:
+                await asyncio.sleep(0.5 * (2 ** attempt))
+
+        if response is not None:
+            logger.error(f"❌ 채팅 전송 실패: {response.status_code} - {response.text}")
+        else:
+            logger.error("❌ 채팅 전송 실패: 네트워크 오류")
+        return False
 
-        success_all = True
-        for chunk in chunks:
-            data = {"message": chunk}
-
-            # 채팅창 순서 꼬임 방지를 위한 전송 딜레이
-            if config.CHAT_DELAY > 0:
-                await asyncio.sleep(config.CHAT_DELAY)
-
-            response = await _client.post(uri, headers=headers, json=data)
-
-            # 401 Unauthorized 발생 시 토큰 갱신 후 재시도
-            if response.status_code == 401:
-                if await self._refresh_token():
-                    headers['Authorization'] = f'Bearer {self.access_token}'
-                    response = await _client.post(uri, headers=headers, json=data)
-            
-            if response.status_code == 200:
-                logger.info(f"✅ 채팅 전송 성공: {chunk}")
-            else:
-                logger.error(f"❌ 채팅 전송 실패: {response.status_code} - {response.text}")
-                success_all = False
-                
-        return success_all
-        
+    async def close(self, release_socket: bool = True):
+        """
+        전송 태스크를 종료하고 대기 중인 메시지는 실패 처리한 뒤, 소켓 연결 풀에서 빠집니다.
+        release_socket=False면 연결 배정과 구독을 유지합니다 (같은 채널의 새 세션이 이어받는 경우).
+        """
+        if self._sender_task is not None:
+            self._sender_task.cancel()
+            try:
+                await self._sender_task
+            except asyncio.CancelledError:
+                pass
+            self._sender_task = None
+
+        while not self._send_queue.empty():
+            _, future = self._send_queue.get_nowait()
+            if not future.done():
+                future.set_result(False)
+
+        # 공유 연결이므로 소켓을 끊지 않고 이 채널의 구독만 해제 (풀이 이미 정리한 경우는 생략)
+        if release_socket and socket_pool.owns(self.channel_id):
+            try:
+                await self.unsubscribe_chat()
+            except Exception as e:
+                logger.warning(f"⚠️ [{self.channel_id}] 구독 해제 중 오류: {e}")
+            await socket_pool.detach(self.channel_id)
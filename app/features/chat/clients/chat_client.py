@@ -1,27 +1,31 @@
 import socketio
-import json
-import asyncio
 
 import app.core.config as config
 from .base import BaseChatClient
-from app.features.chat.handling import handler
+from app.features.chat.handling.dispatcher import dispatcher
+from app.redis.redis_service import peek_message_relevance
+from .decoder import decode_chat, decode_system
 from app.core.logger import get_channel_logger
 
 class ChzzkChatClient(BaseChatClient):
+    """
+    치지직 소켓 연결 하나를 감싸는 클라이언트.
+    여러 채널의 채팅 구독이 한 연결을 공유하므로, 이벤트는 listener(PooledConnection)를 통해
+    채널별로 라우팅하고 세션 키 변경/연결 끊김을 알린다.
+    """
 
-    def __init__(self, channel_name, session_key_future: asyncio.Future = None):
-        # 각 인스턴스마다 고유한 식별자와 소켓 클라이언트를 가짐
-        self.channel_name = channel_name  
+    def __init__(self, name, listener):
+        self.name = name
+        self.listener = listener
         self.socketio = socketio.AsyncClient(
             request_timeout=10,
             reconnection=True,      # 자동 재연결 활성화
             reconnection_attempts=5 # 재연결 시도 횟수
             )
         self.session_key = None
-        self.session_key_future = session_key_future
 
-        # 중앙화된 로거 사용
-        self.logger = get_channel_logger(self.channel_name)
+        # 연결 단위 로거 (채팅 로그는 채널별 로거에 기록)
+        self.logger = get_channel_logger(self.name)
 
         # 이벤트 핸들러 등록
         self._setup_handlers()
@@ -31,50 +35,65 @@ class ChzzkChatClient(BaseChatClient):
         async def connect():
             self.logger.info("서버에 연결되었습니다.")
 
+        @self.socketio.event
+        async def disconnect(*args):
+            self.logger.warning("서버와의 연결이 끊어졌습니다.")
+            self.listener.on_disconnect()
+
         @self.socketio.on('SYSTEM')
         async def on_system(data):
-            # 로그 출력 시 식별자를 포함하여 구분
             self.logger.info(f"📡 SYSTEM 이벤트 수신")
-            self.logger.debug(f"SYSTEM 이벤트 원본 수신: {data}")
-            raw_data = json.loads(data)
-            
-            event_type = raw_data.get("type")
-            event_data = raw_data.get("data", {})
-            
+            # 원본 페이로드는 DEBUG 레벨일 때만 문자열로 만든다 (지연 포매팅)
+            self.logger.debug("SYSTEM 이벤트 원본 수신: %s", data)
+            event_type, event_data = decode_system(data)
+
             if event_type == "connected":
+                # 최초 연결뿐 아니라 자동 재연결 시에도 새 세션 키가 발급된다
                 self.session_key = event_data.get("sessionKey")
                 self.logger.info(f"🔑 세션 키 저장: {self.session_key}")
-                
-                # 세션 키를 기다리는 Future가 있다면 결과 설정 (Polling 제거)
-                if self.session_key_future and not self.session_key_future.done():
-                    self.session_key_future.set_result(self.session_key)
+                self.listener.on_session_key(self.session_key)
+            elif event_type == "revoked":
+                # 채널 측에서 권한을 회수한 경우 해당 구독은 더 이상 유효하지 않음
+                self.listener.on_revoked(event_data.get("channelId"))
 
         @self.socketio.on('CHAT')
         async def on_chat(data):
-            raw_data = json.loads(data)
-            channel_id = raw_data.get('channelId')
-            nickname = raw_data.get('profile', {}).get('nickname')
-            user_id = raw_data.get('senderChannelId')
-            
+            event = decode_chat(data)
+
+            # 이 연결에 구독되지 않은 채널(구독 해제 직후 등)의 채팅은 무시
+            # 구독된 채널이면 봇 메시지라도 수신 시각을 기록 — 구독이 살아 있다는 신호 (supervisor가 사용)
+            if not self.listener.record_event(event.channel_id):
+                return
+
             # 봇 자신 및 설정된 다른 봇들의 메시지는 무시
-            if nickname in config.BOT_NICKNAMES:
+            if event.nickname in config.BOT_NICKNAMES:
                 return
 
-            message = raw_data.get('content')
-            role = raw_data.get('profile', {}).get('userRoleCode')
-            # 어느 세션에서 발생한 채팅인지 식별자와 함께 출력
-            self.logger.info(f"💬{role} : [{nickname}] {message}")
+            channel_logger = self.listener.channel_logger(event.channel_id)
+            if channel_logger is None:
+                return
+
+            # 채널별 로그 파일에 기록 (표본에서 빠진 줄은 문자열을 만들지 않도록 지연 포매팅)
+            channel_logger.info("💬%s : [%s] %s", event.role, event.nickname, event.content)
 
-            # 핸들러로 메시지 전달
-            await handler.on_message(channel_id, message, role, user_id=user_id, user_name=nickname)
+            # 접두사도 인사말도 아닌 것이 확실한 메시지는 대기열에 넣지 않음 (로컬 캐시로만 판단)
+            if not event.content or not peek_message_relevance(event.channel_id, event.content):
+                return
+
+            # 채널 대기열에 넣고 바로 반환 — 처리는 디스패처 워커가 담당 (소켓 수신이 처리 지연에 막히지 않도록)
+            await dispatcher.submit(event.channel_id, event.content, event.role, event.sender_id, event.nickname)
 
     def get_session_key(self):
         return self.session_key
 
+    @property
+    def connected(self) -> bool:
+        return self.socketio.connected
+
     async def connect(self, url):
         await self.socketio.connect(url, transports=['websocket'])
         self.logger.info(f"연결 성공: {url}")
 
     async def disconnect(self):
         await self.socketio.disconnect()
-        self.logger.info("연결이 종료되었습니다.")
\ No newline at end of file
+        self.logger.info("연결이 종료되었습니다.")
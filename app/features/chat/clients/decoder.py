@@ -0,0 +1,81 @@
+import json
+from typing import Optional
+
+# 설치된 라이브러리 중 가장 빠른 JSON 디코더를 사용 (msgspec > orjson > json)
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - 선택 의존성
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 선택 의존성
+    orjson = None
+
+
+class ChatEvent:
+    """CHAT 이벤트에서 핸들러가 사용하는 필드만 담은 경량 객체."""
+
+    __slots__ = ("channel_id", "sender_id", "nickname", "role", "content")
+
+    def __init__(self, channel_id: Optional[str], sender_id: Optional[str], nickname: Optional[str], role: Optional[str], content: Optional[str]):
+        self.channel_id = channel_id
+        self.sender_id = sender_id
+        self.nickname = nickname
+        self.role = role
+        self.content = content
+
+
+def _decode_chat_untyped(raw_data: dict) -> ChatEvent:
+    profile = raw_data.get("profile") or {}
+    return ChatEvent(
+        raw_data.get("channelId"),
+        raw_data.get("senderChannelId"),
+        profile.get("nickname"),
+        profile.get("userRoleCode"),
+        raw_data.get("content"),
+    )
+
+
+if msgspec is not None:
+    class _Profile(msgspec.Struct):
+        nickname: Optional[str] = None
+        userRoleCode: Optional[str] = None
+
+    class _ChatPayload(msgspec.Struct):
+        channelId: Optional[str] = None
+        senderChannelId: Optional[str] = None
+        content: Optional[str] = None
+        profile: Optional[_Profile] = None
+
+    # 필요한 필드만 타입 지정 디코딩 — 나머지 필드는 파싱 단계에서 건너뜀
+    _chat_decoder = msgspec.json.Decoder(_ChatPayload)
+    _loads = msgspec.json.decode
+    BACKEND = "msgspec"
+
+    def decode_chat(data) -> ChatEvent:
+        try:
+            payload = _chat_decoder.decode(data)
+        except msgspec.ValidationError:
+            # 예상과 타입이 다른 필드가 있으면 타입 없이 다시 읽는다 (orjson/json 경로와 같은 입력을 허용)
+            return _decode_chat_untyped(_loads(data))
+        profile = payload.profile
+        return ChatEvent(
+            payload.channelId,
+            payload.senderChannelId,
+            profile.nickname if profile else None,
+            profile.userRoleCode if profile else None,
+            payload.content,
+        )
+else:
+    _loads = orjson.loads if orjson is not None else json.loads
+    BACKEND = "orjson" if orjson is not None else "json"
+
+    def decode_chat(data) -> ChatEvent:
+        return _decode_chat_untyped(_loads(data))
+
+
+def decode_system(data) -> tuple[Optional[str], dict]:
+    """SYSTEM 이벤트를 (type, data)로 디코딩합니다."""
+    raw_data = _loads(data)
+    return raw_data.get("type"), raw_data.get("data") or {}
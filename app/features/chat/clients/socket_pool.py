@@ -0,0 +1,331 @@
+import asyncio
+import time
+from typing import Optional
+
+import httpx
+
+import app.core.config as config
+from app.core.logger import get_logger, get_channel_logger
+from .chat_client import ChzzkChatClient
+
+logger = get_logger("SocketPool")
+
+# 연결이 끊긴 뒤 socketio 자동 재연결을 기다리는 시간 — 이후에도 끊겨 있으면 구독을 다른 연결로 옮긴다
+_RECONNECT_GRACE = 15.0
+# 세션 키 수신 대기 시간
+_SESSION_KEY_TIMEOUT = 5.0
+
+# 모듈 레벨 싱글톤 — 소켓 URL 발급은 채널과 무관한 클라이언트 인증 API
+_client = httpx.AsyncClient(base_url=config.OPENAPI_BASE, timeout=10.0)
+
+
+class PooledConnection:
+    """소켓 연결 하나와 그 연결에 구독된 채널 목록."""
+
+    def __init__(self, pool: "ChzzkSocketPool", name: str):
+        self.pool = pool
+        self.name = name
+        self.client = ChzzkChatClient(name, self)
+        self.session_key: Optional[str] = None
+        self.channels: set[str] = set()
+        self.closed = False
+        self._key_future: Optional[asyncio.Future] = None
+        self._grace_task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return not self.closed and self.client.connected and self.session_key is not None
+
+    async def open(self, url: str) -> bool:
+        """소켓에 연결하고 세션 키를 받을 때까지 기다립니다."""
+        self._key_future = asyncio.get_running_loop().create_future()
+        try:
+            await self.client.connect(url)
+            self.session_key = await asyncio.wait_for(self._key_future, timeout=_SESSION_KEY_TIMEOUT)
+            logger.info(f"✨ [{self.name}] 세션 키 확인 완료: {self.session_key}")
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ [{self.name}] 소켓 연결/세션 키 확인 실패: {e}")
+            await self.close()
+            return False
+
+    async def close(self):
+        self.closed = True
+        if self._grace_task is not None:
+            self._grace_task.cancel()
+            self._grace_task = None
+        try:
+            await self.client.disconnect()
+        except Exception as e:
+            logger.debug(f"[{self.name}] 연결 종료 중 오류 무시: {e}")
+
+    # --- ChzzkChatClient 콜백 ---
+
+    def on_session_key(self, session_key: str):
+        if self._key_future is not None and not self._key_future.done():
+            self._key_future.set_result(session_key)
+            return
+        if self.closed or session_key == self.session_key:
+            return
+        # 자동 재연결로 새 세션 키가 발급됨 — 기존 구독은 사라졌으므로 다시 구독
+        self.session_key = session_key
+        self.pool._spawn(self.pool._resubscribe_connection(self))
+
+    def on_disconnect(self):
+        if self.closed:
+            return
+        if self._grace_task is None or self._grace_task.done():
+            self._grace_task = self.pool._spawn(self.pool._check_after_disconnect(self))
+
+    def on_revoked(self, channel_id: Optional[str]):
+        if channel_id in self.channels:
+            logger.warning(f"🚫 [{self.name}] 채널 {channel_id}의 채팅 구독 권한이 회수되었습니다.")
+            self.pool._spawn(self.pool.detach(channel_id))
+
+    def record_event(self, channel_id: str) -> bool:
+        """이 연결에 구독된 채널이면 이벤트 수신 시각을 기록하고 True를 반환합니다."""
+        if channel_id not in self.channels:
+            return False
+        self.pool._last_events[channel_id] = time.monotonic()
+        return True
+
+    def channel_logger(self, channel_id: str):
+        if channel_id not in self.channels:
+            return None
+        return self.pool._loggers.get(channel_id)
+
+
+class ChzzkSocketPool:
+    """
+    치지직 채팅 소켓 연결 풀.
+    - 채널마다 socketio 클라이언트를 만들지 않고, 연결 하나에 최대 per_socket개 채널의 채팅을 구독한다.
+    - 연결이 끊긴 뒤 유예 시간 안에 재연결되지 않으면 그 연결의 채널들을 다른 연결로 다시 구독한다.
+    구독 API 호출(채널 토큰 필요)은 ChzzkSessions.subscribe_chat이 담당하고, 풀은 연결 배정만 관리한다.
+    """
+
+    def __init__(self, per_socket: int = config.CHAT_SUBSCRIPTIONS_PER_SOCKET):
+        self._per_socket = max(1, per_socket)
+        self._connections: list[PooledConnection] = []
+        self._owners: dict[str, PooledConnection] = {}   # {channel_id: 연결}
+        self._sessions: dict = {}                         # {channel_id: ChzzkSessions}
+        self._loggers: dict = {}                          # {channel_id: 채널 로거}
+        self._subscribed: dict[str, str] = {}             # {channel_id: 구독에 성공한 세션 키}
+        self._socket_url: Optional[tuple[str, float]] = None  # (URL, 만료 시각)
+        self._last_events: dict[str, float] = {}          # {channel_id: 마지막 채팅 수신 시각}
+        self._lock = asyncio.Lock()
+        self._seq = 0
+        self._tasks: set[asyncio.Task] = set()
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def create_socket_url(self) -> Optional[str]:
+        # 세션 발급을 위한 치지직 API 주소
+        url = '/open/v1/sessions/auth/client'
+
+        # 내 앱의 ID랑 비밀키로 인증 헤더 구성
+        headers = {
+            'Client-Id': f'{config.CLIENT_ID}',
+            'Client-Secret': f'{config.CLIENT_SECRET}',
+            'Content-Type': 'application/json'
+        }
+
+        response = await _client.get(url, headers=headers)
+
+        if response.status_code == 200:
+            logger.debug(f"url 정상: {response.json()}")
+            return response.json().get('content', {}).get('url')
+
+        logger.error(f"Error: {response.status_code} - {response.text}")
+        return None
+
+    async def get_socket_url(self, fresh: bool = False) -> Optional[str]:
+        """유효 시간 내의 소켓 URL은 재사용하고, 만료됐거나 fresh=True면 새로 발급받습니다."""
+        if not fresh and self._socket_url is not None:
+            socket_url, expires_at = self._socket_url
+            if time.monotonic() < expires_at:
+                return socket_url
+
+        socket_url = await self.create_socket_url()
+        self._socket_url = (socket_url, time.monotonic() + config.SOCKET_URL_TTL) if socket_url else None
+        return socket_url
+
+    async def _open_connection(self) -> Optional[PooledConnection]:
+        """새 소켓 연결을 열어 풀에 추가합니다. (self._lock 안에서 호출)"""
+        conn = None
+        # 캐시된 URL이 있으면 먼저 시도하고, 실패하면 새 URL로 한 번 더 시도
+        has_cached = self._socket_url is not None and time.monotonic() < self._socket_url[1]
+        for fresh in ((False, True) if has_cached else (True,)):
+            socket_url = await self.get_socket_url(fresh=fresh)
+            if not socket_url:
+                return None
+
+            self._seq += 1
+            conn = PooledConnection(self, f"socket-{self._seq}")
+            if await conn.open(socket_url):
+                break
+            self._socket_url = None
+            conn = None
+
+        if conn is None:
+            return None
+
+        self._connections.append(conn)
+        logger.info(f"🔌 [{conn.name}] 새 소켓 연결 추가 (총 {len(self._connections)}개)")
+        return conn
+
+    def owns(self, channel_id: str) -> bool:
+        return channel_id in self._owners
+
+    def channel_state(self, channel_id: str) -> str:
+        """
+        채널의 연결 상태.
+        ok: 살아 있는 연결에 현재 세션 키로 구독됨 / unsubscribed: 연결은 살아 있지만 현재 키로 구독되지 않음
+        dead: 배정된 연결이 끊김 / detached: 배정된 연결이 없음
+        """
+        conn = self._owners.get(channel_id)
+        if conn is None:
+            return "detached"
+        if not conn.alive:
+            return "dead"
+        if self._subscribed.get(channel_id) != conn.session_key:
+            return "unsubscribed"
+        return "ok"
+
+    def last_event_at(self, channel_id: str) -> Optional[float]:
+        """채널에서 마지막으로 채팅 이벤트를 받은 시각 (time.monotonic 기준)."""
+        return self._last_events.get(channel_id)
+
+    def is_subscribed(self, channel_id: str, session_key: Optional[str]) -> bool:
+        """해당 세션 키로 이미 구독에 성공했는지 (세션 키가 바뀌지 않았다면 재구독 불필요)."""
+        return session_key is not None and self._subscribed.get(channel_id) == session_key
+
+    def mark_subscribed(self, channel_id: str, session_key: str):
+        if channel_id in self._owners:
+            self._subscribed[channel_id] = session_key
+
+    async def attach(self, session) -> Optional[str]:
+        """
+        채널을 여유 있는 연결에 배정하고 그 연결의 세션 키를 반환합니다.
+        여유 있는 연결이 없으면 새로 엽니다. 실패 시 None.
+        """
+        channel_id = session.channel_id
+        async with self._lock:
+            conn = self._owners.get(channel_id)
+            if conn is None or not conn.alive:
+                if conn is not None:
+                    conn.channels.discard(channel_id)
+                conn = next(
+                    (c for c in self._connections if c.alive and len(c.channels) < self._per_socket),
+                    None,
+                )
+                if conn is None:
+                    conn = await self._open_connection()
+                    if conn is None:
+                        return None
+                conn.channels.add(channel_id)
+                self._owners[channel_id] = conn
+
+            self._sessions[channel_id] = session
+            if channel_id not in self._loggers:
+                self._loggers[channel_id] = get_channel_logger(session.channel_name or channel_id, sampled=True)
+            return conn.session_key
+
+    async def detach(self, channel_id: str):
+        """채널을 풀에서 제거합니다. 구독 채널이 없어진 연결은 닫습니다."""
+        async with self._lock:
+            conn = self._owners.pop(channel_id, None)
+            self._sessions.pop(channel_id, None)
+            self._loggers.pop(channel_id, None)
+            self._subscribed.pop(channel_id, None)
+            self._last_events.pop(channel_id, None)
+            if conn is None:
+                return
+            conn.channels.discard(channel_id)
+            if conn.channels:
+                return
+            if conn in self._connections:
+                self._connections.remove(conn)
+
+        logger.info(f"🔌 [{conn.name}] 구독 채널이 없어 연결을 닫습니다. (남은 연결 {len(self._connections)}개)")
+        await conn.close()
+
+    async def _resubscribe(self, channel_id: str):
+        """채널을 (필요하면 다른 연결로) 다시 배정하고 구독합니다."""
+        session = self._sessions.get(channel_id)
+        if session is None:
+            return
+        session_key = await self.attach(session)
+        if not session_key:
+            logger.error(f"❌ [{channel_id}] 재배정할 소켓 연결을 만들지 못했습니다.")
+            return
+        session.session_key = session_key
+        # 같은 세션 키로 이미 구독돼 있으면 구독 API를 호출하지 않음
+        if not await session.ensure_subscribed():
+            logger.error(f"❌ [{channel_id}] 재구독 실패")
+
+    async def _resubscribe_connection(self, conn: PooledConnection):
+        """재연결로 세션 키가 바뀐 연결의 채널들을 새 키로 다시 구독합니다."""
+        logger.info(f"♻️ [{conn.name}] 재연결 감지 — 채널 {len(conn.channels)}개 재구독")
+        for channel_id in list(conn.channels):
+            try:
+                await self._resubscribe(channel_id)
+            except Exception as e:
+                logger.error(f"❌ [{channel_id}] 재구독 중 오류: {e}")
+
+    async def _check_after_disconnect(self, conn: PooledConnection):
+        """유예 시간 뒤에도 연결이 살아나지 않으면 연결을 버리고 채널들을 재배정합니다."""
+        await asyncio.sleep(_RECONNECT_GRACE)
+        if conn.closed or conn.client.connected:
+            return
+
+        async with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+            orphans = list(conn.channels)
+            for channel_id in orphans:
+                if self._owners.get(channel_id) is conn:
+                    del self._owners[channel_id]
+            conn.channels.clear()
+
+        logger.warning(f"💀 [{conn.name}] 재연결 실패 — 채널 {len(orphans)}개를 다른 연결로 재배정합니다.")
+        conn._grace_task = None  # close()가 실행 중인 자기 자신을 취소하지 않도록
+        await conn.close()
+        for channel_id in orphans:
+            try:
+                await self._resubscribe(channel_id)
+            except Exception as e:
+                logger.error(f"❌ [{channel_id}] 재배정 중 오류: {e}")
+
+    async def close_all(self):
+        """서버 종료 시 모든 연결을 닫습니다."""
+        async with self._lock:
+            connections = list(self._connections)
+            self._connections.clear()
+            self._owners.clear()
+            self._sessions.clear()
+            self._loggers.clear()
+            self._subscribed.clear()
+            self._last_events.clear()
+        for conn in connections:
+            await conn.close()
+        for task in list(self._tasks):
+            task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "connections": len(self._connections),
+            "subscriptions": len(self._owners),
+            "per_socket": self._per_socket,
+            "detail": [
+                {"name": c.name, "channels": len(c.channels), "connected": c.client.connected}
+                for c in self._connections
+            ],
+        }
+
+
+# 모듈 레벨 싱글톤 — 모든 채널 세션이 같은 연결 풀을 공유
+socket_pool = ChzzkSocketPool()
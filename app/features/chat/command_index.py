@@ -0,0 +1,98 @@
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+# 채널 인덱스 유효 시간 — DB를 직접 수정한 경우에도 일정 시간 후 반영되도록 하는 안전장치
+_INDEX_TTL = 600.0
+# 글로벌 명령어 인덱스 키 (글로벌 명령어는 관리자가 DB에서 직접 수정하므로 TTL로만 갱신)
+GLOBAL_INDEX_KEY = "__global__"
+
+
+@dataclass(frozen=True)
+class CommandEntry:
+    """ChatCommand / GlobalCommand 행의 스냅샷. DB 세션과 분리되어 있어 세션이 닫혀도 안전하게 사용 가능."""
+    id: int
+    command: str
+    response: Optional[str]
+    type: str
+    is_active: bool
+    cooldown_seconds: int
+
+    @classmethod
+    def from_row(cls, row) -> "CommandEntry":
+        return cls(
+            id=row.id,
+            command=row.command,
+            response=row.response,
+            type=row.type,
+            is_active=row.is_active,
+            cooldown_seconds=row.cooldown_seconds,
+        )
+
+
+def split_aliases(command: str) -> list[str]:
+    """
+    '|'로 구분된 명령어/키워드를 조회 가능한 모든 별칭으로 펼칩니다.
+    예: '룰|규칙' -> ['룰|규칙', '룰', '규칙'] (전체 문자열 포함, 중복 제거)
+    """
+    aliases = [command] + [alias.strip() for alias in command.split('|') if alias.strip()]
+    return list(dict.fromkeys(aliases))
+
+
+def build_alias_map(rows) -> dict[str, CommandEntry]:
+    """
+    명령어 행 목록을 {별칭: CommandEntry} 딕셔너리로 변환합니다.
+    기존 조회 로직과 동일하게 전체 문자열('룰|규칙') 일치가 별칭('룰') 일치보다 우선합니다.
+    """
+    entries = [CommandEntry.from_row(row) for row in rows]
+    aliases: dict[str, CommandEntry] = {entry.command: entry for entry in entries}
+    for entry in entries:
+        for alias in split_aliases(entry.command):
+            aliases.setdefault(alias, entry)
+    return aliases
+
+
+class CommandIndex:
+    """
+    키(채널 ID)별 명령어 별칭 인덱스.
+    - 버전 번호로 무효화와 재구성 사이의 경쟁 상태를 막는다:
+      재구성 도중 무효화가 일어나면 오래된 결과는 저장되지 않는다.
+    """
+
+    def __init__(self, ttl: float = _INDEX_TTL):
+        self._ttl = ttl
+        self._entries: dict[str, tuple[float, dict[str, CommandEntry]]] = {}
+        self._versions: dict[str, int] = {}
+
+    def get(self, key: str) -> Optional[dict[str, CommandEntry]]:
+        cached = self._entries.get(key)
+        if cached is None:
+            return None
+        loaded_at, aliases = cached
+        if time.monotonic() - loaded_at > self._ttl:
+            self._entries.pop(key, None)
+            return None
+        return aliases
+
+    def version(self, key: str) -> int:
+        return self._versions.get(key, 0)
+
+    def put(self, key: str, version: int, aliases: dict[str, CommandEntry]) -> bool:
+        """재구성을 시작할 때 읽은 버전이 그대로일 때만 저장합니다."""
+        if self._versions.get(key, 0) != version:
+            return False
+        self._entries[key] = (time.monotonic(), aliases)
+        return True
+
+    def invalidate(self, key: str):
+        self._versions[key] = self._versions.get(key, 0) + 1
+        self._entries.pop(key, None)
+
+
+# 모듈 레벨 싱글톤 — 요청마다 생성되는 ChatService 인스턴스들이 같은 인덱스를 공유
+command_index = CommandIndex()
+
+
+def invalidate_command_index(channel_id: str):
+    """채널 명령어가 변경됐을 때 호출해 해당 채널 인덱스를 즉시 만료."""
+    command_index.invalidate(channel_id)
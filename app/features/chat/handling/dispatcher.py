@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import time
+
+import app.core.config as config
+from app.features.chat.handling import handler
+
+logger = logging.getLogger("MessageDispatcher")
+
+# 채널 워커가 이 시간 동안 메시지를 받지 못하면 종료 (조용한 채널의 태스크 정리)
+_WORKER_IDLE_TIMEOUT = 60.0
+
+# 대기열이 가득 찼을 때의 정책
+POLICY_DROP_OLDEST = "drop_oldest"  # 가장 오래된 메시지를 버리고 새 메시지를 넣는다 (기본값)
+POLICY_DROP_NEWEST = "drop_newest"  # 새 메시지를 버린다
+POLICY_BLOCK = "block"              # 자리가 날 때까지 잠시 소켓 수신을 멈추고, 그래도 가득 차 있으면 새 메시지를 버린다
+_POLICIES = (POLICY_DROP_OLDEST, POLICY_DROP_NEWEST, POLICY_BLOCK)
+# block 정책의 최대 대기 시간 (초) — 한 연결을 여러 채널이 공유하므로 한 채널이 오래 막으면 같은 연결의 모든 채널이 멈춘다
+_BLOCK_TIMEOUT = 0.5
+
+
+class ChannelStats:
+    """채널별 처리 통계."""
+
+    __slots__ = ("processed", "dropped", "failed", "last_lag_ms", "max_lag_ms", "avg_lag_ms")
+
+    def __init__(self):
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.avg_lag_ms = 0.0
+
+    def record(self, lag_ms: float):
+        self.processed += 1
+        self.last_lag_ms = lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        # 지수 이동 평균 — 최근 처리 지연 추세
+        self.avg_lag_ms = lag_ms if self.processed == 1 else self.avg_lag_ms * 0.9 + lag_ms * 0.1
+
+
+class MessageDispatcher:
+    """
+    소켓 수신과 메시지 처리를 분리하는 디스패처.
+    - 수신한 채팅은 채널별 bounded 대기열에 넣고 즉시 반환한다 (소켓 reader가 DB/Redis/전송 API를 기다리지 않음).
+    - 채널마다 워커 하나가 대기열을 순서대로 처리해 채널 내 메시지 순서를 보장한다.
+    - 전체 동시 처리 수는 DB 커넥션 풀 크기로 제한해 풀 고갈을 막는다.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = config.CHAT_QUEUE_SIZE,
+        policy: str = config.CHAT_QUEUE_POLICY,
+        concurrency: int = config.DB_POOL_SIZE,
+    ):
+        if policy not in _POLICIES:
+            logger.warning(f"⚠️ 알 수 없는 CHAT_QUEUE_POLICY '{policy}' — {POLICY_DROP_OLDEST}로 대체합니다.")
+            policy = POLICY_DROP_OLDEST
+        self._queue_size = max(1, queue_size)
+        self._policy = policy
+        self._concurrency = max(1, concurrency)
+        self._semaphore: asyncio.Semaphore | None = None
+        self._queues: dict[str, asyncio.Queue] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+        self._stats: dict[str, ChannelStats] = {}
+        self._in_flight = 0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # 이벤트 루프가 뜬 뒤 생성 (모듈 임포트 시점에는 루프가 없을 수 있음)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+        return self._semaphore
+
+    async def submit(self, channel_id: str, message: str, role: str, user_id: str, user_name: str) -> bool:
+        """채팅 이벤트를 채널 대기열에 넣습니다. 버려지면 False."""
+        queue = self._queues.get(channel_id)
+        if queue is None:
+            queue = self._queues[channel_id] = asyncio.Queue(maxsize=self._queue_size)
+        stats = self._stats.get(channel_id)
+        if stats is None:
+            stats = self._stats[channel_id] = ChannelStats()
+
+        item = (time.monotonic(), message, role, user_id, user_name)
+        accepted = True
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            dropped = True
+            if self._policy == POLICY_DROP_OLDEST:
+                queue.get_nowait()
+                queue.put_nowait(item)
+            elif self._policy == POLICY_BLOCK:
+                try:
+                    await asyncio.wait_for(queue.put(item), timeout=_BLOCK_TIMEOUT)
+                    dropped = False
+                except asyncio.TimeoutError:
+                    accepted = False
+            else:
+                accepted = False
+            if dropped:
+                stats.dropped += 1
+                if stats.dropped % 100 == 1:
+                    logger.warning(f"⚠️ [{channel_id}] 메시지 대기열이 가득 차 메시지를 버립니다. (누적 {stats.dropped}건)")
+
+        worker = self._workers.get(channel_id)
+        if worker is None or worker.done():
+            self._workers[channel_id] = asyncio.create_task(self._worker(channel_id, queue))
+        return accepted
+
+    async def _worker(self, channel_id: str, queue: asyncio.Queue):
+        stats = self._stats[channel_id]
+        semaphore = self._get_semaphore()
+        while True:
+            try:
+                received_at, message, role, user_id, user_name = await asyncio.wait_for(
+                    queue.get(), timeout=_WORKER_IDLE_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                # 대기열이 비어 있으면 워커 종료 (다음 메시지가 오면 submit이 새로 띄움)
+                if queue.empty():
+                    self._workers.pop(channel_id, None)
+                    self._queues.pop(channel_id, None)
+                    # 통계도 함께 정리 — 한 번이라도 채팅이 온 모든 채널의 기록이 계속 쌓이지 않도록
+                    self._stats.pop(channel_id, None)
+                    return
+                continue
+
+            async with semaphore:
+                self._in_flight += 1
+                try:
+                    await handler.on_message(channel_id, message, role, user_id=user_id, user_name=user_name)
+                except Exception as e:
+                    stats.failed += 1
+                    logger.error(f"❌ [{channel_id}] 메시지 처리 중 오류: {e}")
+                finally:
+                    self._in_flight -= 1
+            stats.record((time.monotonic() - received_at) * 1000)
+
+    def stats(self) -> dict:
+        """대기열 깊이와 처리 지연(수신 → 처리 완료, ms) 통계."""
+        channels = {}
+        for channel_id, stats in self._stats.items():
+            queue = self._queues.get(channel_id)
+            channels[channel_id] = {
+                "depth": queue.qsize() if queue else 0,
+                "processed": stats.processed,
+                "dropped": stats.dropped,
+                "failed": stats.failed,
+                "last_lag_ms": round(stats.last_lag_ms, 1),
+                "avg_lag_ms": round(stats.avg_lag_ms, 1),
+                "max_lag_ms": round(stats.max_lag_ms, 1),
+            }
+        return {
+            "policy": self._policy,
+            "queue_size": self._queue_size,
+            "concurrency": self._concurrency,
+            "in_flight": self._in_flight,
+            "workers": len(self._workers),
+            "total_depth": sum(q.qsize() for q in self._queues.values()),
+            "channels": channels,
+        }
+
+    async def close(self):
+        """서버 종료 시 워커를 정리합니다. 대기 중인 메시지는 버립니다."""
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
+
+
+# 모듈 레벨 싱글톤 — 모든 소켓 연결이 같은 디스패처를 공유
+dispatcher = MessageDispatcher()
@@ -0,0 +1,53 @@
+import re
+from typing import Optional
+
+# 인사말이 없는 채널을 표시하는 Redis 해시 필드 (RedisConfigService.refresh_greetings_cache 참고)
+EMPTY_SENTINEL = "__empty__"
+
+
+class GreetingMatcher:
+    """
+    채널의 인사말 키워드 전체를 하나의 정규표현식으로 미리 컴파일한 매처.
+    메시지 한 번의 탐색으로 매칭된 키워드와 응답을 찾는다.
+
+    매칭 규칙 (기존 키워드별 검사와 동일):
+    - (?<!\\w): 키워드 앞에 다른 글자가 붙어있지 않아야 함
+    - (?:키워드)+: 키워드 자체의 반복은 허용 (예: 안녕안녕)
+    - (?!\\w): 키워드 뒤에 다른 글자가 붙어있지 않아야 함
+    - 대소문자 구분 없음 (Hi/hi)
+    여러 키워드가 매칭되면 메시지에서 먼저 나타나는 키워드를, 같은 위치라면 더 긴 키워드를 우선한다.
+    """
+
+    def __init__(self, greetings: dict[str, str]):
+        # {Redis 해시 필드(원본 키워드, '|' 별칭 포함): 응답}
+        self.responses = {k: v for k, v in greetings.items() if k != EMPTY_SENTINEL}
+        # {정규식 그룹 이름: 원본 키워드}
+        self._groups: dict[str, str] = {}
+
+        alternatives = []
+        for keyword in self.responses:
+            for alias in dict.fromkeys(k.strip() for k in keyword.split('|') if k.strip()):
+                alternatives.append((alias, keyword))
+        # 같은 위치에서 시작하는 키워드는 긴 것부터 시도 ('안녕하세요'가 '안녕'보다 우선)
+        alternatives.sort(key=lambda item: len(item[0]), reverse=True)
+
+        parts = []
+        for idx, (alias, keyword) in enumerate(alternatives):
+            group = f"g{idx}"
+            self._groups[group] = keyword
+            parts.append(rf"(?P<{group}>(?:{re.escape(alias)})+)(?!\w)")
+
+        self._pattern = (
+            re.compile(rf"(?<!\w)(?:{'|'.join(parts)})", re.IGNORECASE)
+            if parts else None
+        )
+
+    def match(self, message: str) -> Optional[tuple[str, str]]:
+        """매칭된 (원본 키워드, 응답)을 반환합니다. 매칭이 없으면 None."""
+        if self._pattern is None:
+            return None
+        m = self._pattern.search(message)
+        if not m:
+            return None
+        keyword = self._groups[m.lastgroup]
+        return keyword, self.responses[keyword]
@@ -4,14 +4,14 @@ import re
 from app.redis.redis_service import RedisConfigService
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from app.core.database import get_session_factory
 from app.db.models import ChzzkNotification
 from app.features.chat.service import ChatService
 from app.core.config import MAX_GREETINGS_PER_CHANNEL
 from app.core.config import ALLOWED_PREFIXES
 from app.features.discord_bot.cogs.discord_service import DiscordService
-from app.features.discord_bot.cogs.chzzk_notifications import invalidate_notification_cache
+from app.features.discord_bot.cogs.chzzk_notifications import upsert_notification_cache, remove_notification_cache
 
 # 로거 설정
 logger = logging.getLogger("MessageHandling")
@@ -133,11 +133,8 @@ async def on_message(channel_id: str, message_text: str, role: str, user_id: str
 async def on_command(db: AsyncSession, session, channel_id: str, command: str, args: list, role: str, redis_service: RedisConfigService, prefix: str, user_id: str, user_name: str):
     chat_service = ChatService(db)
     
-    # 커스텀 명령어와 글로벌 명령어를 순차적으로 조회합니다.
-    # NOTE: SQLAlchemy의 AsyncSession은 단일 세션 객체에 대한 동시 작업을 허용하지 않으므로,
-    # asyncio.gather를 사용한 병렬 조회가 IllegalStateChangeError를 유발했습니다.
-    custom_cmd = await chat_service.get_chat_command(channel_id, command)
-    result = await chat_service.get_global_commands(command)
+    # 커스텀 명령어와 글로벌 명령어(리다이렉트 포함)를 인메모리 인덱스에서 한 번에 조회합니다 (인덱스가 없을 때만 DB 조회).
+    custom_cmd, result = await chat_service.resolve_command(channel_id, command)
 
     if custom_cmd and custom_cmd.is_active:
         # 쿨타임 체크
@@ -145,9 +142,8 @@ async def on_command(db: AsyncSession, session, channel_id: str, command: str, a
             return
 
         if custom_cmd.type == 'global':
-            # response 값을 명령어 이름으로 사용하여 글로벌 명령어 로직으로 진입 (드문 케이스, 재조회)
+            # response 값을 명령어 이름으로 사용하여 글로벌 명령어 로직으로 진입 (대상은 resolve_command가 이미 조회)
             command = custom_cmd.response
-            result = await chat_service.get_global_commands(command)
         else:
             await session.send_chat(custom_cmd.response)
             return
@@ -342,11 +338,15 @@ async def on_command(db: AsyncSession, session, channel_id: str, command: str, a
                         existing.discord_channel_id = discord_channel_id
                         existing.streamer_name = user_name
                         existing.is_active = True
+                        existing.updated_at = func.now()
+                        last_status = existing.last_status
                     else:
                         new_noti = ChzzkNotification(chzzk_channel_id=channel_id, streamer_name=user_name, discord_channel_id=discord_channel_id, last_status="CLOSE", is_active=True)
                         db.add(new_noti)
+                        last_status = "CLOSE"
                     await db.commit()
-                    invalidate_notification_cache()
+                    # 전체 캐시를 다시 읽지 않고 이 채널 항목만 반영 (다른 프로세스는 updated_at 증분 동기화로 반영)
+                    upsert_notification_cache(channel_id, discord_channel_id, user_name, None, last_status)
                     msg = f"알림 설정이 {'업데이트' if existing else '등록'}되었습니다. (Discord ID: {discord_channel_id})"
                     await session.send_chat(msg)
                 except Exception as e:
@@ -360,8 +360,9 @@ async def on_command(db: AsyncSession, session, channel_id: str, command: str, a
                 
                 if existing and existing.is_active:
                     existing.is_active = False
+                    existing.updated_at = func.now()
                     await db.commit()
-                    invalidate_notification_cache()
+                    remove_notification_cache(channel_id)
                     await session.send_chat("알림 설정이 해제되었습니다.")
                 else:
                     await session.send_chat("활성화된 알림 설정이 없습니다.")
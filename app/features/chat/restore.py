@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import random
+import time
+
+from sqlalchemy import select, func
+
+import app.core.config as config
+from app.core.rate_limit import TokenBucket
+from app.db.models import AuthToken, ChzzkNotification, StreamSession
+from app.features.chat.session_manager import session_manager
+from app.features.chat.sharding import shard_coordinator
+
+logger = logging.getLogger("SessionRestore")
+
+# 재시도 백오프 기본 대기 시간 (초) — attempt마다 2배, ±50% 지터
+_RETRY_BASE_DELAY = 1.0
+
+
+class RestoreOrchestrator:
+    """
+    서버 시작 시 DB의 모든 채널 세션을 백그라운드에서 복구합니다.
+    - 앱 기동(lifespan yield)을 막지 않으므로 /health는 즉시 응답한다.
+    - 토큰 버킷으로 치지직 API 호출 속도를 제한하고, 실패한 채널은 지터가 섞인 지수 백오프로 재시도한다.
+    - 방송 중이거나 최근에 방송한 채널부터 복구한다.
+    """
+
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self._bucket = TokenBucket(rate=config.RESTORE_RATE_PER_SEC, capacity=config.RESTORE_BURST)
+        self._reset()
+
+    def _reset(self):
+        self.state = "idle"
+        self.total = 0
+        self.restored = 0
+        self.failed: dict[str, str] = {}
+        self.in_progress: set[str] = set()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+
+    def start(self, session_factory):
+        """복구 태스크를 시작합니다. 이미 실행 중이면 무시합니다."""
+        if self._task is not None and not self._task.done():
+            return
+        self._reset()
+        self._task = asyncio.create_task(self._run(session_factory))
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _load_channels(self, session_factory) -> list[str]:
+        """복구할 채널 ID 목록을 우선순위 순서로 반환합니다. (방송 중 → 최근 방송 순 → 나머지)"""
+        async with session_factory() as db:
+            # 샤딩 시 이 워커가 담당하는 채널만 복구
+            channel_ids = [
+                cid for cid in (await db.execute(select(AuthToken.channel_id))).scalars().all()
+                if shard_coordinator.owns(cid)
+            ]
+
+            live_stmt = select(ChzzkNotification.chzzk_channel_id).where(ChzzkNotification.last_status == 'OPEN')
+            live = set((await db.execute(live_stmt)).scalars().all())
+
+            recent_stmt = (
+                select(StreamSession.chzzk_channel_id, func.max(StreamSession.opened_at))
+                .group_by(StreamSession.chzzk_channel_id)
+            )
+            last_opened = {cid: opened_at.timestamp() for cid, opened_at in (await db.execute(recent_stmt)).all()}
+
+        return sorted(
+            channel_ids,
+            key=lambda cid: (cid not in live, -last_opened.get(cid, 0.0)),
+        )
+
+    async def _restore_one(self, channel_id: str):
+        self.in_progress.add(channel_id)
+        try:
+            last_error = None
+            for attempt in range(config.RESTORE_MAX_RETRIES + 1):
+                await self._bucket.acquire()
+                try:
+                    await session_manager.get_or_create_session(channel_id)
+                    self.restored += 1
+                    return
+                except Exception as e:
+                    last_error = e
+                    if attempt < config.RESTORE_MAX_RETRIES:
+                        delay = _RETRY_BASE_DELAY * (2 ** attempt) * random.uniform(0.5, 1.5)
+                        logger.warning(f"⚠️ [{channel_id}] 세션 복구 실패 ({attempt + 1}회), {delay:.1f}초 후 재시도: {e}")
+                        await asyncio.sleep(delay)
+            self.failed[channel_id] = str(last_error)
+            logger.error(f"❌ [{channel_id}] 세션 복구 최종 실패 — 이후 재시도는 supervisor가 담당: {last_error}")
+            session_manager.supervise(channel_id, str(last_error))
+        finally:
+            self.in_progress.discard(channel_id)
+
+    async def _run(self, session_factory):
+        self.state = "running"
+        self.started_at = time.monotonic()
+        try:
+            channel_ids = await self._load_channels(session_factory)
+            self.total = len(channel_ids)
+            logger.info(f"🔄 세션 복구 시작: {self.total}개 채널")
+
+            # 동시에 진행할 채널 수 제한 (속도 제한은 토큰 버킷이 담당)
+            semaphore = asyncio.Semaphore(config.RESTORE_CONCURRENCY)
+
+            async def _bounded(channel_id):
+                async with semaphore:
+                    await self._restore_one(channel_id)
+
+            # 우선순위 순서대로 세마포어를 획득하도록 순서대로 태스크 생성
+            await asyncio.gather(*(_bounded(cid) for cid in channel_ids))
+            self.state = "done"
+            logger.info(f"✅ 세션 복구 완료: 성공 {self.restored}개, 실패 {len(self.failed)}개 ({self.elapsed:.1f}초)")
+        except asyncio.CancelledError:
+            self.state = "cancelled"
+            raise
+        except Exception as e:
+            self.state = "error"
+            logger.error(f"❌ 세션 복구 중 오류: {e}")
+        finally:
+            self.finished_at = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def status(self) -> dict:
+        return {
+            "state": self.state,
+            "total": self.total,
+            "restored": self.restored,
+            "failed": len(self.failed),
+            "in_progress": len(self.in_progress),
+            "pending": max(self.total - self.restored - len(self.failed) - len(self.in_progress), 0),
+            "elapsed_sec": round(self.elapsed, 1),
+            "failures": dict(self.failed),
+        }
+
+
+# 모듈 레벨 싱글톤 — lifespan과 상태 조회 API가 공유
+restore_orchestrator = RestoreOrchestrator()
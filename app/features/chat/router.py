@@ -1,22 +1,27 @@
 from fastapi import APIRouter
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.features.chat.chzzk_sessions import ChzzkSessions
 from app.features.chat.session_manager import session_manager
+from app.features.chat.handling.dispatcher import dispatcher
+from app.features.chat.clients.socket_pool import socket_pool
+from app.features.chat.restore import restore_orchestrator
+from app.features.chat.sharding import shard_coordinator
+from app.core.logger import set_channel_log_level, set_channel_sample_rate, channel_logging_stats
 
 chat_router = APIRouter(prefix="/chat", tags=["chat"])
 
 
-@chat_router.get("/send")
-async def send_message(
-    channel_id: str,
-    message: str
-):
+# --- 세션 명령 (채널을 담당하는 샤드에서 실행) ---
+
+async def _send_message(channel_id: str, payload: dict) -> dict:
     chzzk_session = await session_manager.get_session(channel_id)
     if not chzzk_session:
         return {"error": "활성화된 세션이 없습니다."}
 
-    result = await chzzk_session.send_chat(message)
+    # API 요청은 실제 전송 결과를 응답해야 하므로 대기열 전송 완료까지 기다린다
+    result = await chzzk_session.send_chat(payload["message"], wait=True)
     
     if not result:
         return {"error": "채팅 전송에 실패했습니다."}
@@ -24,10 +29,7 @@ async def send_message(
     return {"status": "success", "message": "채팅 전송에 성공했습니다."}
 
 
-@chat_router.get("/create/session")
-async def create_session(
-    channel_id: str
-):
+async def _create_session(channel_id: str, payload: dict) -> dict:
     try:
         # 매니저에게 세션을 요청 (없으면 알아서 만들어서 줌)
         session, created = await session_manager.get_or_create_session(channel_id)
@@ -51,10 +53,8 @@ async def create_session(
             "message": f"세션 생성 중 오류 발생: {str(e)}"
         }
 
-@chat_router.get("/create/session/force")
-async def force_create_session(
-    channel_id: str
-):
+
+async def _force_create_session(channel_id: str, payload: dict) -> dict:
     try:
         # 매니저에게 세션을 요청 (강제 재생성 옵션 True)
         session, created = await session_manager.get_or_create_session(channel_id, force_recreate=True)
@@ -71,19 +71,97 @@ async def force_create_session(
             "message": f"세션 강제 생성 중 오류 발생: {str(e)}"
         }
 
+
+async def _close_session(channel_id: str, payload: dict) -> dict:
+    session = await session_manager.get_session(channel_id)
+    if not session:
+        return {"status": "error", "message": "활성화된 세션이 없습니다."}
+    
+    await session_manager.remove_session(channel_id)
+    
+    return {"status": "success", "message": f"{channel_id} 세션이 종료되었습니다."}
+
+
+async def _update_token(channel_id: str, payload: dict) -> dict:
+    await session_manager.update_session_token(channel_id, payload["access_token"])
+    return {"status": "success"}
+
+
+shard_coordinator.register("send", _send_message)
+shard_coordinator.register("create", _create_session)
+shard_coordinator.register("force_create", _force_create_session)
+shard_coordinator.register("close", _close_session)
+shard_coordinator.register("update_token", _update_token)
+
+
+@chat_router.get("/send")
+async def send_message(
+    channel_id: str,
+    message: str
+):
+    return await shard_coordinator.call(channel_id, "send", {"message": message})
+
+
+@chat_router.get("/create/session")
+async def create_session(
+    channel_id: str
+):
+    return await shard_coordinator.call(channel_id, "create")
+
+@chat_router.get("/create/session/force")
+async def force_create_session(
+    channel_id: str
+):
+    return await shard_coordinator.call(channel_id, "force_create")
+
 @chat_router.get("/active-sessions")
 async def get_active_sessions():
+    """이 워커(샤드)가 담당하는 활성 세션 목록"""
     return {
         "count": len(session_manager.active_sessions),
-        "channels": list(session_manager.active_sessions.keys())
+        "channels": list(session_manager.active_sessions.keys()),
+        "shard": shard_coordinator.status(),
     }
 
+@chat_router.get("/restore-status")
+async def get_restore_status():
+    """서버 시작 시 백그라운드 세션 복구 진행 상황"""
+    return restore_orchestrator.status()
+
+@chat_router.get("/health")
+async def get_sessions_health():
+    """채널별 연결 상태, 가동 시간, 재연결 횟수 (세션 감시 태스크 기준)"""
+    return session_manager.health_stats()
+
+@chat_router.get("/dispatcher/stats")
+async def get_dispatcher_stats():
+    """채널별 메시지 대기열 깊이와 처리 지연, 소켓 연결 풀 현황"""
+    return {
+        "dispatcher": dispatcher.stats(),
+        "sockets": socket_pool.stats(),
+    }
+
+@chat_router.get("/logging")
+async def get_logging_stats():
+    """채널 로그 레벨, 표본 비율, 기록 대기열/버린 로그 수 (이 워커 기준)"""
+    return channel_logging_stats()
+
+@chat_router.get("/logging/level")
+async def set_logging_level(
+    level: Optional[str] = None,
+    sample_rate: Optional[float] = None,
+    channel_name: Optional[str] = None,
+):
+    """채널 로그 레벨(DEBUG/INFO/WARNING/...)과 채팅 줄 표본 비율을 실행 중에 변경 (channel_name이 없으면 전체)"""
+    if level is not None:
+        try:
+            set_channel_log_level(level, channel_name)
+        except ValueError:
+            return {"status": "error", "message": f"알 수 없는 로그 레벨: {level}"}
+    if sample_rate is not None:
+        set_channel_sample_rate(sample_rate, channel_name)
+    return {"status": "success", "logging": channel_logging_stats()}
+
 @chat_router.get("/close/session")
 async def close_session(channel_id: str):
-    session = await session_manager.get_session(channel_id)
-    if not session:
-        return {"status": "error", "message": "활성화된 세션이 없습니다."}
-    
-    await session_manager.remove_session(channel_id)
-    
-    return {"status": "success", "message": f"{channel_id} 세션이 종료되었습니다."}
\ No newline at end of file
+    return await shard_coordinator.call(channel_id, "close")
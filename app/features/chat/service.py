@@ -1,18 +1,31 @@
 from fastapi import Depends
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, or_, func
+from sqlalchemy import select, update, delete, and_, or_, case, func
 from fastapi import HTTPException
-import httpx
-import json
 
-# 모듈 레벨 싱글톤 — 매 출석 체크마다 TCP 연결 재생성 방지
-_http_client = httpx.AsyncClient(timeout=5.0)
-from app.db.models import ChannelConfig, GlobalCommand, ChatCommand, ChatGreeting, Attendance, StreamSession
+from app.db.models import ChannelConfig, GlobalCommand, ChatCommand, ChatGreeting, StreamSession, CommandAlias
+from app.db.migrations import alias_rows
+from app.features.chat.command_index import command_index, build_alias_map, invalidate_command_index, GLOBAL_INDEX_KEY
+from app.features.chat.attendance import attendance_batcher
+from app.features.chat.stream_session_cache import (
+    stream_session_cache, ChannelSessions, SessionRef, ATTENDANCE_ENTRY_TTL,
+)
 from app.core.config import MAX_GREETINGS_PER_CHANNEL
+from app.core.live_status import live_status_service
 from app.core.database import get_async_db
 from datetime import datetime, timedelta, timezone
 
+
+def _on_live_status_change(channel_id: str, status: str, content: dict):
+    # 방송 종료가 확인되면 출석용 방송 세션 캐시를 바로 비운다 (알림 설정이 없는 채널도 종료가 반영되도록)
+    if status == "CLOSE":
+        stream_session_cache.invalidate(channel_id)
+
+
+live_status_service.subscribe(_on_live_status_change)
+
+
 class ChatService:
     def __init__(self, db: AsyncSession):
         self.db = db
@@ -79,28 +92,19 @@ class ChatService:
         특정 글로벌 명령어를 DB에서 조회하는 메서드
         """
         try:
-            # ORM Select
-            # 1. 정확히 일치하는 명령어 조회
-            stmt = select(GlobalCommand).where(GlobalCommand.command == command)
-            result = await self.db.execute(stmt)
-            exact = result.scalar_one_or_none()
-            if exact:
-                return exact
-
-            # 2. '|' 구분자가 포함된 명령어 조회 (별칭 지원) — LIKE로 DB에서 선필터링
-            stmt = select(GlobalCommand).where(
-                or_(
-                    GlobalCommand.command.like(f'{command}|%'),
-                    GlobalCommand.command.like(f'%|{command}'),
-                    GlobalCommand.command.like(f'%|{command}|%'),
-                )
+            # command_alias 인덱스(channel_id, alias)로 별칭까지 한 번에 조회 — 전체 문자열 일치를 우선
+            stmt = (
+                select(GlobalCommand)
+                .join(CommandAlias, and_(
+                    CommandAlias.target_type == "global",
+                    CommandAlias.target_id == GlobalCommand.id,
+                ))
+                .where(CommandAlias.channel_id.is_(None), CommandAlias.alias == command)
+                .order_by(case((GlobalCommand.command == command, 0), else_=1), GlobalCommand.id)
+                .limit(1)
             )
             result = await self.db.execute(stmt)
-            for cmd_obj in result.scalars().all():
-                if command in cmd_obj.command.split('|'):
-                    return cmd_obj
-            
-            return None
+            return result.scalars().first()
 
         except Exception as e:
             await self.db.rollback()
@@ -145,51 +149,145 @@ class ChatService:
         특정 채널의 특정 커스텀 명령어를 조회합니다.
         """
         try:
-            # 1. 정확히 일치하는 명령어 조회
-            stmt = select(ChatCommand).where(
-                ChatCommand.channel_id == channel_id, 
-                ChatCommand.command == command
+            # command_alias 인덱스(channel_id, alias)로 별칭까지 한 번에 조회 — 전체 문자열 일치를 우선
+            stmt = (
+                select(ChatCommand)
+                .join(CommandAlias, and_(
+                    CommandAlias.target_type == "custom",
+                    CommandAlias.target_id == ChatCommand.id,
+                ))
+                .where(CommandAlias.channel_id == channel_id, CommandAlias.alias == command)
+                .order_by(case((ChatCommand.command == command, 0), else_=1), ChatCommand.id)
+                .limit(1)
             )
             result = await self.db.execute(stmt)
-            exact = result.scalar_one_or_none()
-            if exact:
-                return exact
+            return result.scalars().first()
+        except Exception as e:
+            await self.db.rollback()
+            print(f"[DB Error] {str(e)}")
+            return None
 
-            # 2. '|' 구분자가 포함된 명령어 조회 (별칭 지원) — LIKE로 DB에서 선필터링
-            stmt = select(ChatCommand).where(
-                ChatCommand.channel_id == channel_id,
-                or_(
-                    ChatCommand.command.like(f'{command}|%'),
-                    ChatCommand.command.like(f'%|{command}'),
-                    ChatCommand.command.like(f'%|{command}|%'),
+    async def lookup_command(self, channel_id: str, command: str):
+        """
+        채널 커스텀 명령어와 글로벌 명령어를 한 번의 인덱스 조회로 찾습니다.
+        채널 명령어가 글로벌보다, 전체 문자열 일치가 별칭 일치보다 우선하며 가장 우선하는 ChatCommand 또는 GlobalCommand 하나를 반환합니다.
+        """
+        try:
+            stmt = (
+                select(ChatCommand, GlobalCommand)
+                .select_from(CommandAlias)
+                .outerjoin(ChatCommand, and_(
+                    CommandAlias.target_type == "custom",
+                    CommandAlias.target_id == ChatCommand.id,
+                ))
+                .outerjoin(GlobalCommand, and_(
+                    CommandAlias.target_type == "global",
+                    CommandAlias.target_id == GlobalCommand.id,
+                ))
+                .where(
+                    CommandAlias.alias == command,
+                    or_(
+                        and_(CommandAlias.channel_id == channel_id, CommandAlias.target_type == "custom"),
+                        and_(CommandAlias.channel_id.is_(None), CommandAlias.target_type == "global"),
+                    ),
                 )
+                .order_by(
+                    CommandAlias.channel_id.asc().nulls_last(),
+                    case((func.coalesce(ChatCommand.command, GlobalCommand.command) == command, 0), else_=1),
+                    CommandAlias.target_id,
+                )
+                .limit(1)
             )
-            result = await self.db.execute(stmt)
-            for cmd_obj in result.scalars().all():
-                if command in cmd_obj.command.split('|'):
-                    return cmd_obj
-            
-            return None
+            row = (await self.db.execute(stmt)).first()
+            if row is None:
+                return None
+            custom_cmd, global_cmd = row
+            return custom_cmd or global_cmd
         except Exception as e:
             await self.db.rollback()
             print(f"[DB Error] {str(e)}")
             return None
 
+    async def get_cached_chat_command(self, channel_id: str, command: str):
+        """
+        채널 명령어 인덱스(인메모리)에서 커스텀 명령어를 조회합니다.
+        인덱스가 없을 때만 채널의 명령어 전체를 한 번 조회해 구성하므로, 평상시에는 DB 왕복이 없습니다.
+        반환값은 ORM 객체가 아닌 CommandEntry 스냅샷입니다.
+        """
+        aliases = command_index.get(channel_id)
+        if aliases is None:
+            try:
+                version = command_index.version(channel_id)
+                stmt = select(ChatCommand).where(ChatCommand.channel_id == channel_id)
+                result = await self.db.execute(stmt)
+                aliases = build_alias_map(result.scalars().all())
+                command_index.put(channel_id, version, aliases)
+            except Exception as e:
+                await self.db.rollback()
+                print(f"[DB Error] Command index build failed: {str(e)}")
+                return None
+        return aliases.get(command)
+
+    async def get_cached_global_command(self, command: str):
+        """글로벌 명령어 인덱스(인메모리)에서 글로벌 명령어를 조회합니다."""
+        aliases = command_index.get(GLOBAL_INDEX_KEY)
+        if aliases is None:
+            try:
+                version = command_index.version(GLOBAL_INDEX_KEY)
+                result = await self.db.execute(select(GlobalCommand))
+                aliases = build_alias_map(result.scalars().all())
+                command_index.put(GLOBAL_INDEX_KEY, version, aliases)
+            except Exception as e:
+                await self.db.rollback()
+                print(f"[DB Error] Global command index build failed: {str(e)}")
+                return None
+        return aliases.get(command)
+
+    async def resolve_command(self, channel_id: str, command: str):
+        """
+        커스텀 명령어와 글로벌 명령어를 한 번에 조회합니다. 반환: (custom, global) CommandEntry 튜플
+        - 두 인덱스가 모두 캐시에 있으면 DB 왕복 없이 처리된다.
+        - 커스텀 명령어가 type='global'이면 response를 명령어 이름으로 보고 리다이렉트 대상 글로벌 명령어를 돌려준다.
+        """
+        custom_cmd = await self.get_cached_chat_command(channel_id, command)
+        target = command
+        if custom_cmd and custom_cmd.is_active and custom_cmd.type == 'global':
+            target = custom_cmd.response
+        global_cmd = await self.get_cached_global_command(target)
+        return custom_cmd, global_cmd
+
+    def _add_aliases(self, target_type: str, target_id: int, channel_id: str, command: str):
+        """명령어/키워드의 별칭들을 command_alias에 추가합니다 (커밋은 호출한 쪽에서)."""
+        for row in alias_rows(target_type, target_id, channel_id, command):
+            self.db.add(CommandAlias(**row))
+
+    async def _delete_aliases(self, target_type: str, target_id: int):
+        """대상 행의 별칭들을 command_alias에서 제거합니다 (커밋은 호출한 쪽에서)."""
+        await self.db.execute(
+            delete(CommandAlias).where(
+                CommandAlias.target_type == target_type,
+                CommandAlias.target_id == target_id,
+            )
+        )
+
     async def add_chat_command(self, channel_id: str, command: str, response: str):
         try:
-            # 중복 체크
-            existing = await self.get_chat_command(channel_id, command)
-            if existing:
-                return await self.update_chat_command(channel_id, command, response)
-            
-            # 글로벌 명령어 중복 확인
-            global_cmd = await self.get_global_commands(command)
-            if global_cmd:
+            # 채널 명령어 중복 / 글로벌 명령어 충돌을 한 번에 확인
+            existing = await self.lookup_command(channel_id, command)
+            if isinstance(existing, GlobalCommand):
                 return False
+            if existing:
+                existing.response = response
+                await self.db.commit()
+                invalidate_command_index(channel_id)
+                return True
 
             new_cmd = ChatCommand(channel_id=channel_id, command=command, response=response)
             self.db.add(new_cmd)
+            await self.db.flush()  # 별칭 등록을 위해 ID 확보
+            self._add_aliases("custom", new_cmd.id, channel_id, command)
             await self.db.commit()
+            invalidate_command_index(channel_id)
             return True
         except Exception as e:
             await self.db.rollback()
@@ -204,6 +302,7 @@ class ChatService:
             
             cmd_obj.response = response
             await self.db.commit()
+            invalidate_command_index(channel_id)
             return True
         except Exception as e:
             await self.db.rollback()
@@ -216,8 +315,10 @@ class ChatService:
             if not cmd_obj:
                 return False
 
-            self.db.delete(cmd_obj)
+            await self._delete_aliases("custom", cmd_obj.id)
+            await self.db.delete(cmd_obj)
             await self.db.commit()
+            invalidate_command_index(channel_id)
             return True
         except Exception as e:
             await self.db.rollback()
@@ -236,34 +337,42 @@ class ChatService:
             print(f"[DB Error] Greetings fetch failed: {str(e)}")
             return []
 
-    async def get_greeting(self, channel_id: str, keyword: str):
-        """특정 인사말 조회"""
+    async def get_greetings_by_channels(self, channel_ids: list[str]):
+        """
+        여러 채널의 인사말을 한 번의 쿼리로 조회해 {channel_id: [ChatGreeting, ...]}로 묶어 반환합니다.
+        조회 실패 시 None을 반환합니다 (빈 결과와 구분해 캐시를 비우지 않도록).
+        """
         try:
-            # 1. 정확히 일치하는 인사말 조회
-            stmt = select(ChatGreeting).where(
-                ChatGreeting.channel_id == channel_id,
-                ChatGreeting.keyword == keyword
+            stmt = (
+                select(ChatGreeting)
+                .where(ChatGreeting.channel_id.in_(channel_ids))
+                .order_by(ChatGreeting.channel_id, ChatGreeting.id)
             )
             result = await self.db.execute(stmt)
-            exact = result.scalar_one_or_none()
-            if exact:
-                return exact
-
-            # 2. '|' 구분자가 포함된 인사말 조회 (별칭 지원) — LIKE로 DB에서 선필터링
-            stmt = select(ChatGreeting).where(
-                ChatGreeting.channel_id == channel_id,
-                or_(
-                    ChatGreeting.keyword.like(f'{keyword}|%'),
-                    ChatGreeting.keyword.like(f'%|{keyword}'),
-                    ChatGreeting.keyword.like(f'%|{keyword}|%'),
-                )
+            grouped = {channel_id: [] for channel_id in channel_ids}
+            for greeting in result.scalars().all():
+                grouped[greeting.channel_id].append(greeting)
+            return grouped
+        except Exception as e:
+            print(f"[DB Error] Bulk greetings fetch failed: {str(e)}")
+            return None
+
+    async def get_greeting(self, channel_id: str, keyword: str):
+        """특정 인사말 조회"""
+        try:
+            # command_alias 인덱스(channel_id, alias)로 별칭까지 한 번에 조회 — 전체 문자열 일치를 우선
+            stmt = (
+                select(ChatGreeting)
+                .join(CommandAlias, and_(
+                    CommandAlias.target_type == "greeting",
+                    CommandAlias.target_id == ChatGreeting.id,
+                ))
+                .where(CommandAlias.channel_id == channel_id, CommandAlias.alias == keyword)
+                .order_by(case((ChatGreeting.keyword == keyword, 0), else_=1), ChatGreeting.id)
+                .limit(1)
             )
             result = await self.db.execute(stmt)
-            for greet_obj in result.scalars().all():
-                if keyword in [k.strip() for k in greet_obj.keyword.split('|')]:
-                    return greet_obj
-            
-            return None
+            return result.scalars().first()
         except Exception as e:
             print(f"[DB Error] Get greeting failed: {str(e)}")
             return None
@@ -286,6 +395,8 @@ class ChatService:
 
             new_greeting = ChatGreeting(channel_id=channel_id, keyword=keyword, response=response)
             self.db.add(new_greeting)
+            await self.db.flush()  # 별칭 등록을 위해 ID 확보
+            self._add_aliases("greeting", new_greeting.id, channel_id, keyword)
             await self.db.commit()
             return "created", keyword
         except Exception as e:
@@ -300,7 +411,8 @@ class ChatService:
             if not target:
                 return False
 
-            self.db.delete(target)
+            await self._delete_aliases("greeting", target.id)
+            await self.db.delete(target)
             await self.db.commit()
             return True
         except Exception as e:
@@ -313,103 +425,70 @@ class ChatService:
     async def process_attendance(self, channel_id: str, user_id: str, user_name: str):
         """
         출석 체크를 수행하고 결과를 반환합니다 (방송 세션 단위 기준).
+        같은 시점의 출석 요청들은 attendance_batcher가 모아 한 번의 UPSERT로 처리합니다.
         """
         try:
-            # 1. 방송 세션 확인 및 동기화 (방송 중이 아니거나, 데이터가 없으면 None 반환)
-            latest_session = await self.sync_stream_session(channel_id)
+            # 1. 현재/직전 방송 세션 확인 (방송 중이 아니거나, 데이터가 없으면 None 반환)
+            sessions = await self.get_stream_sessions(channel_id)
 
-            if not latest_session:
+            if not sessions:
                 # sync_stream_session에서 실패하면 방송 중이 아니거나, API 오류, openDate 없음 등의 이유.
                 # 사용자에게는 방송 중이 아니라는 메시지로 통일하여 안내.
                 return {"status": "not_streaming"}
 
-            current_opened_at = latest_session.opened_at
-
-            # 2. 이전 방송 세션 조회 (연속 출석 체크용)
-            previous_session = (await self.db.execute(
-                select(StreamSession).where(
-                    StreamSession.chzzk_channel_id == channel_id,
-                    StreamSession.opened_at < current_opened_at
-                ).order_by(StreamSession.opened_at.desc()).limit(1)
-            )).scalar_one_or_none()
-
-            # 3. 기존 출석 기록 확인
-            stmt_att = select(Attendance).where(
-                Attendance.channel_id == channel_id,
-                Attendance.user_id == user_id
-            )
-            attendance = (await self.db.execute(stmt_att)).scalar_one_or_none()
-
-            if not attendance:
-                # 첫 출석
-                new_attendance = Attendance(
-                    channel_id=channel_id,
-                    user_id=user_id,
-                    user_name=user_name,
-                    attendance_count=1,
-                    streak_count=1,
-                    last_attendance_at=current_opened_at
-                )
-                self.db.add(new_attendance)
-                await self.db.commit()
-                return {"status": "checked", "streak": 1, "total": 1, "is_new": True}
-
-            # 중복 출석 확인 (단계 3)
-            if attendance.last_attendance_at == current_opened_at:
-                return {
-                    "status": "already_checked", 
-                    "streak": attendance.streak_count, 
-                    "total": attendance.attendance_count, 
-                    "is_new": False
-                }
-
-            # 4. 연속 출석 검사 (단계 4)
-            if previous_session and attendance.last_attendance_at == previous_session.opened_at:
-                attendance.streak_count += 1
-            else:
-                attendance.streak_count = 1
-
-            # 5. 출석 업데이트 (단계 5)
-            attendance.attendance_count += 1
-            attendance.last_attendance_at = current_opened_at
-            attendance.user_name = user_name
-            
+            # 세션 조회 트랜잭션을 끝내 커넥션을 풀에 돌려준다 — 배처가 별도 커넥션으로 기록하므로 두 개를 동시에 잡지 않도록
             await self.db.commit()
-            return {"status": "checked", "streak": attendance.streak_count, "total": attendance.attendance_count, "is_new": False}
+
+            # 2. 출석 기록 (연속/누적 계산은 DB에서 수행)
+            return await attendance_batcher.submit(channel_id, user_id, user_name, sessions)
 
         except Exception as e:
             await self.db.rollback()
             print(f"[DB Error] Attendance check failed: {str(e)}")
             return None
 
+    async def get_stream_sessions(self, channel_id: str):
+        """
+        출석 판정에 사용할 현재/직전 방송 세션을 반환합니다.
+        캐시된 세션이 현재 방송(live-status의 openDate)과 같으면 세션 조회 없이 반환하고, 아니면 조회 후 짧게 캐싱합니다.
+        (CLOSE를 관측하지 못한 채 방송이 다시 시작된 경우 이전 방송 기준으로 출석이 판정되지 않도록 매번 확인)
+        """
+        latest_session = await self.sync_stream_session(channel_id)
+        if not latest_session:
+            return None
+
+        sessions = stream_session_cache.get(channel_id)
+        if sessions and sessions.current.opened_at == latest_session.opened_at:
+            return sessions
+
+        return await self.cache_stream_sessions(channel_id, latest_session, ATTENDANCE_ENTRY_TTL)
+
+    async def cache_stream_sessions(self, channel_id: str, current_session, ttl: float):
+        """현재 세션 기준으로 직전 세션을 조회해 채널 세션 캐시에 저장합니다."""
+        # 이전 방송 세션 조회 (연속 출석 체크용)
+        previous = (await self.db.execute(
+            select(StreamSession.id, StreamSession.opened_at).where(
+                StreamSession.chzzk_channel_id == channel_id,
+                StreamSession.opened_at < current_session.opened_at
+            ).order_by(StreamSession.opened_at.desc()).limit(1)
+        )).first()
+
+        sessions = ChannelSessions(
+            current=SessionRef(id=current_session.id, opened_at=current_session.opened_at),
+            previous=SessionRef(id=previous.id, opened_at=previous.opened_at) if previous else None,
+        )
+        stream_session_cache.set(channel_id, sessions, ttl)
+        return sessions
+
     async def sync_stream_session(self, channel_id: str):
         """
         현재 방송 상태를 확인하고, 방송 중이면 StreamSession을 기록합니다.
         """
-        # 순환 참조 방지를 위해 Redis 객체만 함수 내에서 임포트
-        from app.redis.redis_service import redis_client
         try:
-            cache_key = f"live_status:{channel_id}"
-            content = None
-            
-            # 1. Redis 캐시에서 60초 이내에 조회한 방송 상태가 있는지 확인 (API Rate Limit 방지)
-            cached_status = await redis_client.get(cache_key)
-            
-            if cached_status:
-                if cached_status == "CLOSE":
-                    return None
-                content = json.loads(cached_status)
-            else:
-                # 2. 캐시가 없을 때만 API 호출 후 60초간 캐싱
-                status_url = f"https://api.chzzk.naver.com/polling/v2/channels/{channel_id}/live-status"
-                res = await _http_client.get(status_url)
-                if res.status_code != 200:
-                    return None # API 실패
-                content = res.json().get("content", {})
-                if not content or content.get("status") != "OPEN":
-                    await redis_client.set(cache_key, "CLOSE", ex=60)
-                    return None # 방송 중 아님
-                await redis_client.set(cache_key, json.dumps(content), ex=300)
+            # 공용 방송 상태 서비스로 조회 (로컬/Redis 캐시 → API, 동시 요청은 하나로 합침)
+            content = await live_status_service.get(channel_id)
+            if not content or content.get("status") != "OPEN":
+                return None # API 실패 또는 방송 중 아님
 
             open_date_str = content.get("openDate")
             if not open_date_str:
@@ -418,6 +497,11 @@ class ChatService:
             kst_tz = timezone(timedelta(hours=9))
             current_opened_at = datetime.strptime(open_date_str, "%Y-%m-%d %H:%M:%S").replace(tzinfo=kst_tz)
 
+            # 캐시된 현재 세션과 같은 방송이면 DB 조회 생략
+            cached = stream_session_cache.get(channel_id)
+            if cached and cached.current.opened_at == current_opened_at:
+                return cached.current
+
             stmt_find_session = select(StreamSession).where(
                 StreamSession.chzzk_channel_id == channel_id,
                 StreamSession.opened_at == current_opened_at
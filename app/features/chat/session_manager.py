@@ -1,49 +1,56 @@
 import asyncio
 import logging
+import random
+import time
+
+import app.core.config as config
+from app.core.live_status import live_status_service
 from app.features.chat.chzzk_sessions import ChzzkSessions
+from app.features.chat.clients.socket_pool import socket_pool
 
 logger = logging.getLogger("SessionManager")
 
+# 복구 백오프 기본 대기 시간 (초) — 연속 실패마다 2배, ±50% 지터
+_RECOVERY_BASE_DELAY = 2.0
+
+
+class ChannelHealth:
+    """채널별 연결 상태 기록 (supervisor가 갱신)."""
+
+    __slots__ = ("connected_since", "reconnects", "failures", "last_error", "unhealthy_since", "next_retry_at", "state")
+
+    def __init__(self):
+        self.connected_since = time.monotonic()
+        self.reconnects = 0
+        self.failures = 0          # 연속 복구 실패 횟수 (성공 시 0)
+        self.last_error = None
+        self.unhealthy_since = None
+        self.next_retry_at = 0.0
+        self.state = "ok"
+
+
 class SessionManager:
     def __init__(self):
         self.active_sessions = {}  # {channel_id: ChzzkSessions 인스턴스}
-        # 동시 생성 방지를 위한 락 (channel_id별로 관리)
+        # 동시 생성 방지를 위한 락 (channel_id별로 관리, 생성 시에만 사용)
         self._locks = {}
+        self._lock_users: dict[str, int] = {}  # {channel_id: 락을 기다리거나 잡고 있는 코루틴 수}
+        # 감시 대상 채널 — 복구 중 세션이 잠시 빠져도 명시적으로 제거(remove_session)하기 전까지 유지
+        self._health: dict[str, ChannelHealth] = {}
+        self._supervisor_task: asyncio.Task | None = None
+        self._recovering: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()  # 실행 중인 복구 태스크 (참조 유지)
 
     def add_session(self, channel_id, session):
         self.active_sessions[channel_id] = session
 
 
-    async def restore_all_sessions_from_db(self, db_session):
-        """
-        서버 시작 시 DB에서 인증 정보를 가진 모든 채널을 불러와 연결을 복구합니다.
-        """
-        from app.features.auth.service import AuthService 
-        auth_service = AuthService(db_session)
-        channels = await auth_service.get_auth_list()
-
-        # 동시에 너무 많은 세션을 복구하면 API Rate Limit(429)이 발생할 수 있으므로 Semaphore 제한 추가
-        semaphore = asyncio.Semaphore(10) # 한 번에 최대 10개씩 연결
-        
-        async def _bounded_restore(channel_id):
-            async with semaphore:
-                return await self.get_or_create_session(channel_id)
-
-        tasks = []
-        for ch in channels:
-            tasks.append(_bounded_restore(ch.channel_id))
-        
-        # 병렬로 모든 세션 복구 시작
-        if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            for i, res in enumerate(results):
-                if isinstance(res, Exception):
-                    # 어떤 채널(ID)에서 에러가 났는지 로그에 남김
-                    logger.error(f"❌ 세션 복구 실패: {res}")
-            logger.info(f"✅ {len(results)}개의 세션 복구 시도 완료")
-
     async def get_session(self, channel_id: str):
         """세션이 있으면 반환하고, 없으면 생성해서 반환합니다."""
+        # 빠른 경로: 이미 있는 세션은 락 없이 바로 반환 (메시지마다 호출되는 경로)
+        session = self.active_sessions.get(channel_id)
+        if session is not None:
+            return session
         session, _ = await self.get_or_create_session(channel_id)
         return session
     
@@ -51,52 +58,227 @@ class SessionManager:
         """
         세션을 반환합니다. 없으면 새로 생성하고 초기화(연결)까지 마칩니다.
         """
-        # 해당 채널용 락이 없으면 생성
-        if channel_id not in self._locks:
-            self._locks[channel_id] = asyncio.Lock()
-
-        # 락을 사용하여 중복 생성 방지 (Critical Section)
-        async with self._locks[channel_id]:
-            if channel_id in self.active_sessions:
-                if not force_recreate:
-                    return self.active_sessions[channel_id], False
+        # 빠른 경로: 재생성 요청이 아니고 세션이 이미 있으면 락을 잡지 않는다
+        if not force_recreate:
+            session = self.active_sessions.get(channel_id)
+            if session is not None:
+                return session, False
+
+        # 생성/재생성할 때만 채널용 락 사용 (락을 기다리거나 잡고 있는 코루틴 수를 함께 기록)
+        lock = self._locks.get(channel_id)
+        if lock is None:
+            lock = self._locks[channel_id] = asyncio.Lock()
+        self._lock_users[channel_id] = self._lock_users.get(channel_id, 0) + 1
+
+        try:
+            # 락을 사용하여 중복 생성 방지 (Critical Section)
+            async with lock:
+                if channel_id in self.active_sessions:
+                    if not force_recreate:
+                        return self.active_sessions[channel_id], False
                 
-                logger.info(f"♻️ [{channel_id}] 기존 세션 강제 종료 및 재생성")
-                await self.remove_session(channel_id)
+                    logger.info(f"♻️ [{channel_id}] 기존 세션 강제 종료 및 재생성")
+                    # 소켓 연결 배정은 유지 — 새 세션이 같은 연결을 이어받는다
+                    old_session = self.active_sessions.pop(channel_id)
+                    await old_session.close(release_socket=False)
 
-            logger.info(f"🆕 [{channel_id}] 새 세션 생성 및 초기화 시작")
+                logger.info(f"🆕 [{channel_id}] 새 세션 생성 및 초기화 시작")
             
-            # TODO: 파일 구조 변경 시 from .session import ChzzkSession 으로 변경 필요
-            new_session = ChzzkSessions(channel_id)
+                # TODO: 파일 구조 변경 시 from .session import ChzzkSession 으로 변경 필요
+                new_session = ChzzkSessions(channel_id)
             
-            # 2. 실제 치지직 서버와 연결 및 구독 (비동기 작업)
-            await new_session.create_session()
+                # 2. 공유 소켓 연결 배정 및 채팅 구독 (비동기 작업)
+                try:
+                    await new_session.create_session()
 
-            if not new_session.socket_url:
-                raise Exception("소켓 URL을 가져오지 못했습니다.")
+                    if not new_session.session_key:
+                        raise Exception("세션 키를 받지 못했습니다. (소켓 URL 발급 실패 또는 연결 타임아웃)")
 
-            if not new_session.session_key:
-                raise Exception("세션 키를 받지 못했습니다. (소켓 연결 타임아웃)")
+                    # 강제 재생성은 채팅이 들어오지 않는 채널을 고치는 수단이므로 세션 키가 그대로여도 항상 다시 구독
+                    # (세션 키가 같으면 구독을 건너뛰는 것은 연결 풀의 자동 재배정에서만)
+                    if force_recreate:
+                        subscribed = await new_session.subscribe_chat()
+                    else:
+                        subscribed = await new_session.ensure_subscribed()
+                    if not subscribed:
+                        raise Exception("채팅 구독에 실패했습니다.")
+                except Exception:
+                    # 배정받은 연결 슬롯을 반환
+                    await new_session.close()
+                    raise
 
-            subscribed = await new_session.subscribe_chat()
-            if not subscribed:
-                raise Exception("채팅 구독에 실패했습니다.")
+                self.active_sessions[channel_id] = new_session
+                if channel_id not in self._health:
+                    self._health[channel_id] = ChannelHealth()
+                return new_session, True
+        finally:
+            remaining = self._lock_users[channel_id] - 1
+            if remaining:
+                self._lock_users[channel_id] = remaining
+            else:
+                del self._lock_users[channel_id]
+            # 생성에 실패한(세션도 감시 대상도 아닌) 채널의 락은 남겨두지 않음
+            if channel_id not in self.active_sessions and channel_id not in self._health:
+                self._evict_lock(channel_id)
 
-            self.active_sessions[channel_id] = new_session
-            return new_session, True
+    def supervise(self, channel_id: str, error: str | None = None):
+        """
+        세션이 없는 채널을 감시 대상에 넣어 supervisor가 백오프로 재생성하게 합니다.
+        (서버 시작 시 복구에 끝내 실패한 채널 등 — 수동 복구 없이도 API가 회복되면 다시 연결된다)
+        """
+        if channel_id in self._health:
+            return
+        health = self._health[channel_id] = ChannelHealth()
+        health.state = "detached"
+        health.failures = 1
+        health.last_error = error
+        health.unhealthy_since = time.monotonic()
+        health.next_retry_at = health.unhealthy_since + _RECOVERY_BASE_DELAY * 2 * random.uniform(0.5, 1.5)
 
     async def remove_session(self, channel_id: str):
         """특정 채널 세션 종료 및 제거"""
+        self._health.pop(channel_id, None)
         session = self.active_sessions.pop(channel_id, None)
-        if session and session.socket_client:
-            await session.socket_client.disconnect()
+        if session:
+            await session.close()
+        self._evict_lock(channel_id)
+
+    def _evict_lock(self, channel_id: str):
+        """
+        제거된 채널의 락을 정리합니다 (_locks가 무한히 커지지 않도록).
+        락을 기다리거나 잡고 있는 코루틴이 없을 때만 지운다 — 대기자가 있는데 지우면 새 락이 생겨 중복 생성이 가능해진다.
+        """
+        if channel_id not in self._lock_users:
+            self._locks.pop(channel_id, None)
 
     async def close_all(self):
-        """서버 종료 시 모든 세션 안전하게 닫기"""
+        """서버 종료(또는 샤드 리스 상실) 시 모든 세션 안전하게 닫기"""
+        # 연결을 먼저 닫으면 채널별 구독 해제 API 호출 없이 정리된다
+        await socket_pool.close_all()
         for session in self.active_sessions.values():
-            if session.socket_client:
-                await session.socket_client.disconnect()
+            await session.close()
         self.active_sessions.clear()
+        self._health.clear()
+
+    # --- 연결 감시 (supervisor) ---
+
+    def start_supervisor(self):
+        if self._supervisor_task is None or self._supervisor_task.done():
+            self._supervisor_task = asyncio.create_task(self._supervise())
+
+    async def stop_supervisor(self):
+        if self._supervisor_task is not None:
+            self._supervisor_task.cancel()
+            try:
+                await self._supervisor_task
+            except asyncio.CancelledError:
+                pass
+            self._supervisor_task = None
+        for task in list(self._tasks):
+            task.cancel()
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _supervise(self):
+        """
+        주기적으로 모든 채널의 연결 상태를 점검하고, 유예 시간 이상 비정상인 채널을 재생성합니다.
+        - 소켓 연결 풀의 자체 재배정이 끝날 시간을 주기 위해 유예 시간 동안은 기다린다.
+        - 재생성은 전역 동시 실행 수 제한 + 채널별 지수 백오프(지터 포함)로 API 폭주를 막는다.
+        """
+        semaphore = asyncio.Semaphore(config.SUPERVISOR_CONCURRENCY)
+        while True:
+            await asyncio.sleep(config.SUPERVISOR_INTERVAL)
+            try:
+                now = time.monotonic()
+                for channel_id, health in list(self._health.items()):
+                    lock = self._locks.get(channel_id)
+                    if channel_id in self._recovering or (lock and lock.locked()):
+                        continue
+
+                    state = socket_pool.channel_state(channel_id) if channel_id in self.active_sessions else "detached"
+                    if state == "ok" and await self._is_stale(channel_id, health, now):
+                        state = "stale"
+                    health.state = state
+                    if state == "ok":
+                        health.unhealthy_since = None
+                        continue
+
+                    if health.unhealthy_since is None:
+                        health.unhealthy_since = now
+                    if now - health.unhealthy_since < config.SUPERVISOR_UNHEALTHY_GRACE or now < health.next_retry_at:
+                        continue
+
+                    self._recovering.add(channel_id)
+                    self._spawn(self._recover(channel_id, health, semaphore))
+            except Exception as e:
+                logger.error(f"❌ [Supervisor] 점검 중 오류: {e}")
+
+    async def _is_stale(self, channel_id: str, health: ChannelHealth, now: float) -> bool:
+        """
+        연결/구독은 정상으로 보이지만 방송 중인데도 채팅 이벤트가 SUPERVISOR_STALE_AFTER 동안 없는지.
+        (서버 쪽에서 revoke 없이 구독이 사라진 경우 — 소켓 상태만으로는 알 수 없다)
+        """
+        last_event = socket_pool.last_event_at(channel_id) or 0.0
+        if now - max(last_event, health.connected_since) < config.SUPERVISOR_STALE_AFTER:
+            return False
+        try:
+            live = await live_status_service.get(channel_id)
+        except Exception as e:
+            logger.warning(f"⚠️ [{channel_id}] 방송 상태 확인 실패: {e}")
+            return False
+        # 방송 중이 아니면 채팅이 없는 게 정상
+        return bool(live) and live.get("status") == "OPEN"
+
+    async def _recover(self, channel_id: str, health: ChannelHealth, semaphore: asyncio.Semaphore):
+        try:
+            async with semaphore:
+                logger.warning(f"🩺 [{channel_id}] 비정상 연결({health.state}) 감지 — 세션 재생성")
+                try:
+                    await self.get_or_create_session(channel_id, force_recreate=channel_id in self.active_sessions)
+                except Exception as e:
+                    health.failures += 1
+                    health.last_error = str(e)
+                    delay = min(_RECOVERY_BASE_DELAY * (2 ** health.failures), config.SUPERVISOR_MAX_BACKOFF)
+                    delay *= random.uniform(0.5, 1.5)
+                    health.next_retry_at = time.monotonic() + delay
+                    logger.error(f"❌ [{channel_id}] 세션 재생성 실패 ({health.failures}회), {delay:.0f}초 후 재시도: {e}")
+                    return
+
+                health.reconnects += 1
+                health.failures = 0
+                health.last_error = None
+                health.unhealthy_since = None
+                health.connected_since = time.monotonic()
+                health.state = socket_pool.channel_state(channel_id)
+                logger.info(f"✅ [{channel_id}] 세션 재생성 완료")
+        finally:
+            self._recovering.discard(channel_id)
+
+    def health_stats(self) -> dict:
+        """채널별 연결 상태, 가동 시간, 재연결/실패 횟수."""
+        now = time.monotonic()
+        channels = {}
+        for channel_id, health in self._health.items():
+            last_event = socket_pool.last_event_at(channel_id)
+            channels[channel_id] = {
+                "state": health.state,
+                "uptime_sec": round(now - health.connected_since) if health.unhealthy_since is None else 0,
+                "reconnects": health.reconnects,
+                "failures": health.failures,
+                "last_error": health.last_error,
+                "last_event_ago_sec": round(now - last_event) if last_event else None,
+            }
+        states = [c["state"] for c in channels.values()]
+        return {
+            "supervised": len(channels),
+            "healthy": states.count("ok"),
+            "recovering": len(self._recovering),
+            "channels": channels,
+        }
 
     async def update_session_token(self, channel_id: str, new_access_token: str):
         """실행 중인 세션의 액세스 토큰을 갱신합니다."""
@@ -0,0 +1,266 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import uuid
+from typing import Awaitable, Callable, Optional
+
+import redis.asyncio as redis
+
+import app.core.config as config
+from app.core.hash_ring import HashRing
+from app.core.lease import RedisLease
+
+logger = logging.getLogger("Sharding")
+
+# 스트림 길이 상한 (처리된 명령이 무한히 쌓이지 않도록, 근사치 트리밍)
+_STREAM_MAXLEN = 1000
+# 응답 리스트 보관 시간 (요청자가 타임아웃으로 떠난 경우 정리용)
+_REPLY_TTL = 60
+# XREAD 블로킹 대기 시간 (ms)
+_XREAD_BLOCK_MS = 5000
+
+# 블로킹 명령(XREAD/BLPOP) 전용 클라이언트 — 공용 클라이언트의 커넥션을 오래 점유하지 않도록 분리
+_blocking_client = redis.Redis(
+    host=config.REDIS_HOST,
+    port=config.REDIS_PORT,
+    decode_responses=True,
+    max_connections=20,
+)
+
+ShardHandler = Callable[[str, dict], Awaitable[dict]]
+
+
+class ShardCoordinator:
+    """
+    채팅 세션 샤딩 코디네이터.
+    - 채널 ID를 일관된 해싱 링으로 샤드 번호(0..SHARD_COUNT-1)에 배정한다.
+    - 각 워커 프로세스는 Redis 리스로 샤드 하나를 소유하고 하트비트로 연장한다.
+      남는 워커는 대기하다가 리스가 만료된 샤드를 이어받는다.
+    - 다른 샤드가 담당하는 채널에 대한 요청(전송/생성/종료 등)은 그 샤드의 Redis 스트림으로 전달하고 응답을 기다린다.
+    SHARD_COUNT가 1이면 비활성화되어 모든 채널을 이 프로세스가 담당한다.
+    """
+
+    def __init__(self, shard_count: int = config.SHARD_COUNT):
+        self.shard_count = max(1, shard_count)
+        self.enabled = self.shard_count > 1
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.shard_id: Optional[int] = None
+        self._ring = HashRing(range(self.shard_count))
+        self._lease: Optional[RedisLease] = None
+        self._handlers: dict[str, ShardHandler] = {}
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._consumer_task: Optional[asyncio.Task] = None
+        # 전달받은 명령 실행 태스크 (참조 유지) / 채널별 마지막 실행 태스크 (같은 채널 명령은 도착 순서대로 실행)
+        self._tasks: set[asyncio.Task] = set()
+        self._channel_tails: dict[str, asyncio.Task] = {}
+        self._on_acquired: Optional[Callable[[int], Awaitable[None]]] = None
+        self._on_lost: Optional[Callable[[int], Awaitable[None]]] = None
+
+    # --- 소유권 ---
+
+    def shard_for(self, channel_id: str) -> int:
+        return self._ring.node_for(channel_id)
+
+    def owns(self, channel_id: str) -> bool:
+        if not self.enabled:
+            return True
+        return self.shard_id is not None and self.shard_for(channel_id) == self.shard_id
+
+    # --- 명령 등록/호출 ---
+
+    def register(self, op: str, handler: ShardHandler):
+        """샤드 간에 전달 가능한 명령을 등록합니다. handler(channel_id, payload) -> 응답 dict"""
+        self._handlers[op] = handler
+
+    async def call(self, channel_id: str, op: str, payload: Optional[dict] = None) -> dict:
+        """채널을 담당하는 샤드에서 명령을 실행합니다 (이 프로세스 담당이면 바로 실행)."""
+        payload = payload or {}
+        if self.owns(channel_id):
+            return await self._handlers[op](channel_id, payload)
+        return await self._forward(self.shard_for(channel_id), channel_id, op, payload)
+
+    async def _forward(self, shard_id: int, channel_id: str, op: str, payload: dict) -> dict:
+        reply_key = f"shard:reply:{uuid.uuid4().hex}"
+        try:
+            await _blocking_client.xadd(
+                f"shard:commands:{shard_id}",
+                {"op": op, "channel_id": channel_id, "payload": json.dumps(payload), "reply_to": reply_key},
+                maxlen=_STREAM_MAXLEN,
+                approximate=True,
+            )
+            result = await _blocking_client.blpop([reply_key], timeout=config.SHARD_FORWARD_TIMEOUT)
+        except Exception as e:
+            logger.error(f"❌ [Shard] {op} 요청 전달 실패 (shard={shard_id}, channel={channel_id}): {e}")
+            return {"status": "error", "message": f"샤드 {shard_id}로 요청 전달 실패: {e}"}
+
+        if result is None:
+            return {"status": "error", "message": f"샤드 {shard_id}가 응답하지 않습니다."}
+        return json.loads(result[1])
+
+    async def _consume(self, shard_id: int, last_id: str):
+        """이 샤드의 명령 스트림을 last_id 이후부터 읽어 실행하고 응답을 돌려줍니다."""
+        stream = f"shard:commands:{shard_id}"
+        while True:
+            try:
+                entries = await _blocking_client.xread({stream: last_id}, count=50, block=_XREAD_BLOCK_MS)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ [Shard {shard_id}] 명령 스트림 읽기 실패: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            for _, messages in entries or []:
+                for message_id, fields in messages:
+                    last_id = message_id
+                    self._spawn(fields)
+
+    def _spawn(self, fields: dict):
+        """명령 실행 태스크를 만듭니다. 다른 채널 명령과는 동시에, 같은 채널의 이전 명령 뒤에 실행된다."""
+        channel_id = fields.get("channel_id")
+        previous = self._channel_tails.get(channel_id)
+        task = asyncio.create_task(self._execute_after(previous, fields))
+        self._channel_tails[channel_id] = task
+        self._tasks.add(task)
+
+        def _done(t: asyncio.Task):
+            self._tasks.discard(t)
+            if self._channel_tails.get(channel_id) is t:
+                del self._channel_tails[channel_id]
+
+        task.add_done_callback(_done)
+
+    async def _execute_after(self, previous: Optional[asyncio.Task], fields: dict):
+        if previous is not None:
+            # 앞 명령의 성공/실패와 관계없이 끝나기만 기다린다
+            await asyncio.wait([previous])
+        await self._execute(fields)
+
+    async def _execute(self, fields: dict):
+        op = fields.get("op")
+        channel_id = fields.get("channel_id")
+        handler = self._handlers.get(op)
+        try:
+            if handler is None:
+                result = {"status": "error", "message": f"알 수 없는 명령: {op}"}
+            elif not self.owns(channel_id):
+                result = {"status": "error", "message": "이 샤드가 담당하는 채널이 아닙니다."}
+            else:
+                result = await handler(channel_id, json.loads(fields.get("payload") or "{}"))
+        except Exception as e:
+            result = {"status": "error", "message": str(e)}
+
+        reply_key = fields.get("reply_to")
+        if reply_key:
+            try:
+                async with _blocking_client.pipeline(transaction=False) as pipe:
+                    pipe.rpush(reply_key, json.dumps(result, ensure_ascii=False))
+                    pipe.expire(reply_key, _REPLY_TTL)
+                    await pipe.execute()
+            except Exception as e:
+                logger.error(f"❌ [Shard] {op} 응답 전송 실패: {e}")
+
+    # --- 리스/하트비트 ---
+
+    async def start(self, on_acquired: Callable[[int], Awaitable[None]], on_lost: Callable[[int], Awaitable[None]]):
+        """샤드 리스 획득을 시도하고 하트비트를 시작합니다. 획득/상실 시 콜백을 호출합니다."""
+        self._on_acquired = on_acquired
+        self._on_lost = on_lost
+        if not self.enabled:
+            self.shard_id = 0
+            await on_acquired(0)
+            return
+        await self._try_acquire()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    async def _try_acquire(self) -> bool:
+        for shard_id in range(self.shard_count):
+            lease = RedisLease(_blocking_client, f"shard:lease:{shard_id}", self.worker_id, config.SHARD_LEASE_TTL)
+            try:
+                if not await lease.acquire():
+                    continue
+            except Exception as e:
+                logger.error(f"❌ [Shard] 리스 획득 시도 실패: {e}")
+                return False
+
+            # 소유 이전에 쌓인 명령은 요청자가 이미 타임아웃으로 떠났으므로 건너뛴다.
+            # XREAD의 '$'는 첫 호출 시점 기준이라 그 사이 들어온 명령을 놓칠 수 있어, 획득 시점의 마지막 ID를 기준으로 삼는다.
+            try:
+                latest = await _blocking_client.xrevrange(f"shard:commands:{shard_id}", count=1)
+            except Exception as e:
+                logger.error(f"❌ [Shard {shard_id}] 명령 스트림 조회 실패: {e}")
+                await lease.release()
+                return False
+            last_id = latest[0][0] if latest else "0-0"
+
+            self._lease = lease
+            self.shard_id = shard_id
+            logger.info(f"👑 [Shard {shard_id}/{self.shard_count}] 리스 획득 ({self.worker_id})")
+            self._consumer_task = asyncio.create_task(self._consume(shard_id, last_id))
+            try:
+                await self._on_acquired(shard_id)
+            except Exception as e:
+                # 콜백 실패로 하트비트가 멈추면 리스가 조용히 만료되므로 기록만 하고 계속 소유
+                logger.error(f"❌ [Shard {shard_id}] 리스 획득 후 처리 실패: {e}")
+            return True
+        return False
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(config.SHARD_HEARTBEAT_INTERVAL)
+            if self._lease is None:
+                # 대기 중인 워커 — 비어 있는 샤드가 생겼는지 확인
+                await self._try_acquire()
+                continue
+
+            try:
+                renewed = await self._lease.renew()
+            except Exception as e:
+                logger.warning(f"⚠️ [Shard {self.shard_id}] 리스 연장 실패: {e}")
+                renewed = self._lease.held  # 만료 전까지는 계속 소유한 것으로 간주
+            if not renewed:
+                await self._lose_lease()
+
+    async def _lose_lease(self):
+        shard_id = self.shard_id
+        logger.warning(f"💔 [Shard {shard_id}] 리스를 잃었습니다. 담당 채널을 정리합니다.")
+        self._lease = None
+        self.shard_id = None
+        if self._consumer_task is not None:
+            self._consumer_task.cancel()
+            self._consumer_task = None
+        if self._on_lost is not None:
+            try:
+                await self._on_lost(shard_id)
+            except Exception as e:
+                logger.error(f"❌ [Shard {shard_id}] 리스 상실 후 정리 실패: {e}")
+
+    async def stop(self):
+        for task in (self._heartbeat_task, self._consumer_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._heartbeat_task = None
+        self._consumer_task = None
+        for task in list(self._tasks):
+            task.cancel()
+        if self._lease is not None:
+            await self._lease.release()
+            self._lease = None
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "shard_count": self.shard_count,
+            "shard_id": self.shard_id,
+            "worker_id": self.worker_id,
+        }
+
+
+# 모듈 레벨 싱글톤 — 라우터/복구/lifespan이 같은 코디네이터를 공유
+shard_coordinator = ShardCoordinator()
@@ -0,0 +1,68 @@
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+# 알림 cog가 OPEN 감지 시 채운 항목의 유효 시간 — CLOSE 감지로 제거되지만, 감지를 놓친 경우를 위한 안전장치
+COG_ENTRY_TTL = 1800.0
+# 출석 경로에서 채운 항목의 유효 시간 — 알림이 없는 채널은 종료를 감지할 수단이 없으므로 짧게 유지
+ATTENDANCE_ENTRY_TTL = 60.0
+
+
+@dataclass(frozen=True)
+class SessionRef:
+    """StreamSession 행의 경량 스냅샷."""
+    id: int
+    opened_at: datetime
+
+
+@dataclass(frozen=True)
+class ChannelSessions:
+    """채널의 현재 방송 세션과 직전 방송 세션 (연속 출석 판정용)."""
+    current: SessionRef
+    previous: Optional[SessionRef]
+
+    @property
+    def opened_at(self) -> datetime:
+        return self.current.opened_at
+
+    @property
+    def previous_opened_at(self) -> Optional[datetime]:
+        return self.previous.opened_at if self.previous else None
+
+
+class StreamSessionCache:
+    """
+    채널별 현재/직전 StreamSession 캐시.
+    - 알림 cog가 방송 시작(OPEN)을 감지하면 채우고, 종료(CLOSE)를 감지하면 모든 워커에서 제거한다 (캐시 무효화 Pub/Sub).
+    - 출석 시 캐시가 현재 방송(openDate)과 같으면 방송 세션 조회 없이 바로 출석 처리가 가능하다.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, tuple[float, ChannelSessions]] = {}
+
+    def get(self, channel_id: str) -> Optional[ChannelSessions]:
+        entry = self._entries.get(channel_id)
+        if entry is None:
+            return None
+        expires_at, sessions = entry
+        if time.monotonic() > expires_at:
+            self._entries.pop(channel_id, None)
+            return None
+        return sessions
+
+    def set(self, channel_id: str, sessions: ChannelSessions, ttl: float):
+        self._entries[channel_id] = (time.monotonic() + ttl, sessions)
+
+    def invalidate(self, channel_id: str):
+        self._entries.pop(channel_id, None)
+
+    # 캐시 무효화 구독(redis_service)이 LocalTTLCache와 같은 방식으로 다루도록
+    pop = invalidate
+
+    def clear(self):
+        self._entries.clear()
+
+
+# 모듈 레벨 싱글톤 — 알림 cog와 출석 처리가 같은 캐시를 공유
+stream_session_cache = StreamSessionCache()
@@ -1,26 +1,50 @@
+import os
 import time
+import random
+import socket
 import asyncio
 import discord
 from discord.ext import tasks, commands
-import aiohttp
 from dataclasses import dataclass, field
 from typing import List, Optional
-from sqlalchemy import select
+from sqlalchemy import select, update, func
+import app.core.config as config
 from app.core.database import get_session_factory
-from app.db.models import ChzzkNotification as ChzzkNotificationModel
+from app.core.lease import RedisLease
+from app.core.live_status import live_status_service
+from app.core.rate_limit import TokenBucket
+from app.db.models import ChzzkNotification as ChzzkNotificationModel, StreamSession
 from datetime import datetime, timedelta, timezone
-from app.core.chzzk_api import ChzzkAPIClient
-
-_CACHE_TTL = 300.0          # 5분마다 DB 재조회
+from app.core.chzzk_api import chzzk_api
+from app.features.chat.stream_session_cache import stream_session_cache, COG_ENTRY_TTL
+from app.redis.redis_service import redis_client, publish_invalidation
+from app.features.discord_bot.poll_scheduler import KST, HISTORY_DAYS, PollScheduler, StartTimeProfile, poll_interval
+from app.features.discord_bot.notification_state import (
+    OPEN, SUSPECT_CLOSE, CLOSE, CLOSE_CONFIRMATIONS, DebounceStore, Transition, advance, transition_events,
+)
+
+_SYNC_INTERVAL = 30.0        # 30초마다 변경된 설정 행만 DB에서 재조회 (증분 동기화)
+_SYNC_OVERLAP = 60.0         # 늦게 커밋된 변경을 놓치지 않도록 마지막 동기화 시각보다 이만큼 앞부터 조회 (초)
+_FULL_RELOAD_INTERVAL = 3600.0  # 증분 동기화로 알 수 없는 변경(행 직접 삭제 등)에 대비한 전체 재조회 주기
 _OPEN_POLL_INTERVAL = 300.0  # OPEN 채널은 5분마다만 확인
+_TICK_INTERVAL = 5.0         # 폴링 예약 확인 주기 — 채널별 실제 폴링 주기는 PollScheduler가 정한다
+_STATUS_MAX_AGE = _TICK_INTERVAL * 2  # 이보다 최근에 API로 조회된 방송 상태는 다시 요청하지 않고 재사용
+_LEADER_LEASE_KEY = "discord:notifier:leader"  # 폴링/알림을 담당할 인스턴스 하나를 고르는 리스
 
 _active_cog: Optional["ChzzkNotification"] = None
 
 
-def invalidate_notification_cache():
-    """알림 설정이 변경됐을 때 외부(handler.py 등)에서 호출해 캐시를 즉시 만료."""
+def upsert_notification_cache(chzzk_channel_id: str, discord_channel_id: str, streamer_name: Optional[str],
+                              mention_role: Optional[str], last_status: str = "CLOSE"):
+    """알림 설정이 등록/변경됐을 때 외부(handler.py 등)에서 호출해 해당 채널 캐시 항목만 바로 반영."""
+    if _active_cog is not None:
+        _active_cog._upsert_entry(chzzk_channel_id, discord_channel_id, streamer_name, mention_role, last_status)
+
+
+def remove_notification_cache(chzzk_channel_id: str):
+    """알림 설정이 해제됐을 때 외부(handler.py 등)에서 호출해 해당 채널 캐시 항목만 바로 제거."""
     if _active_cog is not None:
-        _active_cog._cache_loaded_at = 0.0
+        _active_cog._remove_entry(chzzk_channel_id)
 
 
 @dataclass
@@ -42,35 +66,67 @@ class _CachedNotification:
     discord_channel_id: str
     streamer_name: str
     mention_role: Optional[str]
-    last_status: str
-    # API가 순간적으로 CLOSE를 잘못 반환하는 경우를 걸러내기 위한 연속 카운터.
-    # 캐시 갱신 시에도 보존된다 (_load_cache 참고).
-    _consecutive_close_count: int = field(default=0, repr=False)
-    # 마지막으로 실제 API를 호출한 시각 (monotonic). OPEN 채널 폴링 간격 제어에 사용.
-    _last_polled_at: float = field(default=0.0, repr=False)
+    last_status: str  # DB에 기록된 확정 상태 (OPEN/CLOSE)
+    # 연속 CLOSE 관측 횟수 — 0보다 크면 SUSPECT_CLOSE. Redis에도 보관해 재시작/리더 교체 후 이어서 판단한다.
+    close_count: int = field(default=0, repr=False)
+    # 마지막으로 API로 확인한 시각 (epoch). Redis에도 보관해 재시작 직후 폴링이 몰리지 않도록 한다.
+    polled_at: float = field(default=0.0, repr=False)
+
+    @property
+    def state(self) -> str:
+        if self.last_status == OPEN and self.close_count:
+            return SUSPECT_CLOSE
+        return self.last_status
 
 
 class ChzzkNotification(commands.Cog):
     def __init__(self, bot):
         global _active_cog
         self.bot = bot
-        self.session = None
-        self.chzzk_client = ChzzkAPIClient()
         self._cache: dict[str, _CachedNotification] = {}
-        self._cache_loaded_at: float = 0.0
+        self._full_loaded_at: float = 0.0
+        self._synced_at: float = 0.0
+        # 증분 동기화 기준 — 지금까지 반영한 설정 행의 updated_at 최댓값
+        self._watermark: Optional[datetime] = None
+        # 여러 인스턴스가 봇을 띄워도 리스를 가진 리더만 폴링/알림 — 펜싱 토큰으로 이전 리더의 늦은 DB 쓰기를 거부
+        self._lease = RedisLease(
+            redis_client,
+            _LEADER_LEASE_KEY,
+            f"{socket.gethostname()}:{os.getpid()}",
+            config.NOTIFIER_LEASE_TTL,
+            fencing=True,
+        )
+        self._is_leader = False
+        # 채널별 다음 폴링 시각 (과거 방송 시작 시각으로 주기를 정함) + 전체 요청 속도 제한
+        self._scheduler = PollScheduler()
+        self._profiles: dict[str, StartTimeProfile] = {}
+        self._poll_budget = TokenBucket(rate=config.NOTIFIER_POLL_RATE_PER_SEC, capacity=config.NOTIFIER_POLL_BURST)
+        self._debounce = DebounceStore(redis_client)
         _active_cog = self
+        # 상태 전이(방송 시작 확정 등)는 이벤트로 받아 처리
+        transition_events.subscribe(self._on_transition)
+        # 다른 경로(출석 등)에서 먼저 발견한 방송 상태 변화를 받아 해당 채널을 바로 확인
+        live_status_service.subscribe(self._on_live_status_change)
+        self.leader_heartbeat.start()
         self.check_chzzk.start()
 
-    def cog_unload(self):
+    async def cog_unload(self):
         global _active_cog
         self.check_chzzk.cancel()
-        if self.session:
-            asyncio.create_task(self.session.close())
-        if self.chzzk_client:
-            asyncio.create_task(self.chzzk_client.close())
+        self.leader_heartbeat.cancel()
+        live_status_service.unsubscribe(self._on_live_status_change)
+        transition_events.unsubscribe(self._on_transition)
+        if self._is_leader:
+            self._is_leader = False
+            # 리스를 바로 반납해 대기 중인 인스턴스가 TTL 만료를 기다리지 않고 이어받도록
+            try:
+                await self._lease.release()
+            except Exception as e:
+                print(f"⚠️ [ChzzkNotification] 리더 리스 반납 실패: {e}")
         _active_cog = None
 
     async def _load_cache(self):
+        """활성 알림 설정 전체를 다시 읽습니다 (시작/리더 선출 직후, 이후에는 안전장치로 가끔)."""
         factory = get_session_factory()
         if not factory:
             return
@@ -80,52 +136,287 @@ class ChzzkNotification(commands.Cog):
                 stmt = select(ChzzkNotificationModel).where(ChzzkNotificationModel.is_active == True)
                 result = await db.execute(stmt)
                 notifications = result.scalars().all()
+                watermark = (await db.execute(select(func.max(ChzzkNotificationModel.updated_at)))).scalar()
 
-                new_cache = {
-                    n.chzzk_channel_id: _CachedNotification(
-                        chzzk_channel_id=n.chzzk_channel_id,
-                        discord_channel_id=n.discord_channel_id,
-                        streamer_name=n.streamer_name,
-                        mention_role=getattr(n, "mention_role", None),
-                        last_status=n.last_status,
-                    )
-                    for n in notifications
-                }
+                new_cache = {n.chzzk_channel_id: self._entry_from_row(n) for n in notifications}
 
                 # 캐시 갱신 시 인메모리 상태 유지 (갱신으로 카운터/타이머가 리셋되지 않도록)
+                fresh = []
                 for chzzk_id, new_entry in new_cache.items():
                     if chzzk_id in self._cache:
                         old = self._cache[chzzk_id]
-                        new_entry._consecutive_close_count = old._consecutive_close_count
-                        new_entry._last_polled_at = old._last_polled_at
+                        new_entry.close_count = old.close_count
+                        new_entry.polled_at = old.polled_at
+                    else:
+                        fresh.append(chzzk_id)
+                await self._restore_debounce(new_cache, fresh)
 
                 self._cache = new_cache
-                self._cache_loaded_at = time.monotonic()
+                self._watermark = watermark
+                self._profiles = {}
+                await self._load_profiles(db, list(new_cache))
+                self._sync_schedule()
                 print(f"✅ [ChzzkNotification] 캐시 로드 완료: {len(self._cache)}개")
         except Exception as e:
             print(f"🚨 [ChzzkNotification] 캐시 로드 실패: {e}")
-            # 실패해도 TTL 적용 — DB를 매 틱마다 재시도하지 않도록
-            self._cache_loaded_at = time.monotonic()
+            # 실패해도 주기 적용 — DB를 매 틱마다 재시도하지 않도록
+            self._full_loaded_at = self._synced_at = time.monotonic()
+            return
+
+        self._full_loaded_at = self._synced_at = time.monotonic()
+        await self._prefetch_channel_info(fresh)
+
+    async def _sync_changes(self):
+        """마지막 동기화 이후 updated_at이 바뀐 설정 행만 읽어 캐시 항목을 추가/갱신/제거합니다."""
+        factory = get_session_factory()
+        if not factory:
+            return
+        self._synced_at = time.monotonic()
+        if self._watermark is None:
+            # 아직 설정 행이 하나도 없던 경우 — 전체 재조회로 기준을 잡는다
+            self._full_loaded_at = 0.0
+            return
+
+        try:
+            async with factory() as db:
+                since = self._watermark - timedelta(seconds=_SYNC_OVERLAP)
+                stmt = select(ChzzkNotificationModel).where(ChzzkNotificationModel.updated_at >= since)
+                changed = (await db.execute(stmt)).scalars().all()
+                if not changed:
+                    return
+
+                added = []
+                for n in changed:
+                    if not n.is_active:
+                        self._remove_entry(n.chzzk_channel_id)
+                        continue
+                    if n.chzzk_channel_id not in self._cache:
+                        added.append(n.chzzk_channel_id)
+                    self._upsert_entry(n.chzzk_channel_id, n.discord_channel_id, n.streamer_name,
+                                       getattr(n, "mention_role", None), n.last_status)
+                self._watermark = max(self._watermark, max(n.updated_at for n in changed))
+
+                if added:
+                    await self._restore_debounce(self._cache, added)
+                missing_profiles = [cid for cid in self._cache if cid not in self._profiles]
+                if missing_profiles:
+                    await self._load_profiles(db, missing_profiles)
+        except Exception as e:
+            print(f"🚨 [ChzzkNotification] 설정 증분 동기화 실패: {e}")
+            return
+
+        if added:
+            print(f"✅ [ChzzkNotification] 새 알림 설정 {len(added)}개 반영 (총 {len(self._cache)}개)")
+            await self._prefetch_channel_info(added)
+
+    @staticmethod
+    def _entry_from_row(n) -> _CachedNotification:
+        return _CachedNotification(
+            chzzk_channel_id=n.chzzk_channel_id,
+            discord_channel_id=n.discord_channel_id,
+            streamer_name=n.streamer_name,
+            mention_role=getattr(n, "mention_role", None),
+            last_status=n.last_status,
+        )
 
-    @tasks.loop(seconds=30.0)
+    async def _restore_debounce(self, cache: dict[str, _CachedNotification], channel_ids: list[str]):
+        # 처음 보는 채널(재시작/리더 교체 직후 포함)은 Redis에 보관된 디바운스 상태로 이어서 시작
+        try:
+            saved = await self._debounce.load(channel_ids)
+        except Exception as e:
+            print(f"⚠️ [ChzzkNotification] 디바운스 상태 조회 실패: {e}")
+            return
+        for chzzk_id, (close_count, polled_at) in saved.items():
+            entry = cache[chzzk_id]
+            entry.close_count = close_count if entry.last_status == OPEN else 0
+            entry.polled_at = polled_at
+
+    def _upsert_entry(self, chzzk_id: str, discord_channel_id: str, streamer_name: Optional[str],
+                      mention_role: Optional[str], last_status: str):
+        """캐시 항목 하나를 추가하거나 표시 정보만 갱신합니다 (방송 상태/디바운스 상태는 이 cog가 관리하므로 유지)."""
+        entry = self._cache.get(chzzk_id)
+        if entry is None:
+            self._cache[chzzk_id] = _CachedNotification(
+                chzzk_channel_id=chzzk_id,
+                discord_channel_id=discord_channel_id,
+                streamer_name=streamer_name,
+                mention_role=mention_role,
+                last_status=last_status,
+            )
+            # 처리 중인 다른 채널의 예약은 건드리지 않도록 새 채널만 예약 (첫 폴링 시각은 흩어 둔다)
+            self._scheduler.schedule(chzzk_id, time.monotonic() + random.uniform(0, config.NOTIFIER_POLL_MIN_INTERVAL))
+            return
+        entry.discord_channel_id = discord_channel_id
+        entry.streamer_name = streamer_name or entry.streamer_name
+        entry.mention_role = mention_role
+
+    def _remove_entry(self, chzzk_id: str):
+        if self._cache.pop(chzzk_id, None) is not None:
+            self._scheduler.remove(chzzk_id)
+            self._profiles.pop(chzzk_id, None)
+
+    async def _prefetch_channel_info(self, channel_ids: list[str]):
+        """채널 정보를 묶음 요청 몇 번으로 미리 받아 둡니다 (방송 시작 알림 시 채널별 조회 생략)."""
+        if not channel_ids:
+            return
+        infos = await chzzk_api.get_channels_info(channel_ids)
+        for chzzk_id in channel_ids:
+            entry = self._cache.get(chzzk_id)
+            # 표시용 이름이 비어 있으면 치지직 채널 이름으로 채운다
+            if entry is not None and not entry.streamer_name:
+                entry.streamer_name = infos.get(chzzk_id, {}).get("channelName") or entry.streamer_name
+
+    @property
+    def is_leader(self) -> bool:
+        # Redis 장애로 연장 여부를 모를 때는 리스 유효 시간이 지나기 전까지만 리더로 간주
+        return self._is_leader and self._lease.held
+
+    @tasks.loop(seconds=config.NOTIFIER_HEARTBEAT_INTERVAL)
+    async def leader_heartbeat(self):
+        """리더면 리스를 연장하고, 대기 중이면 리스 획득을 시도합니다."""
+        if not self._is_leader:
+            try:
+                acquired = await self._lease.acquire()
+            except Exception as e:
+                print(f"🚨 [ChzzkNotification] 리더 리스 획득 시도 실패: {e}")
+                return
+            if acquired:
+                await self._become_leader()
+            return
+
+        try:
+            renewed = await self._lease.renew()
+        except Exception as e:
+            print(f"⚠️ [ChzzkNotification] 리더 리스 연장 실패: {e}")
+            renewed = self._lease.held
+        if not renewed:
+            self._is_leader = False
+            print("💔 [ChzzkNotification] 리더 리스를 잃었습니다. 폴링을 중단합니다.")
+
+    async def _become_leader(self):
+        token = self._lease.token
+        self._is_leader = True
+        # 이전 리더가 바꿔 둔 상태를 반영하도록 캐시를 DB에서 새로 읽는다
+        self._cache = {}
+        self._full_loaded_at = 0.0
+        self._scheduler.clear()
+        print(f"👑 [ChzzkNotification] 알림 리더로 선출됨 (fence={token})")
+
+        # 새 토큰을 모든 설정 행에 먼저 기록 — 이후 이전 리더의 늦은 쓰기는 행마다 조건부 UPDATE에서 거부된다
+        factory = get_session_factory()
+        if not factory:
+            return
+        try:
+            async with factory() as db:
+                await db.execute(
+                    update(ChzzkNotificationModel)
+                    .where(ChzzkNotificationModel.notifier_fence < token)
+                    .values(notifier_fence=token)
+                )
+                await db.commit()
+        except Exception as e:
+            # 실패해도 상태 변경 시 행 단위 펜싱은 그대로 적용된다
+            print(f"⚠️ [ChzzkNotification] 펜싱 토큰 기록 실패: {e}")
+
+    @leader_heartbeat.before_loop
+    async def before_leader_heartbeat(self):
+        # 준비되지 않은 인스턴스가 리더가 되어 폴링이 멈추지 않도록 봇 준비 후 선출에 참여
+        await self.bot.wait_until_ready()
+
+    async def _load_profiles(self, db, channel_ids: list[str]):
+        """채널별 최근 방송 시작 시각과 마지막 방송 시각을 읽어 폴링 주기 계산용 프로필을 만듭니다."""
+        if not channel_ids:
+            return
+
+        since = datetime.now(KST) - timedelta(days=HISTORY_DAYS)
+        starts: dict[str, list[datetime]] = {cid: [] for cid in channel_ids}
+        stmt = select(StreamSession.chzzk_channel_id, StreamSession.opened_at).where(
+            StreamSession.chzzk_channel_id.in_(channel_ids),
+            StreamSession.opened_at >= since,
+        )
+        for cid, opened_at in (await db.execute(stmt)).all():
+            starts[cid].append(opened_at)
+
+        stmt = (
+            select(StreamSession.chzzk_channel_id, func.max(StreamSession.opened_at))
+            .where(StreamSession.chzzk_channel_id.in_(channel_ids))
+            .group_by(StreamSession.chzzk_channel_id)
+        )
+        last_opened = dict((await db.execute(stmt)).all())
+
+        for cid in channel_ids:
+            self._profiles[cid] = StartTimeProfile(starts[cid], last_opened.get(cid))
+
+    def _sync_schedule(self):
+        """캐시에 새로 생긴 채널은 폴링을 예약하고, 사라진 채널은 예약에서 뺍니다."""
+        now = time.monotonic()
+        for chzzk_id, entry in self._cache.items():
+            if chzzk_id in self._scheduler:
+                continue
+            # 최근에 확인한 채널은 남은 주기만큼 기다리고, 나머지는 첫 폴링 시각을 흩어 요청이 몰리지 않도록
+            remaining = self._next_delay(entry) - (time.time() - entry.polled_at) if entry.polled_at else 0.0
+            if remaining <= 0:
+                remaining = random.uniform(0, config.NOTIFIER_POLL_MIN_INTERVAL)
+            self._scheduler.schedule(chzzk_id, now + remaining)
+        for chzzk_id in self._scheduler:
+            if chzzk_id not in self._cache:
+                self._scheduler.remove(chzzk_id)
+
+    def _next_delay(self, entry: _CachedNotification) -> float:
+        state = entry.state
+        if state == SUSPECT_CLOSE:
+            return config.NOTIFIER_POLL_MIN_INTERVAL  # 종료 의심 중이면 빨리 재확인
+        if state == OPEN:
+            return _OPEN_POLL_INTERVAL  # 방송 중 채널은 5분마다만 확인
+        return poll_interval(self._profiles.get(entry.chzzk_channel_id), datetime.now(KST))
+
+    def _reschedule(self, entry: _CachedNotification):
+        chzzk_id = entry.chzzk_channel_id
+        if self._cache.get(chzzk_id) is not entry:
+            return  # 캐시 갱신으로 교체/삭제된 항목 — 새 항목은 _sync_schedule이 예약
+        self._scheduler.schedule(chzzk_id, time.monotonic() + self._next_delay(entry))
+
+    def _on_live_status_change(self, chzzk_id: str, status: str, content: dict):
+        entry = self._cache.get(chzzk_id)
+        if not self.is_leader or entry is None or entry.state == status or chzzk_id not in self._scheduler:
+            return
+        # 다음 틱에 확인 — 방금 조회된 상태를 재사용하므로 추가 API 요청은 없다
+        self._scheduler.schedule(chzzk_id, time.monotonic())
+
+    @tasks.loop(seconds=_TICK_INTERVAL)
     async def check_chzzk(self):
-        print("👀 [ChzzkNotification] 방송 상태 체크 중... (30s interval)")
+        if not self.is_leader:
+            return
+
         try:
-            if time.monotonic() - self._cache_loaded_at > _CACHE_TTL:
+            now = time.monotonic()
+            if now - self._full_loaded_at > _FULL_RELOAD_INTERVAL:
                 await self._load_cache()
+            elif now - self._synced_at > _SYNC_INTERVAL:
+                await self._sync_changes()
 
             if not self._cache:
                 return
 
-            # 채널 수가 늘어도 30초 주기를 지킬 수 있도록 병렬 처리 (최대 5개 동시 요청)
+            # 예약 시각이 된 채널만, 전체 속도 제한 안에서 꺼낸다 (못 꺼낸 채널은 다음 틱으로 밀림)
+            due = self._scheduler.pop_due(time.monotonic(), int(self._poll_budget.available))
+            if not due:
+                return
+            print(f"👀 [ChzzkNotification] 방송 상태 체크 중... ({len(due)}/{len(self._cache)}개 채널)")
+
+            # 최대 5개 동시 요청
             sem = asyncio.Semaphore(5)
 
             async def bounded(entry: _CachedNotification):
                 async with sem:
-                    await self.process_notification(entry)
+                    self._poll_budget.try_acquire()
+                    try:
+                        await self.process_notification(entry)
+                    finally:
+                        self._reschedule(entry)
 
             await asyncio.gather(
-                *[bounded(e) for e in self._cache.values()],
+                *[bounded(self._cache[cid]) for cid in due if cid in self._cache],
                 return_exceptions=True,
             )
 
@@ -134,114 +425,137 @@ class ChzzkNotification(commands.Cog):
 
     async def process_notification(self, entry: _CachedNotification):
         chzzk_id = entry.chzzk_channel_id
-        last_status = entry.last_status
+        previous = entry.state
 
-        # OPEN 채널은 5분마다만 확인 — 이미 방송 중인 채널에 불필요한 API 요청 방지
-        if last_status == "OPEN" and time.monotonic() - entry._last_polled_at < _OPEN_POLL_INTERVAL:
-            return
-
-        print(f"[ChzzkNotification] 채널 확인 중: {chzzk_id} (Last: {last_status})")
-        entry._last_polled_at = time.monotonic()
-
-        status_url = f"https://api.chzzk.naver.com/polling/v2/channels/{chzzk_id}/live-status"
+        print(f"[ChzzkNotification] 채널 확인 중: {chzzk_id} (State: {previous})")
 
         try:
-            content = {}
-            current_status = None
-            async with self.session.get(status_url, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                if response.status != 200:
-                    print(f"[ChzzkNotification] Status API 에러 {chzzk_id} - 상태코드: {response.status}")
-                    return
-
-                data = await response.json()
-                content = data.get("content") or {}
-                current_status = content.get("status")
+            # 공용 방송 상태 서비스로 조회 — 출석 경로와 HTTP 클라이언트/캐시를 공유하고 동시 요청은 하나로 합친다
+            content = await live_status_service.get(chzzk_id, max_age=_STATUS_MAX_AGE)
+            if content is None:
+                print(f"[ChzzkNotification] Status API 에러 {chzzk_id}")
+                return
+            observed = content.get("status")
 
-            if current_status not in ("OPEN", "CLOSE"):
-                print(f"[ChzzkNotification] ⚠️ 알 수 없는 상태값: {chzzk_id} = {current_status}")
+            if observed not in (OPEN, CLOSE):
+                print(f"[ChzzkNotification] ⚠️ 알 수 없는 상태값: {chzzk_id} = {observed}")
                 return
 
-            print(f"[ChzzkNotification] {chzzk_id} 현재 상태: {current_status}")
-
-            if current_status == "OPEN":
-                entry._consecutive_close_count = 0
-                if last_status == "CLOSE":
-                    print(f"[ChzzkNotification] 🟢 방송 시작 감지! {chzzk_id}")
-
-                    channel_info = await self.chzzk_client.get_channel_info(chzzk_id) or {}
-                    live_data = LiveNotificationData(
-                        channel_id=chzzk_id,
-                        streamer_name=entry.streamer_name,
-                        live_title=content.get("liveTitle", ""),
-                        category=content.get("liveCategoryValue", "") or content.get("liveCategory", ""),
-                        tags=content.get("tags", []),
-                        thumbnail_url=content.get("liveImageUrl"),
-                        channel_image_url=channel_info.get("channelImageUrl"),
-                        open_date=content.get("openDate"),
-                    )
+            entry.polled_at = time.time()
+            state, close_count = advance(previous, observed, entry.close_count)
 
-                    # DB를 먼저 갱신 — 실패 시 알림 발송 스킵해 재시작 후 중복 알림 방지
-                    if await self._update_status_in_db(chzzk_id, "OPEN", update_time=True, content=content):
-                        entry.last_status = "OPEN"
-                        await self.send_live_notification(entry, live_data)
-                    else:
-                        print(f"[ChzzkNotification] ⚠️ DB 업데이트 실패, 알림 발송 스킵: {chzzk_id}")
-
-            elif current_status == "CLOSE" and last_status == "OPEN":
-                # API가 일시적으로 CLOSE를 반환하는 경우를 걸러낸다.
-                # 2회 연속 CLOSE일 때만 실제 종료로 처리한다 (약 30~60초 딜레이).
-                entry._consecutive_close_count += 1
-                if entry._consecutive_close_count >= 2:
-                    print(f"[ChzzkNotification] 🔴 방송 종료 확정! {chzzk_id}")
-                    if await self._update_status_in_db(chzzk_id, "CLOSE", update_time=False):
-                        entry.last_status = "CLOSE"
-                        entry._consecutive_close_count = 0
-                else:
-                    print(f"[ChzzkNotification] 🟡 방송 종료 의심 ({entry._consecutive_close_count}/2): {chzzk_id}")
+            # DB에는 확정 상태(OPEN/CLOSE)가 바뀔 때만 기록 — SUSPECT_CLOSE는 Redis 디바운스 상태로만 관리
+            persisted = OPEN if state == SUSPECT_CLOSE else state
+            if persisted != entry.last_status:
+                # DB를 먼저 갱신 — 실패 시 전이를 보류해 다음 확인 때 다시 시도 (알림 중복/누락 방지)
+                if not await self._update_status_in_db(chzzk_id, persisted, update_time=persisted == OPEN, content=content):
+                    print(f"[ChzzkNotification] ⚠️ DB 업데이트 실패, 상태 전이 보류: {chzzk_id} {previous} -> {state}")
+                    return
+                entry.last_status = persisted
+            entry.close_count = close_count
+            await self._save_debounce(entry)
+
+            if state != previous:
+                await transition_events.emit(Transition(chzzk_id, previous, state, content), redis_client)
 
         except Exception as e:
             print(f"[ChzzkNotification] 에러 {chzzk_id}: {e}")
 
+    async def _save_debounce(self, entry: _CachedNotification):
+        try:
+            await self._debounce.save(entry.chzzk_channel_id, entry.close_count, entry.polled_at)
+        except Exception as e:
+            print(f"⚠️ [ChzzkNotification] 디바운스 상태 저장 실패 {entry.chzzk_channel_id}: {e}")
+
+    async def _on_transition(self, transition: Transition):
+        chzzk_id = transition.channel_id
+        entry = self._cache.get(chzzk_id)
+        if entry is None:
+            return
+
+        if transition.current == SUSPECT_CLOSE:
+            print(f"[ChzzkNotification] 🟡 방송 종료 의심 ({entry.close_count}/{CLOSE_CONFIRMATIONS}): {chzzk_id}")
+        elif transition.current == CLOSE:
+            print(f"[ChzzkNotification] 🔴 방송 종료 확정! {chzzk_id}")
+        elif transition.previous == CLOSE:
+            print(f"[ChzzkNotification] 🟢 방송 시작 감지! {chzzk_id}")
+            self._profiles.setdefault(chzzk_id, StartTimeProfile()).add(datetime.now(KST))
+
+            content = transition.content
+            channel_info = await chzzk_api.get_channel_info(chzzk_id) or {}
+            live_data = LiveNotificationData(
+                channel_id=chzzk_id,
+                streamer_name=entry.streamer_name,
+                live_title=content.get("liveTitle", ""),
+                category=content.get("liveCategoryValue", "") or content.get("liveCategory", ""),
+                tags=content.get("tags", []),
+                thumbnail_url=content.get("liveImageUrl"),
+                channel_image_url=channel_info.get("channelImageUrl"),
+                open_date=content.get("openDate"),
+            )
+            await self.send_live_notification(entry, live_data)
+
     async def _update_status_in_db(self, chzzk_id: str, status: str, update_time: bool, content: dict = None) -> bool:
-        """상태가 실제로 바뀔 때만 호출 — DB 세션을 자체적으로 관리. 성공 여부 반환."""
+        """
+        확정 상태가 실제로 바뀔 때만 호출 — DB 세션을 자체적으로 관리. 성공 여부 반환.
+        알림 설정 행은 UPDATE ... RETURNING 한 번으로 기록한다.
+        리더의 펜싱 토큰이 행에 기록된 토큰보다 작으면(더 새로운 리더가 있으면) 쓰지 않고 False를 반환한다.
+        """
         factory = get_session_factory()
-        if not factory:
+        if not factory or not self.is_leader:
             return False
+        token = self._lease.token
 
         try:
             async with factory() as db:
-                stmt = select(ChzzkNotificationModel).where(ChzzkNotificationModel.chzzk_channel_id == chzzk_id)
-                setting = (await db.execute(stmt)).scalar_one_or_none()
-                if not setting:
-                    return False
-
-                setting.last_status = status
+                values = {"last_status": status, "notifier_fence": token}
                 if update_time:
                     kst = timezone(timedelta(hours=9))
-                    setting.last_notified_at = datetime.now(kst)
+                    values["last_notified_at"] = datetime.now(kst)
 
-                # 방송 시작 시 스트림 세션 동기화
-                if status == "OPEN" and content:
-                    from app.features.chat.service import ChatService
-                    await ChatService(db).sync_stream_session(chzzk_id)
+                stmt = (
+                    update(ChzzkNotificationModel)
+                    .where(
+                        ChzzkNotificationModel.chzzk_channel_id == chzzk_id,
+                        ChzzkNotificationModel.notifier_fence <= token,
+                    )
+                    .values(**values)
+                    .returning(ChzzkNotificationModel.id)
+                )
+                if (await db.execute(stmt)).first() is None:
+                    print(f"[ChzzkNotification] ⚠️ 상태 기록 거부 (설정 없음 또는 더 새로운 리더 존재, fence={token}): {chzzk_id}")
+                    return False
 
-                # 방송 종료 시 세션 종료 시각 기록
-                if status == "CLOSE":
-                    from app.db.models import StreamSession
-                    stmt2 = (
-                        select(StreamSession)
+                # 방송 시작 시 스트림 세션 동기화 후 현재/직전 세션을 캐싱 — 방송 시작 직후 몰리는 출석에서 세션 조회 생략
+                if status == OPEN and content:
+                    from app.features.chat.service import ChatService
+                    chat_service = ChatService(db)
+                    current_session = await chat_service.sync_stream_session(chzzk_id)
+                    if current_session:
+                        await chat_service.cache_stream_sessions(chzzk_id, current_session, COG_ENTRY_TTL)
+
+                # 방송 종료 시 가장 최근 열린 세션의 종료 시각 기록 (UPDATE 한 번)
+                if status == CLOSE:
+                    latest_open = (
+                        select(StreamSession.id)
                         .where(
                             StreamSession.chzzk_channel_id == chzzk_id,
                             StreamSession.closed_at.is_(None),
                         )
                         .order_by(StreamSession.opened_at.desc())
                         .limit(1)
+                        .scalar_subquery()
+                    )
+                    await db.execute(
+                        update(StreamSession)
+                        .where(StreamSession.id == latest_open)
+                        .values(closed_at=datetime.now(timezone(timedelta(hours=9))))
                     )
-                    latest = (await db.execute(stmt2)).scalar_one_or_none()
-                    if latest:
-                        latest.closed_at = datetime.now(timezone(timedelta(hours=9)))
 
                 await db.commit()
+                if status == CLOSE:
+                    # 이 프로세스뿐 아니라 다른 워커의 출석용 방송 세션 캐시도 비운다
+                    await publish_invalidation("stream_session", chzzk_id)
                 print(f"[ChzzkNotification] DB 상태 업데이트 완료: {chzzk_id} -> {status}")
                 return True
         except Exception as e:
@@ -290,4 +604,3 @@ class ChzzkNotification(commands.Cog):
     @check_chzzk.before_loop
     async def before_check(self):
         await self.bot.wait_until_ready()
-        self.session = aiohttp.ClientSession()
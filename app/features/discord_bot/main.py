@@ -20,6 +20,10 @@ async def start_discord_bot(token: str):
         # discord.py 내부 통신 로그 켜기
         discord.utils.setup_logging(level=logging.INFO)
 
+        # 샤드를 잃었다가 다시 얻은 경우 — 닫힌 봇의 내부 상태를 비워 재시작
+        if bot.is_closed():
+            bot.clear()
+
         await bot.add_cog(ChzzkNotification(bot))
         
         print("⏳ [Discord] 서버로 연결 시도 중...")
@@ -28,6 +32,12 @@ async def start_discord_bot(token: str):
     except Exception as e:
         print(f"🚨 [Discord] 봇 실행 중 치명적 에러 발생: {e}")
 
+async def stop_discord_bot():
+    """봇 연결을 끊고 cog를 내립니다. (이후 start_discord_bot으로 다시 시작 가능)"""
+    # cog_unload에서 폴링 루프 중지 및 리더 리스 반납
+    await bot.remove_cog(ChzzkNotification.__name__)
+    await bot.close()
+
 if __name__ == "__main__":
     if discord_token:
         bot.run(discord_token)
@@ -0,0 +1,119 @@
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Iterable
+
+OPEN = "OPEN"
+SUSPECT_CLOSE = "SUSPECT_CLOSE"
+CLOSE = "CLOSE"
+
+# API가 순간적으로 CLOSE를 잘못 반환하는 경우를 걸러내기 위해 연속으로 이만큼 CLOSE가 관측돼야 종료로 확정
+CLOSE_CONFIRMATIONS = 2
+
+# 디바운스 상태 (Redis 해시, 필드는 치지직 채널 ID) — 재시작/리더 교체 후에도 이어서 판단하도록 보관
+_CLOSE_COUNT_KEY = "notifier:close_count"  # 연속 CLOSE 관측 횟수
+_POLLED_AT_KEY = "notifier:polled_at"      # 마지막 API 확인 시각 (epoch 초)
+# 상태 전이 이벤트를 다른 워커/서브시스템에 알리는 Pub/Sub 채널
+TRANSITION_CHANNEL = "notifier:transitions"
+
+
+def advance(state: str, observed: str, close_count: int) -> tuple[str, int]:
+    """
+    현재 상태와 이번에 관측한 방송 상태(OPEN/CLOSE)로 다음 상태와 연속 CLOSE 횟수를 계산합니다.
+    OPEN → (CLOSE 관측) → SUSPECT_CLOSE → (CLOSE 관측 CLOSE_CONFIRMATIONS회) → CLOSE
+    SUSPECT_CLOSE에서 OPEN이 관측되면 종료가 아니었던 것으로 보고 OPEN으로 돌아간다.
+    """
+    if observed == OPEN:
+        return OPEN, 0
+    if state == CLOSE:
+        return CLOSE, 0
+    close_count += 1
+    if close_count >= CLOSE_CONFIRMATIONS:
+        return CLOSE, 0
+    return SUSPECT_CLOSE, close_count
+
+
+@dataclass(frozen=True)
+class Transition:
+    """채널 하나의 알림 상태 전이."""
+    channel_id: str
+    previous: str
+    current: str
+    content: dict = field(default_factory=dict, repr=False)  # 전이를 일으킨 live-status 응답
+    at: float = field(default_factory=time.time)
+
+
+TransitionCallback = Callable[[Transition], Awaitable[None]]
+
+
+class TransitionEvents:
+    """
+    상태 전이 이벤트 발행기.
+    - 프로세스 내 구독자를 등록 순서대로 호출하고 (한 구독자의 예외가 다른 구독자를 막지 않음)
+    - TRANSITION_CHANNEL로 발행해 다른 워커/서브시스템도 받을 수 있게 한다.
+    """
+
+    def __init__(self):
+        self._subscribers: list[TransitionCallback] = []
+
+    def subscribe(self, callback: TransitionCallback):
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: TransitionCallback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    async def emit(self, transition: Transition, redis_client=None):
+        for callback in list(self._subscribers):
+            try:
+                await callback(transition)
+            except Exception as e:
+                print(f"🚨 [NotificationState] 전이 이벤트 처리 실패 {transition.channel_id}: {e}")
+
+        if redis_client is None:
+            return
+        message = {
+            "channel_id": transition.channel_id,
+            "previous": transition.previous,
+            "current": transition.current,
+            "at": transition.at,
+        }
+        try:
+            await redis_client.publish(TRANSITION_CHANNEL, json.dumps(message))
+        except Exception as e:
+            print(f"⚠️ [NotificationState] 전이 이벤트 발행 실패: {e}")
+
+
+class DebounceStore:
+    """채널별 연속 CLOSE 횟수와 마지막 확인 시각을 Redis 해시에 보관합니다."""
+
+    def __init__(self, redis_client):
+        self._redis = redis_client
+
+    async def load(self, channel_ids: Iterable[str]) -> dict[str, tuple[int, float]]:
+        """{channel_id: (연속 CLOSE 횟수, 마지막 확인 시각)} — 기록이 없으면 (0, 0.0)."""
+        channel_ids = list(channel_ids)
+        if not channel_ids:
+            return {}
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hmget(_CLOSE_COUNT_KEY, channel_ids)
+            pipe.hmget(_POLLED_AT_KEY, channel_ids)
+            counts, polled = await pipe.execute()
+        return {
+            cid: (int(count or 0), float(polled_at or 0.0))
+            for cid, count, polled_at in zip(channel_ids, counts, polled)
+        }
+
+    async def save(self, channel_id: str, close_count: int, polled_at: float):
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hset(_POLLED_AT_KEY, channel_id, polled_at)
+            if close_count:
+                pipe.hset(_CLOSE_COUNT_KEY, channel_id, close_count)
+            else:
+                pipe.hdel(_CLOSE_COUNT_KEY, channel_id)
+            await pipe.execute()
+
+
+# 모듈 레벨 싱글톤 — 알림 cog가 발행하고, 다른 모듈이 구독
+transition_events = TransitionEvents()
@@ -0,0 +1,133 @@
+import heapq
+import itertools
+import random
+from bisect import insort
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+import app.core.config as config
+
+KST = timezone(timedelta(hours=9))
+
+_WEEK_MINUTES = 7 * 24 * 60
+# 방송 기록을 참고할 기간 (일)
+HISTORY_DAYS = 56
+# 평소 시작 시각 앞뒤로 이 범위(분) 안이면 빠르게 폴링
+_HOT_WINDOW_MINUTES = 45
+# 지난 주들 중 이 비율 이상 같은 요일·시간대에 방송을 시작했으면 "평소 시작 시각"으로 본다
+_HOT_THRESHOLD = 0.25
+# 폴링 시각이 한꺼번에 몰리지 않도록 주기에 섞는 지터 비율
+_JITTER = 0.1
+
+
+def _minute_of_week(t: datetime) -> int:
+    t = t.astimezone(KST)
+    return (t.weekday() * 24 + t.hour) * 60 + t.minute
+
+
+class StartTimeProfile:
+    """채널의 과거 방송 시작 시각을 요일·분 단위로 모아 둔 프로필."""
+
+    __slots__ = ("_starts", "_first", "last_opened")
+
+    def __init__(self, opened_at: Iterable[datetime] = (), last_opened: Optional[datetime] = None):
+        times = sorted(opened_at)
+        self._starts = sorted(_minute_of_week(t) for t in times)
+        self._first = times[0] if times else None
+        # 기록 기간 밖의 마지막 방송 시각도 받을 수 있도록 별도로 받는다
+        self.last_opened = max(filter(None, [last_opened, times[-1] if times else None]), default=None)
+
+    def add(self, opened_at: datetime):
+        """새로 감지한 방송 시작을 반영합니다."""
+        insort(self._starts, _minute_of_week(opened_at))
+        if self._first is None:
+            self._first = opened_at
+        if self.last_opened is None or opened_at > self.last_opened:
+            self.last_opened = opened_at
+
+    def likelihood(self, now: datetime) -> float:
+        """지금 시각(요일·시간대) 앞뒤로 방송을 시작한 주의 비율 (대략적인 시작 확률)."""
+        if not self._starts:
+            return 0.0
+        weeks = min(max((now - self._first).days / 7, 1.0), HISTORY_DAYS / 7)
+        current = _minute_of_week(now)
+        hits = 0
+        for minute in self._starts:
+            distance = abs(minute - current)
+            if min(distance, _WEEK_MINUTES - distance) <= _HOT_WINDOW_MINUTES:
+                hits += 1
+        return hits / weeks
+
+
+def poll_interval(profile: Optional[StartTimeProfile], now: datetime) -> float:
+    """
+    방송 중이 아닌 채널의 다음 폴링까지 대기 시간(초).
+    - 평소 방송 시작 시각 근처: NOTIFIER_POLL_MIN_INTERVAL
+    - 최근 1주 안에 방송: NOTIFIER_POLL_DEFAULT_INTERVAL, 이후 쉰 주마다 2배씩 늘려 NOTIFIER_POLL_MAX_INTERVAL까지
+    - 기록이 없는 채널(새로 등록 등): NOTIFIER_POLL_DEFAULT_INTERVAL
+    """
+    if profile is None or profile.last_opened is None:
+        interval = config.NOTIFIER_POLL_DEFAULT_INTERVAL
+    elif profile.likelihood(now) >= _HOT_THRESHOLD:
+        interval = config.NOTIFIER_POLL_MIN_INTERVAL
+    else:
+        idle_weeks = (now - profile.last_opened).total_seconds() / (_WEEK_MINUTES * 60)
+        interval = config.NOTIFIER_POLL_DEFAULT_INTERVAL * 2 ** max(idle_weeks - 1, 0.0)
+    interval = min(max(interval, config.NOTIFIER_POLL_MIN_INTERVAL), config.NOTIFIER_POLL_MAX_INTERVAL)
+    return interval * random.uniform(1 - _JITTER, 1 + _JITTER)
+
+
+class PollScheduler:
+    """
+    채널별 다음 폴링 시각을 최소 힙으로 관리합니다.
+    - 다시 예약하거나 제거한 채널의 이전 힙 항목은 꺼낼 때 버린다 (지연 삭제).
+    - pop_due는 예약 시각이 지난 채널을 이른 순서대로 limit개까지 꺼낸다.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, int, str]] = []
+        self._due: dict[str, float] = {}
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, channel_id: str) -> bool:
+        return channel_id in self._due
+
+    def __iter__(self):
+        return iter(list(self._due))
+
+    def schedule(self, channel_id: str, at: float):
+        self._due[channel_id] = at
+        heapq.heappush(self._heap, (at, next(self._seq), channel_id))
+        # 버려진 항목이 너무 쌓이면 힙을 다시 만든다
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._heap = [(due, next(self._seq), cid) for cid, due in self._due.items()]
+            heapq.heapify(self._heap)
+
+    def remove(self, channel_id: str):
+        self._due.pop(channel_id, None)
+
+    def clear(self):
+        self._heap.clear()
+        self._due.clear()
+
+    def pop_due(self, now: float, limit: int) -> list[str]:
+        due_channels = []
+        while self._heap and len(due_channels) < limit:
+            at, _, channel_id = self._heap[0]
+            if self._due.get(channel_id) != at:
+                heapq.heappop(self._heap)
+                continue
+            if at > now:
+                break
+            heapq.heappop(self._heap)
+            del self._due[channel_id]
+            due_channels.append(channel_id)
+        return due_channels
+
+    def next_due(self) -> Optional[float]:
+        while self._heap and self._due.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
@@ -4,10 +4,18 @@ from fastapi import FastAPI
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.core.database import create_db_engine
+from app.core.logger import stop_channel_logging
+from app.core.live_status import live_status_service
+from app.core.chzzk_api import chzzk_api
 import app.core.database as db_module
 from app.core.tunnel import ParamikoTunnel
+from app.db.migrations import migrate_command_aliases, migrate_chzzk_notifications
 from app.features.chat.session_manager import session_manager
-from app.features.discord_bot.main import bot, discord_token, start_discord_bot
+from app.features.chat.handling.dispatcher import dispatcher
+from app.features.chat.restore import restore_orchestrator
+from app.features.chat.sharding import shard_coordinator
+from app.features.discord_bot.main import discord_token, start_discord_bot, stop_discord_bot
+from app.redis.redis_service import start_cache_invalidation_listener, stop_cache_invalidation_listener
 
 # 터널 인스턴스 생성
 tunnel = ParamikoTunnel()
@@ -29,30 +37,81 @@ async def lifespan(app: FastAPI):
     db_module.AsyncSessionLocal = session_factory
     app.state.SessionLocal = session_factory
 
-    # 세션 매니저 초기화 및 DB에서 세션 복구 시도
-    async with session_factory() as db_session:
-        await session_manager.restore_all_sessions_from_db(db_session)
-    
-    # 디스코드 봇 백그라운드 실행
+    # 명령어 별칭 테이블 생성 및 백필 — 명령어/인사말 조회가 이 테이블에만 의존하므로 실패하면 기동 중단
+    try:
+        await migrate_command_aliases(engine)
+    except Exception as e:
+        print(f"❌ [Migration] command_alias 마이그레이션 실패: {e}")
+        await engine.dispose()
+        tunnel.stop()
+        raise
+
+    # 알림 설정 테이블 컬럼 추가 (펜싱 토큰, 변경 시각)
+    try:
+        await migrate_chzzk_notifications(engine)
+    except Exception as e:
+        print(f"❌ [Migration] chzzk_notifications 마이그레이션 실패: {e}")
+
+    # 다른 워커의 설정 변경을 로컬 캐시에 반영하기 위한 무효화 구독 시작
+    start_cache_invalidation_listener()
+
+    # 디스코드 봇은 한 프로세스에서만 실행 (샤딩 시 0번 샤드 담당 워커)
     discord_task = None
-    if discord_token:
-        print("🤖 디스코드 봇 시작")
-        discord_task = asyncio.create_task(start_discord_bot(discord_token))
-    else:
-        print("⚠️ DISCORD_TOKEN이 없어 디스코드 봇을 시작하지 않습니다.")
 
-    yield
-    
-    # --- SHUTDOWN ---
-    print("🔒 리소스 정리 시작")
-    if discord_task:
-        await bot.close()
+    async def on_shard_acquired(shard_id: int):
+        nonlocal discord_task
+        # DB에서 세션 복구 — 백그라운드에서 진행하므로 서버 기동을 막지 않음 (진행 상황: /chat/restore-status)
+        restore_orchestrator.start(session_factory)
+
+        if shard_id != 0 or (discord_task and not discord_task.done()):
+            return
+        if discord_token:
+            print("🤖 디스코드 봇 시작")
+            discord_task = asyncio.create_task(start_discord_bot(discord_token))
+        else:
+            print("⚠️ DISCORD_TOKEN이 없어 디스코드 봇을 시작하지 않습니다.")
+
+    async def stop_bot():
+        nonlocal discord_task
+        if discord_task is None:
+            return
+        print("🤖 디스코드 봇 중지")
+        await stop_discord_bot()
         discord_task.cancel()
         try:
             await discord_task
         except asyncio.CancelledError:
             pass
+        discord_task = None
+
+    async def on_shard_lost(shard_id: int):
+        # 다른 워커가 이 샤드를 이어받으므로 담당하던 세션을 모두 정리
+        await restore_orchestrator.stop()
+        await session_manager.close_all()
+        # 0번 샤드를 이어받은 워커가 봇을 새로 띄우므로, 두 봇이 동시에 응답하지 않도록 여기서는 중지
+        if shard_id == 0:
+            await stop_bot()
+
+    # 샤드 리스 획득 (샤딩을 사용하지 않으면 바로 전체 채널 담당)
+    await shard_coordinator.start(on_shard_acquired, on_shard_lost)
+    # 끊긴 연결/구독을 감지해 자동으로 복구하는 감시 태스크
+    session_manager.start_supervisor()
+
+    yield
+    
+    # --- SHUTDOWN ---
+    print("🔒 리소스 정리 시작")
+    await stop_bot()
+    await shard_coordinator.stop()
+    await restore_orchestrator.stop()
+    await session_manager.stop_supervisor()
     await session_manager.close_all()
+    await dispatcher.close()
+    await live_status_service.close()
+    await chzzk_api.close()
+    # 남은 채널 로그를 파일에 모두 기록한 뒤 기록 스레드 종료
+    await asyncio.to_thread(stop_channel_logging)
+    await stop_cache_invalidation_listener()
     await engine.dispose()
     tunnel.stop()
     print("✅ 모든 연결 정상 종료")
\ No newline at end of file
@@ -1,13 +1,31 @@
 import redis.asyncio as redis
 import app.core.config as config
-import re
-import httpx
-import json
+import asyncio
+import time
 
 from app.core.database import get_session_factory
+from app.core.local_cache import LocalTTLCache
+from app.core.live_status import live_status_service
 from app.features.chat.service import ChatService
+from app.features.chat.stream_session_cache import stream_session_cache
+from app.features.chat.handling.greeting_matcher import GreetingMatcher, EMPTY_SENTINEL
 
-_http_client = httpx.AsyncClient(timeout=5.0)
+# L1 캐시 (프로세스 내) — Redis 앞단에서 매 메시지마다의 왕복을 없앤다.
+# 모듈 레벨 — handler/admin 등 여러 RedisConfigService 인스턴스가 같은 캐시를 공유
+# 값이 바뀌면 CACHE_INVALIDATION_CHANNEL로 모든 워커에 알려 즉시 제거하고, TTL은 구독이 끊긴 경우의 안전장치
+_prefix_cache = LocalTTLCache(maxsize=4096, ttl=300.0)
+# 채널별로 미리 컴파일한 인사말 매처
+_greeting_matchers = LocalTTLCache(maxsize=2048, ttl=300.0)
+
+# 캐시 무효화 브로드캐스트용 Pub/Sub 채널. 메시지 형식: "{종류}:{channel_id}" (예: "prefix:abc123")
+CACHE_INVALIDATION_CHANNEL = "cache:invalidate"
+_local_caches = {
+    "prefix": _prefix_cache,
+    "greetings": _greeting_matchers,
+    # 방송 종료 시 알림 리더가 발행 — 다른 워커(이전 리더 포함)의 출석용 방송 세션도 바로 비운다
+    "stream_session": stream_session_cache,
+}
+_invalidation_task: asyncio.Task | None = None
 
 redis_client = redis.Redis(
     host=config.REDIS_HOST,
@@ -16,6 +34,81 @@ redis_client = redis.Redis(
     max_connections=10,  # 1GB 서버 환경: 기본 50개에서 축소
 )
 
+
+def _apply_invalidation(message: str):
+    """무효화 메시지를 받아 해당 로컬 캐시 항목을 제거합니다."""
+    kind, _, channel_id = message.partition(":")
+    cache = _local_caches.get(kind)
+    if cache is None:
+        return
+    if channel_id == "*":
+        cache.clear()
+    else:
+        cache.pop(channel_id)
+
+
+async def publish_invalidation(kind: str, channel_id: str):
+    """로컬 캐시를 제거하고 다른 워커에도 무효화를 알립니다. channel_id가 '*'이면 전체 제거."""
+    message = f"{kind}:{channel_id}"
+    _apply_invalidation(message)
+    try:
+        await redis_client.publish(CACHE_INVALIDATION_CHANNEL, message)
+    except Exception as e:
+        print(f"⚠️ 캐시 무효화 발행 실패: {e}")
+
+
+async def _listen_invalidations():
+    while True:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+            # 구독이 끊겼던 동안의 무효화 메시지를 놓쳤을 수 있으므로 로컬 캐시 전체 초기화
+            for cache in _local_caches.values():
+                cache.clear()
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    _apply_invalidation(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ 캐시 무효화 구독 끊김, 재연결 시도: {e}")
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.aclose()
+
+
+def start_cache_invalidation_listener():
+    """캐시 무효화 구독 태스크 시작 (lifespan에서 호출)."""
+    global _invalidation_task
+    if _invalidation_task is None or _invalidation_task.done():
+        _invalidation_task = asyncio.create_task(_listen_invalidations())
+
+
+async def stop_cache_invalidation_listener():
+    global _invalidation_task
+    if _invalidation_task is not None:
+        _invalidation_task.cancel()
+        try:
+            await _invalidation_task
+        except asyncio.CancelledError:
+            pass
+        _invalidation_task = None
+
+def peek_message_relevance(channel_id: str, message: str) -> bool:
+    """
+    로컬 캐시만 보고 메시지가 처리 대상(명령어 또는 인사말)일 수 있는지 판단합니다. Redis/DB는 조회하지 않습니다.
+    접두사로 시작하지 않고 인사말에도 매칭되지 않는 것이 확실할 때만 False이며,
+    캐시에 없는 채널은 판단할 수 없으므로 True를 반환합니다.
+    """
+    prefix = _prefix_cache.get(channel_id)
+    if prefix is None or message.startswith(prefix):
+        return True
+    matcher = _greeting_matchers.get(channel_id)
+    if matcher is None:
+        return True
+    return matcher.match(message.strip()) is not None
+
+
 class RedisConfigService:
     def __init__(self):
         pass
@@ -26,12 +119,18 @@ class RedisConfigService:
 
     async def get_command_prefix(self, channel_id: str) -> str:
         
+        # 0. 로컬(L1) 캐시에서 조회 — 평상시에는 여기서 끝난다
+        prefix = _prefix_cache.get(channel_id)
+        if prefix:
+            return prefix
+
         cache_key = self.get_cache_key(channel_id)
         
         # 1. Redis에서 조회
         try:
             prefix = await redis_client.get(cache_key)
             if prefix:
+                _prefix_cache.set(channel_id, prefix)
                 return prefix
         except Exception as e:
             print(f"⚠️ Redis 조회 실패 (DB 조회로 전환): {e}")
@@ -41,21 +140,27 @@ class RedisConfigService:
         if not session_factory:
             return "!"
             
-        async with session_factory() as db:
-            chat_service = ChatService(db)
-            config_data = await chat_service.get_channel_config(channel_id)
+        try:
+            async with session_factory() as db:
+                config_data = await ChatService(db).get_channel_config(channel_id)
+        except Exception as e:
+            # 일시적인 조회 실패 — 기본값을 캐싱하면 사용자 접두사 채널의 명령어가 TTL 동안 무시되므로 캐싱하지 않는다
+            print(f"⚠️ 접두사 DB 조회 실패 (기본값 사용): {e}")
+            return "!"
 
-            if config_data and hasattr(config_data, 'command_prefix'):
-                db_prefix = config_data.command_prefix
+        if config_data and hasattr(config_data, 'command_prefix'):
+            db_prefix = config_data.command_prefix
 
-                # 3. 조회한 데이터를 Redis에 적재
-                try:
-                    await redis_client.set(cache_key, db_prefix, ex=86400)
-                except Exception as e:
-                    print(f"⚠️ Redis 저장 실패: {e}")
-                return db_prefix
-        
-        # 4. DB에도 정보가 없다면 기본값 반환
+            # 3. 조회한 데이터를 Redis와 로컬 캐시에 적재
+            try:
+                await redis_client.set(cache_key, db_prefix, ex=86400)
+            except Exception as e:
+                print(f"⚠️ Redis 저장 실패: {e}")
+            _prefix_cache.set(channel_id, db_prefix)
+            return db_prefix
+
+        # 4. DB에도 설정이 없는 채널이면 기본값 반환 (설정 없는 채널도 로컬 캐싱해 매 메시지 DB 조회 방지)
+        _prefix_cache.set(channel_id, "!")
         return "!"
 
     async def update_command_prefix(self, channel_id: str, new_prefix: str):
@@ -86,48 +191,13 @@ class RedisConfigService:
         except Exception as e:
             print(f"⚠️ Redis 갱신 실패: {e}")
 
-    def _should_respond(self, message: str, keyword: str) -> bool:
-        """
-        메시지가 인사말 키워드에 반응해야 하는지 판단합니다.
-        1. 단순 포함 여부 체크 (빠른 필터링)
-        2. 왼쪽 경계 검사 (Lookbehind): 앞에 다른 글자가 붙어있는지 확인
-        3. 오른쪽 경계 검사 (Lookahead): 뒤에 다른 글자가 붙어있는지 확인
-           단, 키워드 자체가 반복되는 경우
-        """
-        # | 로 구분된 키워드 처리
-        keywords = [k.strip() for k in keyword.split('|') if k.strip()]
-
-        for k in keywords:
-            # 1. 키워드가 아예 없으면 다음으로
-            if k.lower() not in message.lower():
-                continue
-
-            # 2. 정규표현식
-            # (?<!\w): 앞 경계 확인 (앞에 문자 없음)
-            # (?:...)+: 키워드가 1번 이상 반복됨 (비캡처 그룹)
-            # (?!\w): 뒤 경계 확인 (뒤에 문자 없음)
-            pattern = rf"(?<!\w)(?:{re.escape(k)})+(?!\w)"
-            # re.IGNORECASE를 추가하여 영어 인사말(Hi/hi)도 구분 없이 인식하도록 개선
-            if re.search(pattern, message, re.IGNORECASE):
-                return True
-        
-        return False
+        # 3. 모든 워커의 로컬 캐시 무효화
+        await publish_invalidation("prefix", channel_id)
 
     async def _prefetch_live_status(self, channel_id: str):
-        """방송 상태를 API로 확인하고 Redis에 캐싱합니다. DB 쓰기 없음."""
-        cache_key = f"live_status:{channel_id}"
+        """방송 상태를 미리 조회해 캐싱합니다 (공용 방송 상태 서비스 사용). DB 쓰기 없음."""
         try:
-            if await redis_client.exists(cache_key):
-                return
-            url = f"https://api.chzzk.naver.com/polling/v2/channels/{channel_id}/live-status"
-            res = await _http_client.get(url)
-            if res.status_code != 200:
-                return
-            content = res.json().get("content", {})
-            if not content or content.get("status") != "OPEN":
-                await redis_client.set(cache_key, "CLOSE", ex=60)
-            else:
-                await redis_client.set(cache_key, json.dumps(content), ex=300)
+            await live_status_service.prefetch(channel_id)
         except Exception as e:
             print(f"⚠️ 방송 상태 사전 캐싱 실패: {e}")
 
@@ -139,61 +209,108 @@ class RedisConfigService:
         cache_key = f"greetings:{channel_id}"
 
         try:
-            # 1. Redis에서 해당 채널의 모든 응답 키워드와 메시지 조회 (해시 전체 조회)
-            greetings = await redis_client.hgetall(cache_key)
-
-            # 2. 데이터가 없으면 DB에서 로드 후 캐싱, 방송 상태도 함께 프리워밍
-            if not greetings:
-                await self.refresh_greetings_cache(channel_id)
-                await self._prefetch_live_status(channel_id)
+            # 1. 프로세스 내 컴파일된 매처 조회 (없을 때만 Redis 해시 전체 조회 후 컴파일)
+            matcher = _greeting_matchers.get(channel_id)
+            if matcher is None:
                 greetings = await redis_client.hgetall(cache_key)
 
-            # 3. 키워드 포함 여부 검사
-            if greetings:
-                for keyword, response in greetings.items():
-                    if keyword == "__empty__":
-                        continue
-                    if self._should_respond(message, keyword):
-                        # 쿨타임 체크 (10초)
-                        if await self.check_and_set_cooldown(channel_id, f"greeting:{keyword}", 10):
-                            return None, True
-                        return response, True
+                # 2. 데이터가 없으면 DB에서 로드 후 캐싱, 방송 상태도 함께 프리워밍
+                if not greetings:
+                    await self.refresh_greetings_cache(channel_id)
+                    await self._prefetch_live_status(channel_id)
+                    greetings = await redis_client.hgetall(cache_key)
+
+                if not greetings:
+                    return None, False
+
+                matcher = GreetingMatcher(greetings)
+                _greeting_matchers.set(channel_id, matcher)
+
+            # 3. 메시지 한 번 탐색으로 키워드 매칭
+            matched = matcher.match(message)
+            if matched:
+                keyword, response = matched
+                # 쿨타임 체크 (10초)
+                if await self.check_and_set_cooldown(channel_id, f"greeting:{keyword}", 10):
+                    return None, True
+                return response, True
 
         except Exception as e:
             print(f"⚠️ Redis 인사말 조회 실패: {e}")
 
         return None, False
 
-    async def refresh_greetings_cache(self, channel_id: str):
-        """DB에서 인사말을 불러와 Redis에 캐싱합니다."""
+    @staticmethod
+    def _queue_greetings_write(pipe, channel_id: str, greetings):
+        """채널 인사말 해시를 통째로 교체하는 명령을 파이프라인에 추가합니다."""
+        cache_key = f"greetings:{channel_id}"
+        pipe.delete(cache_key)
+        if greetings:
+            pipe.hset(cache_key, mapping={g.keyword: g.response for g in greetings})
+            pipe.expire(cache_key, 86400)
+        else:
+            # 인사말 없는 채널도 캐싱하여 매 메시지마다 DB 재조회 방지 (5분 후 재확인)
+            pipe.hset(cache_key, EMPTY_SENTINEL, "1")
+            pipe.expire(cache_key, 300)
+
+    async def refresh_greetings_cache(self, channel_id: str) -> int:
+        """DB에서 인사말을 불러와 Redis에 캐싱합니다. 캐싱한 인사말 개수를 반환합니다."""
         session_factory = get_session_factory()
         if not session_factory:
-            return
+            return 0
 
         async with session_factory() as db:
             chat_service = ChatService(db)
             greetings = await chat_service.get_channel_greetings(channel_id)
             
-            cache_key = f"greetings:{channel_id}"
             try:
-                if greetings:
-                    mapping = {g.keyword: g.response for g in greetings}
-                    # Pipeline을 사용하여 여러 명령어를 하나의 트랜잭션으로 묶어서 전송 (네트워크 통신 비용 감소)
-                    async with redis_client.pipeline(transaction=True) as pipe:
-                        pipe.delete(cache_key)
-                        pipe.hset(cache_key, mapping=mapping)
-                        pipe.expire(cache_key, 86400)
-                        await pipe.execute()
-                else:
-                    # 인사말 없는 채널도 캐싱하여 매 메시지마다 DB 재조회 방지 (5분 후 재확인)
-                    async with redis_client.pipeline(transaction=True) as pipe:
-                        pipe.delete(cache_key)
-                        pipe.hset(cache_key, "__empty__", "1")
-                        pipe.expire(cache_key, 300)
-                        await pipe.execute()
+                # Pipeline을 사용하여 여러 명령어를 하나의 트랜잭션으로 묶어서 전송 (네트워크 통신 비용 감소)
+                async with redis_client.pipeline(transaction=True) as pipe:
+                    self._queue_greetings_write(pipe, channel_id, greetings)
+                    await pipe.execute()
             except Exception as e:
                 print(f"⚠️ Redis 인사말 캐싱 실패: {e}")
 
+            # Redis 반영 후 모든 워커의 로컬 매처 제거 — 다음 메시지에서 새 인사말로 재컴파일
+            await publish_invalidation("greetings", channel_id)
+            return len(greetings)
+
+    async def bulk_refresh_greetings_cache(self, grouped: dict, batch_size: int = 100, concurrency: int = 4):
+        """
+        채널별로 묶인 인사말({channel_id: [ChatGreeting, ...]})을 batch_size 채널 단위 파이프라인으로 Redis에 씁니다.
+        동시에 실행하는 파이프라인은 concurrency개로 제한합니다.
+        반환값: (채널별 결과 목록, 실패 목록)
+        """
+        channel_ids = list(grouped)
+        batches = [channel_ids[i:i + batch_size] for i in range(0, len(channel_ids), batch_size)]
+        semaphore = asyncio.Semaphore(concurrency)
+        timings = []
+        failed = []
+
+        async def _write_batch(batch):
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    async with redis_client.pipeline(transaction=False) as pipe:
+                        for channel_id in batch:
+                            self._queue_greetings_write(pipe, channel_id, grouped[channel_id])
+                        await pipe.execute()
+                except Exception as e:
+                    failed.extend({"channel_id": channel_id, "error": str(e)} for channel_id in batch)
+                    return
+                # 채널별 소요 시간은 해당 채널이 포함된 파이프라인의 실행 시간
+                elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+                timings.extend(
+                    {"channel_id": channel_id, "count": len(grouped[channel_id]), "elapsed_ms": elapsed_ms}
+                    for channel_id in batch
+                )
+
+        await asyncio.gather(*[_write_batch(batch) for batch in batches])
+
+        # 모든 워커의 로컬 매처를 한 번에 제거
+        await publish_invalidation("greetings", "*")
+        return timings, failed
+
     async def add_greeting_cache(self, channel_id: str, keyword: str, response: str):
         """인사말 하나를 Redis에 추가하거나 갱신합니다."""
         cache_key = f"greetings:{channel_id}"
@@ -201,7 +318,7 @@ class RedisConfigService:
             # 캐시가 존재하면 부분 업데이트 (sentinel 제거 + 실제 항목 추가, TTL 유지)
             if await redis_client.exists(cache_key):
                 async with redis_client.pipeline(transaction=True) as pipe:
-                    pipe.hdel(cache_key, "__empty__")
+                    pipe.hdel(cache_key, EMPTY_SENTINEL)
                     pipe.hset(cache_key, keyword, response)
                     await pipe.execute()
             else:
@@ -209,6 +326,7 @@ class RedisConfigService:
                 await self.refresh_greetings_cache(channel_id)
         except Exception as e:
             print(f"⚠️ Redis 인사말 추가 실패: {e}")
+        await publish_invalidation("greetings", channel_id)
 
     async def delete_greeting_cache(self, channel_id: str, keyword: str):
         """인사말 하나를 Redis에서 삭제합니다."""
@@ -218,6 +336,7 @@ class RedisConfigService:
                 await redis_client.hdel(cache_key, keyword)
         except Exception as e:
             print(f"⚠️ Redis 인사말 삭제 실패: {e}")
+        await publish_invalidation("greetings", channel_id)
 
     async def check_and_set_cooldown(self, channel_id: str, command: str, cooldown_seconds: int) -> bool:
         """
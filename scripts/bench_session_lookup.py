@@ -0,0 +1,55 @@
+"""
+SessionManager.get_session 조회 오버헤드 마이크로벤치마크.
+
+기존 구현(매 호출마다 채널 락 획득)과 현재 구현(기존 세션은 락 없이 반환)을
+채널 1,000개에 메시지를 고르게 분배했을 때의 메시지당 평균 시간으로 비교합니다.
+
+사용법: python scripts/bench_session_lookup.py [채널 수] [메시지 수]
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.features.chat.session_manager import SessionManager  # noqa: E402
+
+
+class LegacySessionManager(SessionManager):
+    """변경 전 조회 경로: 세션이 있어도 항상 채널 락을 거친다."""
+
+    async def get_session(self, channel_id: str):
+        if channel_id not in self._locks:
+            self._locks[channel_id] = asyncio.Lock()
+        async with self._locks[channel_id]:
+            return self.active_sessions.get(channel_id)
+
+
+async def _measure(manager, channel_ids: list[str], messages: int) -> float:
+    for channel_id in channel_ids:
+        manager.active_sessions[channel_id] = object()
+
+    count = len(channel_ids)
+    started = time.perf_counter()
+    for i in range(messages):
+        await manager.get_session(channel_ids[i % count])
+    return (time.perf_counter() - started) / messages * 1e9
+
+
+async def main(channels: int, messages: int):
+    channel_ids = [f"channel-{i}" for i in range(channels)]
+    legacy = await _measure(LegacySessionManager(), channel_ids, messages)
+    current_manager = SessionManager()
+    current = await _measure(current_manager, channel_ids, messages)
+
+    print(f"채널 {channels}개, 메시지 {messages}건")
+    print(f"  기존 (항상 락):     {legacy:8.0f} ns/msg")
+    print(f"  현재 (락 없는 조회): {current:8.0f} ns/msg  ({legacy / current:.1f}배)")
+    print(f"  남은 락 수: {len(current_manager._locks)}")
+
+
+if __name__ == "__main__":
+    channels = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    messages = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    asyncio.run(main(channels, messages))
@@ -5,4 +5,5 @@ set -e
 # alembic upgrade head
 
 # Uvicorn으로 앱 실행
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000
\ No newline at end of file
+# WEB_CONCURRENCY > 1이면 워커마다 채널을 나눠 담당하는 샤드 모드로 동작 (SHARD_COUNT 기본값 = 워커 수)
+exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --workers "${WEB_CONCURRENCY:-1}"
\ No newline at end of file
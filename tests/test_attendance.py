@@ -0,0 +1,123 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.features.chat import attendance as attendance_module
+from app.features.chat import service as service_module
+from app.features.chat.attendance import AttendanceBatcher
+from app.features.chat.service import ChatService
+from app.features.chat.stream_session_cache import ChannelSessions, SessionRef
+
+_SESSIONS = ChannelSessions(current=SessionRef(id=1, opened_at=datetime(2026, 1, 1, tzinfo=timezone.utc)), previous=None)
+
+
+class _FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _stub_upsert(monkeypatch, upsert):
+    calls = []
+
+    async def fake_upsert(db, channel_id, sessions, users):
+        calls.append(dict(users))
+        return await upsert(users)
+
+    monkeypatch.setattr(attendance_module, "get_session_factory", lambda: _FakeSession)
+    monkeypatch.setattr(attendance_module, "upsert_attendance", fake_upsert)
+    return calls
+
+
+def _checked(users):
+    async def upsert(batch):
+        return {
+            user_id: {"status": "checked", "streak": 1, "total": 1, "is_new": True}
+            for user_id in batch if user_id in users
+        }
+    return upsert
+
+
+def test_duplicate_user_in_batch_is_already_checked(monkeypatch):
+    calls = _stub_upsert(monkeypatch, _checked({"u1", "u2"}))
+    batcher = AttendanceBatcher()
+
+    async def run():
+        return await asyncio.gather(
+            batcher.submit("ch", "u1", "a", _SESSIONS),
+            batcher.submit("ch", "u1", "a", _SESSIONS),
+            batcher.submit("ch", "u2", "b", _SESSIONS),
+        )
+
+    first, duplicate, other = asyncio.run(run())
+    assert calls == [{"u1": "a", "u2": "b"}]
+    assert first == {"status": "checked", "streak": 1, "total": 1, "is_new": True}
+    assert duplicate == {"status": "already_checked", "streak": 1, "total": 1, "is_new": False}
+    assert other["status"] == "checked"
+
+
+def test_missing_result_raises(monkeypatch):
+    _stub_upsert(monkeypatch, _checked({"u1"}))
+    batcher = AttendanceBatcher()
+
+    async def run():
+        return await asyncio.gather(
+            batcher.submit("ch", "u1", "a", _SESSIONS),
+            batcher.submit("ch", "u2", "b", _SESSIONS),
+            return_exceptions=True,
+        )
+
+    found, missing = asyncio.run(run())
+    assert found["status"] == "checked"
+    assert isinstance(missing, RuntimeError)
+
+
+def test_exception_fans_out_to_every_waiter(monkeypatch):
+    async def failing(users):
+        raise ValueError("db down")
+
+    _stub_upsert(monkeypatch, failing)
+    batcher = AttendanceBatcher()
+
+    async def run():
+        return await asyncio.gather(
+            *(batcher.submit("ch", f"u{i}", "n", _SESSIONS) for i in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_full_batch_flushes_without_waiting(monkeypatch):
+    calls = _stub_upsert(monkeypatch, _checked({"u0", "u1"}))
+    monkeypatch.setattr(attendance_module, "_MAX_BATCH_SIZE", 2)
+    monkeypatch.setattr(attendance_module, "_BATCH_WINDOW", 60.0)
+    batcher = AttendanceBatcher()
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit("ch", f"u{i}", "n", _SESSIONS) for i in range(2))),
+            timeout=1.0,
+        )
+
+    results = asyncio.run(run())
+    assert [r["status"] for r in results] == ["checked", "checked"]
+    assert calls == [{"u0": "n", "u1": "n"}]
+
+
+def test_process_attendance_reports_not_streaming(monkeypatch):
+    async def no_session(self, channel_id):
+        return None
+
+    async def unexpected_submit(*args):
+        pytest.fail("방송 중이 아니면 출석을 기록하지 않아야 합니다.")
+
+    monkeypatch.setattr(ChatService, "get_stream_sessions", no_session)
+    monkeypatch.setattr(service_module.attendance_batcher, "submit", unexpected_submit)
+
+    result = asyncio.run(ChatService(db=None).process_attendance("ch", "u1", "a"))
+    assert result == {"status": "not_streaming"}
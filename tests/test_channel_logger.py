@@ -0,0 +1,32 @@
+import logging
+
+from app.core import logger as log_module
+
+
+def test_channel_logs_are_written_by_writer_thread(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    channel_logger = log_module.get_channel_logger("test-channel", sampled=True)
+    channel_logger.info("💬%s : [%s] %s", "common_user", "닉네임", "안녕하세요")
+    log_module.stop_channel_logging()
+
+    content = (tmp_path / "logs" / "test-channel" / "chat_client.log").read_text(encoding="utf-8")
+    assert "[닉네임] 안녕하세요" in content
+
+
+def test_sampling_and_runtime_level(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    channel_logger = log_module.get_channel_logger("sampled-channel", sampled=True)
+    log_module.set_channel_sample_rate(0.0, "sampled-channel")
+    log_module.set_channel_log_level("DEBUG", "sampled-channel")
+    try:
+        channel_logger.info("버려지는 채팅")
+        channel_logger.warning("경고는 항상 기록")
+        assert channel_logger.isEnabledFor(logging.DEBUG)
+        log_module.stop_channel_logging()
+
+        content = (tmp_path / "logs" / "sampled-channel" / "chat_client.log").read_text(encoding="utf-8")
+        assert "버려지는 채팅" not in content
+        assert "경고는 항상 기록" in content
+    finally:
+        log_module.set_channel_sample_rate(1.0, "sampled-channel")
+        log_module.set_channel_log_level("DEFAULT", "sampled-channel")
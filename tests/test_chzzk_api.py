@@ -0,0 +1,33 @@
+import asyncio
+
+import httpx
+
+from app.core import chzzk_api as api_module
+from app.core.chzzk_api import ChzzkAPIClient
+
+
+def test_channels_info_is_chunked_and_cached():
+    api_module._channel_info_cache.clear()
+    requested = []
+
+    def handler(request):
+        ids = request.url.params["channelIds"].split(",")
+        requested.append(ids)
+        data = [{"channelId": cid, "channelName": f"name-{cid}"} for cid in ids if cid != "gone"]
+        return httpx.Response(200, json={"content": {"data": data}})
+
+    client = ChzzkAPIClient()
+    client.client = httpx.AsyncClient(base_url="https://openapi.test", transport=httpx.MockTransport(handler))
+    channel_ids = [f"c{i}" for i in range(45)] + ["gone"]
+
+    async def run():
+        first = await client.get_channels_info(channel_ids)
+        single = await client.get_channel_info("c7")
+        return first, single
+
+    first, single = asyncio.run(run())
+    assert [len(chunk) for chunk in requested] == [20, 20, 6]
+    assert first["c44"]["channelName"] == "name-c44"
+    assert first["gone"] == {}
+    assert single["channelName"] == "name-c7"  # 캐시에서 반환 — 추가 요청 없음
+    assert len(requested) == 3
@@ -0,0 +1,58 @@
+import asyncio
+
+from app.features.chat import chzzk_sessions as sessions_module
+from app.features.chat.chzzk_sessions import ChzzkSessions
+
+
+def test_sender_coalesces_short_messages_in_order_and_chunks_long_ones(monkeypatch):
+    monkeypatch.setattr(sessions_module.config, "CHAT_DELAY", 0.01)
+    long_message = "x" * 150
+    messages = ["출석1", "출석2", "출석3", long_message, "출석4", "출석5"]
+    posted = []
+
+    async def fake_post_chat(self, chunk):
+        posted.append(chunk)
+        return True
+
+    monkeypatch.setattr(ChzzkSessions, "_post_chat", fake_post_chat)
+
+    async def run():
+        session = ChzzkSessions("ch")
+        # 전송 딜레이 동안 모두 대기열에 쌓이도록 한꺼번에 넣는다
+        results = await asyncio.gather(*(session.send_chat(m, wait=True) for m in messages))
+        await session.close(release_socket=False)
+        return results
+
+    results = asyncio.run(run())
+
+    assert results == [True] * len(messages)
+    assert posted == ["출석1 출석2 출석3", "x" * 100, "x" * 50, "출석4 출석5"]
+    assert all(len(chunk) <= sessions_module._CHAT_CHUNK_SIZE for chunk in posted)
+    # 묶거나 나눠 보낸 결과를 이어 붙이면 원래 순서 그대로
+    assert "".join(posted).replace(" ", "") == "".join(messages)
+
+
+def test_sender_splits_merged_batches_at_chunk_size(monkeypatch):
+    monkeypatch.setattr(sessions_module.config, "CHAT_DELAY", 0.01)
+    messages = [f"메시지{i:02d}-출석완료" for i in range(20)]
+    posted = []
+
+    async def fake_post_chat(self, chunk):
+        posted.append(chunk)
+        return True
+
+    monkeypatch.setattr(ChzzkSessions, "_post_chat", fake_post_chat)
+
+    async def run():
+        session = ChzzkSessions("ch")
+        results = await asyncio.gather(*(session.send_chat(m, wait=True) for m in messages))
+        await session.close(release_socket=False)
+        return results
+
+    results = asyncio.run(run())
+
+    assert results == [True] * len(messages)
+    assert len(posted) > 1
+    assert all(len(chunk) <= sessions_module._CHAT_CHUNK_SIZE for chunk in posted)
+    # 메시지가 중간에 잘리지 않고 순서대로 묶인다
+    assert [m for chunk in posted for m in chunk.split(" ")] == messages
@@ -0,0 +1,61 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.features.chat.command_index import (
+    GLOBAL_INDEX_KEY,
+    CommandEntry,
+    CommandIndex,
+    build_alias_map,
+    command_index,
+)
+from app.features.chat.service import ChatService
+
+
+def _row(id, command, response="응답"):
+    return SimpleNamespace(id=id, command=command, response=response, type="text", is_active=True, cooldown_seconds=5)
+
+
+def test_build_alias_map_resolves_every_alias():
+    aliases = build_alias_map([_row(1, "룰|규칙"), _row(2, "공지")])
+    assert aliases["룰"].id == 1
+    assert aliases["규칙"].id == 1
+    assert aliases["룰|규칙"].id == 1
+    assert aliases["공지"].id == 2
+    assert "룰|" not in aliases
+
+
+def test_build_alias_map_prefers_exact_command():
+    aliases = build_alias_map([_row(1, "룰|규칙"), _row(2, "규칙")])
+    assert aliases["규칙"].id == 2
+
+
+def test_stale_build_is_not_stored_after_invalidate():
+    index = CommandIndex()
+    version = index.version("ch")
+    index.invalidate("ch")
+    assert not index.put("ch", version, {})
+    assert index.get("ch") is None
+
+    assert index.put("ch", index.version("ch"), {})
+    assert index.get("ch") == {}
+
+
+
+def test_resolve_command_follows_global_redirect():
+    channel_index = build_alias_map([_row(1, "출첵", "출석"), _row(2, "공지", "공지입니다")])
+    channel_index["출첵"] = CommandEntry.from_row(SimpleNamespace(
+        id=1, command="출첵", response="출석", type="global", is_active=True, cooldown_seconds=5
+    ))
+    command_index.put("resolve-ch", command_index.version("resolve-ch"), channel_index)
+    command_index.put(GLOBAL_INDEX_KEY, command_index.version(GLOBAL_INDEX_KEY), build_alias_map([_row(10, "출석", None)]))
+    service = ChatService(db=None)  # 인덱스가 채워져 있으면 DB를 사용하지 않음
+
+    try:
+        custom, target = asyncio.run(service.resolve_command("resolve-ch", "출첵"))
+        assert custom.id == 1 and target.id == 10
+
+        custom, target = asyncio.run(service.resolve_command("resolve-ch", "공지"))
+        assert custom.id == 2 and target is None
+    finally:
+        command_index.invalidate("resolve-ch")
+        command_index.invalidate(GLOBAL_INDEX_KEY)
@@ -0,0 +1,52 @@
+import importlib
+import json
+import sys
+
+from app.features.chat.clients import decoder as decoder_module
+from app.features.chat.clients.decoder import decode_chat, decode_system
+
+
+def test_decode_chat_extracts_handler_fields():
+    data = json.dumps({
+        "channelId": "ch1",
+        "senderChannelId": "user1",
+        "content": "!출석",
+        "messageTime": 1700000000000,
+        "profile": {"nickname": "시청자", "userRoleCode": "common_user", "badges": []},
+    }, ensure_ascii=False)
+    event = decode_chat(data)
+    assert (event.channel_id, event.sender_id, event.nickname, event.role, event.content) == (
+        "ch1", "user1", "시청자", "common_user", "!출석"
+    )
+
+
+def test_decode_chat_tolerates_missing_profile():
+    event = decode_chat('{"channelId": "ch1", "content": "hi"}')
+    assert event.nickname is None and event.role is None
+
+
+def test_decode_system():
+    assert decode_system('{"type": "connected", "data": {"sessionKey": "abc"}}') == ("connected", {"sessionKey": "abc"})
+
+
+def test_decode_chat_tolerates_unexpected_field_types():
+    # 타입 지정 디코딩(msgspec)이 거부하는 값도 다른 백엔드와 마찬가지로 처리
+    event = decode_chat('{"channelId": "ch1", "senderChannelId": 123, "content": "hi", "profile": {"nickname": 7}}')
+    assert (event.channel_id, event.sender_id, event.nickname, event.content) == ("ch1", 123, 7, "hi")
+
+
+def test_fallback_backend_decodes_the_same_payload(monkeypatch):
+    # msgspec/orjson이 없는 환경의 표준 json 경로를 강제로 사용
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    fallback = importlib.reload(decoder_module)
+    try:
+        assert fallback.BACKEND == "json"
+        event = fallback.decode_chat('{"channelId": "ch1", "senderChannelId": "u1", "content": "hi", "profile": {"nickname": "n", "userRoleCode": "common_user"}}')
+        assert (event.channel_id, event.sender_id, event.nickname, event.role, event.content) == (
+            "ch1", "u1", "n", "common_user", "hi"
+        )
+        assert fallback.decode_chat('{"channelId": "ch1", "content": "hi"}').nickname is None
+    finally:
+        monkeypatch.undo()
+        importlib.reload(decoder_module)
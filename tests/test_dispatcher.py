@@ -0,0 +1,64 @@
+import asyncio
+
+from app.features.chat.handling import dispatcher as dispatcher_module
+from app.features.chat.handling.dispatcher import MessageDispatcher
+
+
+def _run_with_fake_handler(monkeypatch, dispatcher, submissions):
+    handled = []
+
+    async def fake_on_message(channel_id, message, role, user_id, user_name):
+        await asyncio.sleep(0)
+        handled.append((channel_id, message))
+
+    monkeypatch.setattr(dispatcher_module.handler, "on_message", fake_on_message)
+
+    async def run():
+        results = [await dispatcher.submit(ch, msg, "common_user", "u", "n") for ch, msg in submissions]
+        await asyncio.sleep(0.05)
+        await dispatcher.close()
+        return results
+
+    return asyncio.run(run()), handled
+
+
+def test_keeps_per_channel_order_and_drops_oldest(monkeypatch):
+    dispatcher = MessageDispatcher(queue_size=2, policy="drop_oldest", concurrency=1)
+    submissions = [("a", f"m{i}") for i in range(4)] + [("b", "x")]
+    results, handled = _run_with_fake_handler(monkeypatch, dispatcher, submissions)
+
+    assert all(results)
+    assert [msg for ch, msg in handled if ch == "a"] == ["m2", "m3"]
+    assert ("b", "x") in handled
+    assert dispatcher.stats()["channels"]["a"]["dropped"] == 2
+
+
+def test_drop_newest_rejects_overflow(monkeypatch):
+    dispatcher = MessageDispatcher(queue_size=1, policy="drop_newest", concurrency=1)
+    results, handled = _run_with_fake_handler(monkeypatch, dispatcher, [("a", "m0"), ("a", "m1")])
+
+    assert results == [True, False]
+    assert handled == [("a", "m0")]
+
+
+def test_block_policy_gives_up_after_timeout(monkeypatch):
+    monkeypatch.setattr(dispatcher_module, "_BLOCK_TIMEOUT", 0.01)
+    dispatcher = MessageDispatcher(queue_size=1, policy="block", concurrency=1)
+
+    async def stuck_on_message(channel_id, message, role, user_id, user_name):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(dispatcher_module.handler, "on_message", stuck_on_message)
+
+    async def run():
+        # 첫 메시지는 워커가 꺼내 처리 중, 두 번째가 대기열을 채우고, 세 번째는 잠시 기다린 뒤 버려진다
+        results = [await dispatcher.submit("a", f"m{i}", "common_user", "u", "n") for i in range(2)]
+        await asyncio.sleep(0)
+        results.append(await dispatcher.submit("a", "m2", "common_user", "u", "n"))
+        stats = dispatcher.stats()["channels"]["a"]
+        await dispatcher.close()
+        return results, stats
+
+    results, stats = asyncio.run(run())
+    assert results == [True, True, False]
+    assert stats["dropped"] == 1
@@ -0,0 +1,45 @@
+import re
+
+from app.features.chat.handling.greeting_matcher import GreetingMatcher
+
+
+def _legacy_should_respond(message: str, keyword: str) -> bool:
+    """기존 RedisConfigService._should_respond 구현 (동작 비교용)."""
+    for k in [k.strip() for k in keyword.split('|') if k.strip()]:
+        if k.lower() not in message.lower():
+            continue
+        if re.search(rf"(?<!\w)(?:{re.escape(k)})+(?!\w)", message, re.IGNORECASE):
+            return True
+    return False
+
+
+GREETINGS = {
+    "안녕|하이": "어서오세요!",
+    "ㅎㅇ": "ㅎㅇㅎㅇ",
+    "hi": "hello",
+    "안녕하세요": "반갑습니다",
+    "{:d_1:}": "이모티콘 인사",
+    "__empty__": "1",
+}
+
+
+def test_matches_same_messages_as_legacy_check():
+    matcher = GreetingMatcher(GREETINGS)
+    messages = [
+        "안녕", "안녕안녕", "다들 안녕!", "안녕하세요", "안녕히", "하이하이", "ㅎㅇ", "ㅋㅎㅇ",
+        "Hi", "HI there", "hihi", "this", "{:d_1:}", "{:d_1:}{:d_1:}", "아무말", "",
+    ]
+    for message in messages:
+        legacy = any(_legacy_should_respond(message, k) for k in GREETINGS if k != "__empty__")
+        assert (matcher.match(message) is not None) == legacy, message
+
+
+def test_returns_original_keyword_and_response():
+    matcher = GreetingMatcher(GREETINGS)
+    assert matcher.match("하이") == ("안녕|하이", "어서오세요!")
+    assert matcher.match("안녕하세요") == ("안녕하세요", "반갑습니다")
+    assert matcher.match("반가워요 ㅎㅇ 안녕") == ("ㅎㅇ", "ㅎㅇㅎㅇ")
+
+
+def test_empty_channel_never_matches():
+    assert GreetingMatcher({"__empty__": "1"}).match("안녕") is None
@@ -0,0 +1,20 @@
+from collections import Counter
+
+from app.core.hash_ring import HashRing
+
+
+def test_keys_spread_across_all_nodes():
+    ring = HashRing(range(4))
+    counts = Counter(ring.node_for(f"channel-{i}") for i in range(4000))
+    assert set(counts) == {0, 1, 2, 3}
+    assert min(counts.values()) > 600
+
+
+def test_adding_a_node_moves_only_a_fraction_of_keys():
+    before = HashRing(range(4))
+    after = HashRing(range(5))
+    keys = [f"channel-{i}" for i in range(4000)]
+    moved = sum(before.node_for(k) != after.node_for(k) for k in keys)
+    assert moved < len(keys) * 0.35
+    # 옮겨진 키는 모두 새 노드로 간다
+    assert all(after.node_for(k) == 4 for k in keys if before.node_for(k) != after.node_for(k))
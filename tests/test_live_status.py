@@ -0,0 +1,30 @@
+import asyncio
+
+from app.core.live_status import LiveStatusService
+
+
+def test_concurrent_fetches_share_one_request_and_publish_changes():
+    service = LiveStatusService()
+    calls = []
+    events = []
+    service.subscribe(lambda channel_id, status, content: events.append((channel_id, status)))
+
+    async def fake_request(channel_id):
+        calls.append(channel_id)
+        await asyncio.sleep(0.01)
+        content = {"status": "OPEN" if len(calls) == 1 else "CLOSE"}
+        service._publish(channel_id, content)
+        return content
+
+    service._request = fake_request
+
+    async def run():
+        first = await asyncio.gather(*(service._fetch("channel") for _ in range(10)))
+        again = await service._fetch("channel")
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert len(calls) == 2
+    assert all(content["status"] == "OPEN" for content in first)
+    assert again["status"] == "CLOSE"
+    assert events == [("channel", "OPEN"), ("channel", "CLOSE")]
@@ -0,0 +1,13 @@
+from app.features.discord_bot.notification_state import OPEN, SUSPECT_CLOSE, CLOSE, advance
+
+
+def test_close_needs_consecutive_confirmations():
+    state, count = advance(OPEN, CLOSE, 0)
+    assert (state, count) == (SUSPECT_CLOSE, 1)
+    assert advance(state, CLOSE, count) == (CLOSE, 0)
+
+
+def test_open_clears_suspicion_and_close_stays_close():
+    assert advance(SUSPECT_CLOSE, OPEN, 1) == (OPEN, 0)
+    assert advance(CLOSE, CLOSE, 0) == (CLOSE, 0)
+    assert advance(CLOSE, OPEN, 0) == (OPEN, 0)
@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta
+
+from app.core import config
+from app.features.discord_bot.poll_scheduler import KST, PollScheduler, StartTimeProfile, poll_interval
+
+
+def test_pop_due_in_order_and_skips_rescheduled_entries():
+    scheduler = PollScheduler()
+    scheduler.schedule("a", 10.0)
+    scheduler.schedule("b", 5.0)
+    scheduler.schedule("c", 1.0)
+    scheduler.schedule("c", 20.0)  # 다시 예약하면 이전 시각은 무시된다
+    scheduler.remove("a")
+
+    assert scheduler.pop_due(now=15.0, limit=10) == ["b"]
+    assert scheduler.next_due() == 20.0
+    assert scheduler.pop_due(now=30.0, limit=10) == ["c"]
+    assert len(scheduler) == 0
+
+
+def test_interval_fast_near_usual_start_and_slow_when_idle():
+    now = datetime(2024, 6, 3, 20, 0, tzinfo=KST)  # 월요일 20:00
+    weekly = StartTimeProfile([now - timedelta(weeks=w, minutes=10) for w in range(1, 5)])
+    assert poll_interval(weekly, now) <= config.NOTIFIER_POLL_MIN_INTERVAL * 1.1
+
+    off_hours = now + timedelta(hours=6)
+    assert poll_interval(weekly, off_hours) >= config.NOTIFIER_POLL_DEFAULT_INTERVAL * 0.9
+
+    dormant = StartTimeProfile([], last_opened=now - timedelta(weeks=10))
+    assert poll_interval(dormant, now) >= config.NOTIFIER_POLL_MAX_INTERVAL * 0.9
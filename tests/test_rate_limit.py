@@ -0,0 +1,17 @@
+import asyncio
+import time
+
+from app.core.rate_limit import TokenBucket
+
+
+def test_burst_then_waits_for_refill():
+    bucket = TokenBucket(rate=20, capacity=2)
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    async def run():
+        started = time.monotonic()
+        await bucket.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.03
@@ -0,0 +1,69 @@
+import asyncio
+
+from app.features.chat import session_manager as session_manager_module
+from app.features.chat.session_manager import SessionManager
+
+
+class _FailingSession:
+    def __init__(self, channel_id):
+        self.channel_id = channel_id
+        self.session_key = None
+
+    async def create_session(self):
+        await asyncio.sleep(0)
+
+    async def close(self, release_socket=True):
+        pass
+
+
+def test_failed_creation_does_not_leak_locks(monkeypatch):
+    monkeypatch.setattr(session_manager_module, "ChzzkSessions", _FailingSession)
+    manager = SessionManager()
+
+    async def run():
+        results = await asyncio.gather(
+            *(manager.get_or_create_session("ch") for _ in range(3)), return_exceptions=True
+        )
+        return results
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, Exception) for r in results)
+    assert manager._locks == {} and manager._lock_users == {}
+
+
+def test_existing_session_is_returned_without_lock():
+    manager = SessionManager()
+    session = object()
+    manager.active_sessions["ch"] = session
+
+    assert asyncio.run(manager.get_session("ch")) is session
+    assert asyncio.run(manager.get_or_create_session("ch")) == (session, False)
+    assert manager._locks == {}
+
+
+def test_quiet_channel_is_stale_only_while_live(monkeypatch):
+    manager = SessionManager()
+    health = session_manager_module.ChannelHealth()
+    now = health.connected_since + session_manager_module.config.SUPERVISOR_STALE_AFTER + 1
+    monkeypatch.setattr(session_manager_module.socket_pool, "last_event_at", lambda channel_id: None)
+
+    statuses = {"live": {"status": "OPEN"}, "offline": {"status": "CLOSE"}}
+
+    async def fake_get(channel_id, max_age=None):
+        return statuses[channel_id]
+
+    monkeypatch.setattr(session_manager_module.live_status_service, "get", fake_get)
+
+    assert asyncio.run(manager._is_stale("live", health, now))
+    assert not asyncio.run(manager._is_stale("offline", health, now))
+    assert not asyncio.run(manager._is_stale("live", health, health.connected_since + 1))
+
+
+def test_supervise_registers_missing_channel_for_recovery():
+    manager = SessionManager()
+    manager.supervise("ch", "API 오류")
+
+    health = manager._health["ch"]
+    assert health.state == "detached" and health.failures == 1
+    assert health.last_error == "API 오류"
+    assert manager.health_stats()["supervised"] == 1